@@ -1,17 +1,56 @@
-from typing import Optional
+import asyncio
+import json
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, List, Literal, Optional
 
 import uvicorn
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
 from pydantic import BaseModel, Field
 
-from src.main import run_blog_generation
+from config.settings import settings
+from src.jobs import get_job_queue
+from src.main import arun_blog_generation, astream_blog_generation
+from src.pipeline.ai_generator import warm_up_llm_clients
+from src.pipeline.article_store import get_article_store
+from src.pipeline.model_router import routed_client_kwargs
+from src.pipeline.run_store import get_run_store
 from src.utils.constants import Constants
+from src.utils.lazy_imports import (
+    import_profile,
+    pending_lazy_imports,
+    preload_lazy_imports,
+)
+from src.utils.telemetry import render_metrics
+
+
+async def warm_up() -> None:
+    """Import the LangChain, Gemini and SerpAPI SDKs and build the LLM clients."""
+    await asyncio.to_thread(preload_lazy_imports)
+    await warm_up_llm_clients(routed_client_kwargs())
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Warm up in the background so /health answers while the SDKs load;
+    # /ready reports when they are in place
+    app.state.warm_up = (
+        asyncio.create_task(warm_up()) if settings.WARM_UP_ON_STARTUP else None
+    )
+    # Resume batch items left unfinished by a restart
+    await get_job_queue().start()
+    yield
+    await get_job_queue().stop()
+    if app.state.warm_up is not None and not app.state.warm_up.done():
+        app.state.warm_up.cancel()
+
 
 app = FastAPI(
     title="AI Blog Writer API",
     description="An API for generating AI-powered blog content",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -59,6 +98,27 @@ class BlogRequest(BaseModel):
     step: Optional[str] = Field(
         default="blog_outline", description="The step of the blog generation process"
     )
+    regenerate_sections: Optional[List[str]] = Field(
+        default=None,
+        description="Sections to regenerate in the generate_blog step; "
+        "unchanged sections are served from the session",
+    )
+    run_id: Optional[str] = Field(
+        default=None,
+        description="Checkpoint the run under this ID; retrying with the same "
+        "ID resumes from the last completed artifact",
+    )
+    timeout_seconds: Optional[float] = Field(
+        default=None,
+        gt=0,
+        description="Deadline for this request, applied to every LLM and "
+        "SerpAPI call it makes; defaults to REQUEST_TIMEOUT",
+    )
+    use_stored_result: bool = Field(
+        default=True,
+        description="Serve a blog already generated from the same metadata and "
+        "outline from the article store instead of regenerating it",
+    )
 
 
 class BlogResponse(BaseModel):
@@ -66,6 +126,23 @@ class BlogResponse(BaseModel):
     type: str
     success: bool
     message: Optional[str] = None
+    blog_hash: Optional[str] = Field(
+        default=None, description="Fetch the blog again with GET /blogs/{blog_hash}"
+    )
+
+
+class BatchBlogRequest(BaseModel):
+    requests: List[BlogRequest] = Field(
+        ...,
+        min_length=1,
+        description="Blogs to generate; each runs through outline and full blog",
+    )
+
+
+class BatchJobResponse(BaseModel):
+    job_id: str
+    status: str
+    total: int
 
 
 @app.get("/")
@@ -77,14 +154,20 @@ async def root():
 async def generate_blog(request: BlogRequest):
     try:
         metadata_dict = request.blog.model_dump()
+        article = {}
 
-        content, content_type, success = run_blog_generation(
+        content, content_type, success = await arun_blog_generation(
             metadata=metadata_dict,
             find_trends_type=request.find_trends_type,
             session_id=request.session_id,
             clear_memory=request.clear_memory,
             user_input=request.user_input,
             step=request.step,
+            regenerate_sections=request.regenerate_sections,
+            run_id=request.run_id,
+            timeout=request.timeout_seconds,
+            use_stored_result=request.use_stored_result,
+            on_article_hash=lambda blog_hash: article.update(hash=blog_hash),
         )
 
         if not success:
@@ -95,15 +178,118 @@ async def generate_blog(request: BlogRequest):
                 message="Blog generation failed",
             )
 
-        return BlogResponse(content=content, type=content_type, success=True)
+        return BlogResponse(
+            content=content,
+            type=content_type,
+            success=True,
+            blog_hash=article.get("hash"),
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e)) from e
 
 
+def _format_stream_event(payload: dict, stream_format: str, event: str) -> str:
+    if stream_format == "ndjson":
+        return f"{json.dumps({'event': event, **payload})}\n"
+    return f"event: {event}\ndata: {json.dumps(payload)}\n\n"
+
+
+@app.post("/generate-blog/stream")
+async def generate_blog_stream(
+    request: BlogRequest, format: Literal["sse", "ndjson"] = "sse"
+):
+    async def event_stream() -> AsyncIterator[str]:
+        article = {}
+        try:
+            async for section, chunk in astream_blog_generation(
+                metadata=request.blog.model_dump(),
+                find_trends_type=request.find_trends_type,
+                session_id=request.session_id,
+                clear_memory=request.clear_memory,
+                regenerate_sections=request.regenerate_sections,
+                use_stored_result=request.use_stored_result,
+                on_article_hash=lambda blog_hash: article.update(hash=blog_hash),
+            ):
+                yield _format_stream_event(
+                    {"section": section, "content": chunk}, format, "token"
+                )
+            yield _format_stream_event(
+                {"success": True, "blog_hash": article.get("hash")}, format, "done"
+            )
+        except Exception as e:
+            yield _format_stream_event(
+                {"success": False, "message": str(e)}, format, "error"
+            )
+
+    media_type = "application/x-ndjson" if format == "ndjson" else "text/event-stream"
+    return StreamingResponse(event_stream(), media_type=media_type)
+
+
+@app.post("/generate-blog/batch", response_model=BatchJobResponse)
+async def generate_blog_batch(request: BatchBlogRequest):
+    job_queue = get_job_queue()
+    job_id = await job_queue.submit(
+        [blog_request.model_dump() for blog_request in request.requests]
+    )
+    return BatchJobResponse(job_id=job_id, status="queued", total=len(request.requests))
+
+
+@app.get("/generate-blog/batch/{job_id}")
+async def get_batch_job(job_id: str):
+    job = await get_job_queue().get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+@app.get("/runs/{run_id}")
+async def get_run(run_id: str):
+    run = await asyncio.to_thread(lambda: get_run_store().get_run(run_id))
+    if run is None:
+        raise HTTPException(status_code=404, detail="Run not found")
+    return run
+
+
+@app.get("/blogs/{blog_hash}")
+async def get_blog(blog_hash: str):
+    article = await asyncio.to_thread(lambda: get_article_store().get(blog_hash))
+    if article is None:
+        raise HTTPException(status_code=404, detail="Blog not found")
+    return article
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    return PlainTextResponse(
+        render_metrics(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+
 @app.get("/health")
 async def health_check():
+    """Liveness: the process is up and serving requests."""
     return {"status": "healthy"}
 
 
+@app.get("/ready")
+async def readiness_check():
+    """Readiness: the start-up warm-up has loaded the SDKs and LLM clients."""
+    warm_up_task = getattr(app.state, "warm_up", None)
+    if warm_up_task is not None and not warm_up_task.done():
+        return JSONResponse(
+            status_code=503,
+            content={"status": "warming_up", "pending": pending_lazy_imports()},
+        )
+    if warm_up_task is not None and (
+        warm_up_task.cancelled() or warm_up_task.exception() is not None
+    ):
+        error = "cancelled" if warm_up_task.cancelled() else warm_up_task.exception()
+        return JSONResponse(
+            status_code=503,
+            content={"status": "warm_up_failed", "error": str(error)},
+        )
+    return {"status": "ready", "import_seconds": import_profile()}
+
+
 if __name__ == "__main__":
     uvicorn.run("app:app", host="0.0.0.0", port=8000, reload=True)
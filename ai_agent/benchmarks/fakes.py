@@ -0,0 +1,345 @@
+import ast
+import asyncio
+import hashlib
+import math
+import random
+import re
+import threading
+import time
+import weakref
+from typing import Any, Callable, Dict, List, Optional
+
+from langchain_core.messages import AIMessage, AIMessageChunk
+
+from src.utils.constants import Constants
+from src.utils.rate_limiter import UpstreamError
+
+_STRUCTURAL_FLOW = re.compile(r"structural flow: (\[.*?\])")
+_SECTION_NAME = re.compile(r"Write only the \*\*(.+?)\*\* section")
+_TOPIC = re.compile(r'Topic: "?([^"\n]+)"?')
+_WORDS = (
+    "patients clinicians data models workflow outcomes diagnosis imaging "
+    "adoption privacy regulation evidence accuracy cost training teams "
+    "hospitals research trials automation insight safety bias scale"
+).split()
+
+
+class LatencyModel:
+    """Log-normal latency distribution with deterministic, per-call samples.
+
+    Args:
+        median: Median latency in seconds
+        sigma: Log-space standard deviation; 0 gives a fixed latency
+        error_rate: Share of calls that fail with a retryable 503
+        seed: Seed mixed into every sample
+    """
+
+    def __init__(
+        self,
+        median: float,
+        sigma: float = 0.0,
+        error_rate: float = 0.0,
+        seed: int = 0,
+    ):
+        self.median = median
+        self.sigma = sigma
+        self.error_rate = error_rate
+        self.seed = seed
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def _rng(self, key: str) -> random.Random:
+        # Each call is seeded by its input and how often that input was seen,
+        # so samples do not depend on the order concurrent calls arrive in.
+        with self._lock:
+            count = self._calls.get(key, 0)
+            self._calls[key] = count + 1
+        digest = hashlib.sha256(f"{self.seed}:{count}:{key}".encode()).digest()
+        return random.Random(int.from_bytes(digest[:8], "big"))
+
+    def sample(self, key: str) -> float:
+        """Draw the latency for one call, raising the call's injected error."""
+        rng = self._rng(key)
+        if rng.random() < self.error_rate:
+            raise UpstreamError(503, "injected benchmark error")
+        if self.median <= 0:
+            return 0.0
+        return self.median * math.exp(self.sigma * rng.gauss(0, 1))
+
+
+def _filler(seed_text: str, words: int) -> str:
+    rng = random.Random(hashlib.sha256(seed_text.encode()).digest())
+    sentences = []
+    while words > 0:
+        length = min(words, rng.randint(8, 20))
+        sentence = " ".join(rng.choice(_WORDS) for _ in range(length))
+        sentences.append(sentence.capitalize() + ".")
+        words -= length
+    return " ".join(sentences)
+
+
+def canned_response(prompt: str, section_words: int = 300) -> str:
+    """Produce a plausible response for any prompt the pipeline sends."""
+    topic_match = _TOPIC.search(prompt)
+    topic = topic_match.group(1).strip() if topic_match else "the topic"
+
+    section_match = _SECTION_NAME.search(prompt)
+    if section_match:
+        section = section_match.group(1)
+        return f"## {section}\n\n{_filler(prompt, section_words)}"
+
+    flow_match = _STRUCTURAL_FLOW.search(prompt)
+    if flow_match:
+        steps = ast.literal_eval(flow_match.group(1))
+        return "\n".join(
+            f"**{_to_roman(index)}. {step}**\n"
+            f"   A. {_filler(step + topic, 8)}\n"
+            f"   B. {_filler(topic + step, 8)}\n"
+            for index, step in enumerate(steps, start=1)
+        )
+
+    if "Google Trends data" in prompt:
+        return Constants.DUMP_TREND_DATA
+    if "Research Agent" in prompt:
+        return f"Research summary for {topic}.\n\n{_filler(prompt, 250)}"
+    if "Trend Analyst" in prompt:
+        return f"Content trends for {topic}.\n\n{_filler(prompt, 200)}"
+    return _filler(prompt, 50)
+
+
+def _to_roman(number: int) -> str:
+    numerals = [(10, "X"), (9, "IX"), (5, "V"), (4, "IV"), (1, "I")]
+    result = ""
+    for value, numeral in numerals:
+        count, number = divmod(number, value)
+        result += numeral * count
+    return result
+
+
+def _usage(prompt: str, text: str) -> Dict[str, int]:
+    input_tokens = max(1, len(prompt) // 4)
+    output_tokens = max(1, len(text) // 4)
+    return {
+        "input_tokens": input_tokens,
+        "output_tokens": output_tokens,
+        "total_tokens": input_tokens + output_tokens,
+    }
+
+
+class FakeChatModel:
+    """Stand-in for ChatGoogleGenerativeAI with canned output and modelled latency.
+
+    Class attributes are configured by `install_fakes` because the pipeline
+    builds its clients itself.
+    """
+
+    latency = LatencyModel(0.0)
+    section_words = 300
+    stream_chunks = 20
+    async_client = object()
+
+    def __init__(self, model: str = "fake-gemini", **kwargs):
+        self.model = model
+        self.kwargs = kwargs
+
+    def _respond(self, prompt: Any) -> tuple:
+        prompt = str(prompt)
+        delay = self.latency.sample(prompt)
+        return prompt, canned_response(prompt, self.section_words), delay
+
+    def invoke(self, prompt: Any, *args, **kwargs) -> AIMessage:
+        prompt, text, delay = self._respond(prompt)
+        time.sleep(delay)
+        return AIMessage(content=text, usage_metadata=_usage(prompt, text))
+
+    async def ainvoke(self, prompt: Any, *args, **kwargs) -> AIMessage:
+        prompt, text, delay = self._respond(prompt)
+        await asyncio.sleep(delay)
+        return AIMessage(content=text, usage_metadata=_usage(prompt, text))
+
+    def _chunks(self, text: str) -> List[str]:
+        size = max(1, math.ceil(len(text) / self.stream_chunks))
+        return [text[index : index + size] for index in range(0, len(text), size)]
+
+    def stream(self, prompt: Any, *args, **kwargs):
+        prompt, text, delay = self._respond(prompt)
+        chunks = self._chunks(text)
+        for chunk in chunks:
+            time.sleep(delay / len(chunks))
+            yield AIMessageChunk(content=chunk)
+        yield AIMessageChunk(content="", usage_metadata=_usage(prompt, text))
+
+    async def astream(self, prompt: Any, *args, **kwargs):
+        prompt, text, delay = self._respond(prompt)
+        chunks = self._chunks(text)
+        for chunk in chunks:
+            await asyncio.sleep(delay / len(chunks))
+            yield AIMessageChunk(content=chunk)
+        yield AIMessageChunk(content="", usage_metadata=_usage(prompt, text))
+
+
+class FakeEmbeddings:
+    """Deterministic hash-based embeddings for the semantic LLM cache."""
+
+    def __init__(self, **kwargs):
+        self.kwargs = kwargs
+
+    def embed_query(self, text: str) -> List[float]:
+        digest = hashlib.sha256(text.encode()).digest()
+        return [byte / 255 for byte in digest]
+
+    async def aembed_query(self, text: str) -> List[float]:
+        return self.embed_query(text)
+
+
+class FakeGoogleSearch:
+    """Stand-in for serpapi.GoogleSearch that builds requests for FakeSerpSession."""
+
+    BACKEND = "https://serpapi.invalid"
+
+    def __init__(self, params_dict: Dict[str, Any]):
+        self.params_dict = dict(params_dict)
+
+    def construct_url(self, path: str = "/search") -> tuple:
+        return self.BACKEND + path, self.params_dict
+
+    def get_dict(self) -> Dict[str, Any]:
+        return canned_trends(self.params_dict)
+
+
+def canned_trends(params: Dict[str, Any]) -> Dict[str, Any]:
+    """Build a Google Trends response for a query, stable across runs."""
+    query = params.get("q", "")
+    rng = random.Random(hashlib.sha256(query.encode()).digest())
+
+    if params.get("data_type") == "RELATED_QUERIES":
+        return {
+            "related_queries": {
+                "rising": [
+                    {
+                        "query": f"{query} {word}",
+                        "value": f"+{rng.randint(50, 900)}%",
+                        "extracted_value": rng.randint(50, 900),
+                    }
+                    for word in rng.sample(_WORDS, 5)
+                ],
+                "top": [
+                    {
+                        "query": f"{query} {word}",
+                        "value": str(value),
+                        "extracted_value": value,
+                    }
+                    for word, value in zip(
+                        rng.sample(_WORDS, 5), sorted(rng.sample(range(10, 100), 5))
+                    )
+                ],
+            }
+        }
+
+    level = rng.randint(10, 60)
+    timeline = []
+    for day in range(90):
+        level = max(0, min(100, level + rng.randint(-8, 8)))
+        timeline.append(
+            {
+                "date": f"Day {day + 1}",
+                "timestamp": str(1_700_000_000 + day * 86_400),
+                "values": [
+                    {"query": query, "value": str(level), "extracted_value": level}
+                ],
+            }
+        )
+    return {"interest_over_time": {"timeline_data": timeline}}
+
+
+class FakeResponse:
+    def __init__(self, data: Dict[str, Any], status_code: int = 200):
+        self._data = data
+        self.status_code = status_code
+        self.text = str(data)
+
+    def json(self) -> Dict[str, Any]:
+        return self._data
+
+
+class FakeSerpSession:
+    """Stand-in for the shared SerpAPI HTTP session, with modelled latency."""
+
+    def __init__(self, latency: LatencyModel):
+        self.latency = latency
+
+    def get(
+        self,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None,
+    ) -> FakeResponse:
+        params = params or {}
+        key = "|".join(f"{name}={params[name]}" for name in sorted(params))
+        try:
+            time.sleep(self.latency.sample(key))
+        except UpstreamError as e:
+            return FakeResponse({"error": str(e)}, e.status_code)
+        return FakeResponse(canned_trends(params))
+
+
+def install_fakes(
+    llm_latency: LatencyModel,
+    serpapi_latency: LatencyModel,
+    section_words: int = 300,
+    keep_rate_limits: bool = False,
+) -> Callable[[], None]:
+    """Route every Gemini and SerpAPI call in this process to the fakes.
+
+    Only the provider clients are replaced, so caching, scheduling and
+    concurrency limits still run as in production.
+
+    Args:
+        llm_latency: Latency model for Gemini calls
+        serpapi_latency: Latency model for SerpAPI requests
+        section_words: Words in each generated section
+        keep_rate_limits: Keep the configured per-minute provider budgets
+
+    Returns:
+        A function that puts back everything the fakes replaced, including
+        the pooled clients and schedulers built before they were installed
+    """
+    from config.settings import settings
+    from src.integrations import tools
+    from src.pipeline import ai_generator
+    from src.utils import rate_limiter
+
+    replaced = []
+
+    def replace(target: Any, name: str, value: Any) -> None:
+        replaced.append((target, name, getattr(target, name)))
+        setattr(target, name, value)
+
+    def restore() -> None:
+        while replaced:
+            target, name, value = replaced.pop()
+            setattr(target, name, value)
+
+    replace(FakeChatModel, "latency", llm_latency)
+    replace(FakeChatModel, "section_words", section_words)
+
+    replace(ai_generator, "ChatGoogleGenerativeAI", FakeChatModel)
+    replace(ai_generator, "GoogleGenerativeAIEmbeddings", FakeEmbeddings)
+    with ai_generator._LLM_CLIENTS_LOCK:
+        replace(ai_generator, "_LLM_CLIENTS", {})
+        replace(ai_generator, "_LOOP_LLM_CLIENTS", weakref.WeakKeyDictionary())
+
+    replace(tools, "GoogleSearch", FakeGoogleSearch)
+    with tools._HTTP_SESSION_LOCK:
+        replace(tools, "_HTTP_SESSION", FakeSerpSession(serpapi_latency))
+
+    replace(settings, "GOOGLE_API_KEY", settings.GOOGLE_API_KEY or "benchmark")
+    replace(settings, "SERPAPI_KEY", settings.SERPAPI_KEY or "benchmark")
+    if not keep_rate_limits:
+        replace(settings, "GEMINI_REQUESTS_PER_MINUTE", 0)
+        replace(settings, "GEMINI_TOKENS_PER_MINUTE", 0)
+        replace(settings, "SERPAPI_REQUESTS_PER_MINUTE", 0)
+    with rate_limiter._SCHEDULERS_LOCK:
+        replace(rate_limiter, "_SCHEDULERS", {})
+
+    return restore
@@ -0,0 +1,102 @@
+"""Import-time profile of the API server and its lazily loaded SDKs.
+
+Usage (from the project root):
+
+    python -m benchmarks.import_profile --top 15
+"""
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+from typing import Any, Dict, List, Optional
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_IMPORT_TIME = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+# Runs in a fresh interpreter: time `import app`, then the warm-up imports
+_PROBE = """
+import json, time
+started_at = time.perf_counter()
+import app
+app_seconds = time.perf_counter() - started_at
+from src.utils.lazy_imports import preload_lazy_imports
+started_at = time.perf_counter()
+lazy = preload_lazy_imports()
+warm_up_seconds = time.perf_counter() - started_at
+print(json.dumps({"app": app_seconds, "warm_up": warm_up_seconds, "lazy": lazy}))
+"""
+
+
+def parse_import_time(stderr: str) -> List[Dict[str, Any]]:
+    """Parse `python -X importtime` output into per-module timings in seconds."""
+    modules = []
+    for line in stderr.splitlines():
+        match = _IMPORT_TIME.match(line)
+        if match:
+            own, cumulative, indent, name = match.groups()
+            modules.append(
+                {
+                    "module": name,
+                    "self_s": int(own) / 1e6,
+                    "cumulative_s": int(cumulative) / 1e6,
+                    "depth": len(indent) // 2,
+                }
+            )
+    return modules
+
+
+def profile() -> Dict[str, Any]:
+    """Import the app in a fresh interpreter and time it, then its warm-up."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _PROBE],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    timings = json.loads(result.stdout.strip().splitlines()[-1])
+    app_index = result.stderr.find("| app\n")
+    return {
+        **timings,
+        # Modules imported by `import app` itself, before the warm-up ran
+        "modules": parse_import_time(result.stderr[: app_index + len("| app\n")]),
+    }
+
+
+def print_report(report: Dict[str, Any], top: int) -> None:
+    print(f"import app:  {report['app']:.3f}s")
+    print(f"warm-up:     {report['warm_up']:.3f}s")
+    print()
+    print(f"{'slowest modules at import':<60}{'self s':>9}{'cum s':>9}")
+    top_level = [module for module in report["modules"] if module["depth"] <= 1]
+    top_level.sort(key=lambda module: module["cumulative_s"], reverse=True)
+    for module in top_level[:top]:
+        print(
+            f"{module['module']:<60}{module['self_s']:>9.3f}"
+            f"{module['cumulative_s']:>9.3f}"
+        )
+    print()
+    print(f"{'lazily loaded during warm-up':<60}{'s':>9}")
+    for name, seconds in report["lazy"].items():
+        print(f"{name:<60}{seconds:>9.3f}")
+
+
+def main(argv: Optional[List[str]] = None) -> Dict[str, Any]:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--top", type=int, default=15, help="Modules to list")
+    parser.add_argument("--json", dest="json_path", help="Write results to this file")
+    args = parser.parse_args(argv)
+
+    report = profile()
+    print_report(report, args.top)
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,306 @@
+"""Offline benchmark of the blog pipeline against fake Gemini and SerpAPI.
+
+Usage (from the project root):
+
+    python -m benchmarks.run --mode both --requests 16 --concurrency 4
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import math
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx  # noqa: E402
+
+from app import app  # noqa: E402
+from benchmarks.fakes import LatencyModel, install_fakes  # noqa: E402
+from config.settings import settings  # noqa: E402
+from src.main import run_blog_generation  # noqa: E402
+from src.utils.constants import Constants  # noqa: E402
+from src.utils.lazy_imports import preload_lazy_imports  # noqa: E402
+
+STEPS = ("blog_outline", "generate_blog")
+_STORE_PATHS = {
+    "ARTICLE_DB_PATH": "articles.sqlite3",
+    "CACHE_DB_PATH": "cache.sqlite3",
+    "JOB_DB_PATH": "jobs.sqlite3",
+    "RUN_DB_PATH": "runs.sqlite3",
+    "SESSION_DB_PATH": "sessions.sqlite3",
+}
+
+
+def percentile(values: List[float], percent: float) -> float:
+    """Nearest-rank percentile of a list of values."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(percent / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def _metadata(mode: str, structure: str, run_id: str, index: int) -> Dict[str, Any]:
+    # Every request gets its own topic so the trends and LLM caches miss,
+    # as they would for distinct users.
+    return {
+        "structure": structure,
+        "persona": "professional",
+        "topic": f"AI in Healthcare {run_id}-{mode}-{structure}-{index}",
+        "tone": "informative",
+        "keyword": "ai healthcare",
+        "goal": "Inform readers about practical uses of AI in hospitals",
+    }
+
+
+def _pipeline_request(
+    structure: str, run_id: str, index: int, find_trends_type: str
+) -> Dict[str, Any]:
+    metadata = _metadata("pipeline", structure, run_id, index)
+    session_id = f"bench-{run_id}-{structure}-{index}"
+    timings = {"success": True}
+    started_at = time.perf_counter()
+
+    for step in STEPS:
+        step_started_at = time.perf_counter()
+        _, _, success = run_blog_generation(
+            dict(metadata), find_trends_type, session_id=session_id, step=step
+        )
+        timings[step] = time.perf_counter() - step_started_at
+        timings["success"] = timings["success"] and success
+
+    timings["total"] = time.perf_counter() - started_at
+    return timings
+
+
+def run_pipeline(
+    structure: str, requests: int, concurrency: int, run_id: str, find_trends_type: str
+) -> List[Dict[str, Any]]:
+    """Drive `run_blog_generation` from a pool of caller threads."""
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        futures = [
+            executor.submit(
+                _pipeline_request, structure, run_id, index, find_trends_type
+            )
+            for index in range(requests)
+        ]
+        return [future.result() for future in futures]
+
+
+async def _arun_api(
+    structure: str, requests: int, concurrency: int, run_id: str, find_trends_type: str
+) -> List[Dict[str, Any]]:
+    semaphore = asyncio.Semaphore(concurrency)
+    transport = httpx.ASGITransport(app=app)
+
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://benchmark", timeout=None
+    ) as client:
+
+        async def one_request(index: int) -> Dict[str, Any]:
+            body = {
+                "blog": _metadata("api", structure, run_id, index),
+                "find_trends_type": find_trends_type,
+                "session_id": f"bench-api-{run_id}-{structure}-{index}",
+            }
+            timings = {"success": True}
+            async with semaphore:
+                started_at = time.perf_counter()
+                for step in STEPS:
+                    step_started_at = time.perf_counter()
+                    response = await client.post(
+                        "/generate-blog", json={**body, "step": step}
+                    )
+                    timings[step] = time.perf_counter() - step_started_at
+                    timings["success"] = (
+                        timings["success"]
+                        and response.status_code == 200
+                        and response.json().get("success", False)
+                    )
+                timings["total"] = time.perf_counter() - started_at
+            return timings
+
+        return await asyncio.gather(*(one_request(index) for index in range(requests)))
+
+
+def run_api(
+    structure: str, requests: int, concurrency: int, run_id: str, find_trends_type: str
+) -> List[Dict[str, Any]]:
+    """Drive the FastAPI app in-process through an ASGI transport."""
+    return asyncio.run(
+        _arun_api(structure, requests, concurrency, run_id, find_trends_type)
+    )
+
+
+def summarize(
+    mode: str,
+    structure: str,
+    results: List[Dict[str, Any]],
+    elapsed: float,
+    peak_bytes: int,
+    retained_bytes: int,
+) -> Dict[str, Any]:
+    summary = {
+        "mode": mode,
+        "structure": structure,
+        "requests": len(results),
+        "failures": sum(not result["success"] for result in results),
+        "throughput_rps": round(len(results) / elapsed, 3) if elapsed else 0.0,
+        "peak_memory_mb": round(peak_bytes / (1024 * 1024), 2),
+        "retained_memory_mb": round(retained_bytes / (1024 * 1024), 2),
+    }
+    for key in ("total",) + STEPS:
+        values = [result[key] for result in results]
+        for percent in (50, 95, 99):
+            summary[f"{key}_p{percent}_s"] = round(percentile(values, percent), 4)
+    return summary
+
+
+def print_report(summaries: List[Dict[str, Any]]) -> None:
+    header = (
+        f"{'mode':<9}{'structure':<12}{'reqs':>5}{'fail':>5}"
+        f"{'p50 s':>9}{'p95 s':>9}{'p99 s':>9}{'req/s':>9}{'peak MB':>9}{'kept MB':>9}"
+    )
+    print(header)
+    print("-" * len(header))
+    for summary in summaries:
+        print(
+            f"{summary['mode']:<9}{summary['structure']:<12}"
+            f"{summary['requests']:>5}{summary['failures']:>5}"
+            f"{summary['total_p50_s']:>9.3f}{summary['total_p95_s']:>9.3f}"
+            f"{summary['total_p99_s']:>9.3f}{summary['throughput_rps']:>9.2f}"
+            f"{summary['peak_memory_mb']:>9.2f}{summary['retained_memory_mb']:>9.2f}"
+        )
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--mode", choices=("pipeline", "api", "both"), default="both", help="Driver"
+    )
+    parser.add_argument(
+        "--structures",
+        default=",".join(Constants.STRUCTURE_STEPS),
+        help="Comma-separated structure types to run",
+    )
+    parser.add_argument("--requests", type=int, default=16, help="Requests per run")
+    parser.add_argument("--concurrency", type=int, default=4, help="Requests in flight")
+    parser.add_argument(
+        "--find-trends-type",
+        default=Constants.FIND_TRENDS_TYPE["GOOGLE_TRENDS"],
+        choices=tuple(Constants.FIND_TRENDS_TYPE.values()),
+    )
+    parser.add_argument(
+        "--llm-latency", type=float, default=0.5, help="Median LLM latency (s)"
+    )
+    parser.add_argument(
+        "--llm-sigma", type=float, default=0.3, help="LLM log-normal sigma"
+    )
+    parser.add_argument(
+        "--serpapi-latency", type=float, default=0.3, help="Median SerpAPI latency (s)"
+    )
+    parser.add_argument(
+        "--serpapi-sigma", type=float, default=0.3, help="SerpAPI log-normal sigma"
+    )
+    parser.add_argument(
+        "--error-rate", type=float, default=0.0, help="Share of calls failing with 503"
+    )
+    parser.add_argument(
+        "--section-words", type=int, default=300, help="Words per generated section"
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Latency sampling seed")
+    parser.add_argument(
+        "--keep-rate-limits",
+        action="store_true",
+        help="Apply the configured per-minute provider budgets",
+    )
+    parser.add_argument("--json", dest="json_path", help="Write results to this file")
+    parser.add_argument(
+        "--verbose", action="store_true", help="Show pipeline output while running"
+    )
+    return parser.parse_args(argv)
+
+
+def isolate_stores(directory: str) -> None:
+    """Point every SQLite store at `directory`, so no run sees another's data.
+
+    Without this a second run with the same seed would serve its blogs from
+    the article store the first run left in `.cache`.
+    """
+    for setting, filename in _STORE_PATHS.items():
+        setattr(settings, setting, os.path.join(directory, filename))
+
+
+def main(argv: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    args = parse_args(argv)
+    with tempfile.TemporaryDirectory(prefix="blog-writer-bench-") as directory:
+        isolate_stores(directory)
+        return _run(args)
+
+
+def _run(args: argparse.Namespace) -> List[Dict[str, Any]]:
+    install_fakes(
+        LatencyModel(args.llm_latency, args.llm_sigma, args.error_rate, args.seed),
+        LatencyModel(
+            args.serpapi_latency, args.serpapi_sigma, args.error_rate, args.seed
+        ),
+        section_words=args.section_words,
+        keep_rate_limits=args.keep_rate_limits,
+    )
+    # Load the SDKs up front, as the server's warm-up does, so the first
+    # run does not pay for them
+    preload_lazy_imports()
+
+    modes = ("pipeline", "api") if args.mode == "both" else (args.mode,)
+    runners = {"pipeline": run_pipeline, "api": run_api}
+    structures = [name.strip() for name in args.structures.split(",") if name.strip()]
+    run_id = str(args.seed)
+    summaries = []
+
+    tracemalloc.start()
+    for mode in modes:
+        for structure in structures:
+            tracemalloc.reset_peak()
+            baseline = tracemalloc.get_traced_memory()[0]
+            output = sys.stdout if args.verbose else io.StringIO()
+            started_at = time.perf_counter()
+            with contextlib.redirect_stdout(output):
+                results = runners[mode](
+                    structure,
+                    args.requests,
+                    args.concurrency,
+                    run_id,
+                    args.find_trends_type,
+                )
+            elapsed = time.perf_counter() - started_at
+            current, peak = tracemalloc.get_traced_memory()
+            summaries.append(
+                summarize(
+                    mode,
+                    structure,
+                    results,
+                    elapsed,
+                    peak - baseline,
+                    current - baseline,
+                )
+            )
+    tracemalloc.stop()
+
+    print_report(summaries)
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as file:
+            json.dump(summaries, file, indent=2)
+    return summaries
+
+
+if __name__ == "__main__":
+    main()
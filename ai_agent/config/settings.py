@@ -6,30 +6,139 @@ from dotenv import load_dotenv
 load_dotenv()
 
 
+def _llm_route(purpose, model, max_output_tokens, temperature):
+    """Model, output-token cap and temperature for one LLM call purpose.
+
+    Each value can be overridden with LLM_<PURPOSE>_MODEL, _MAX_TOKENS and
+    _TEMPERATURE, e.g. LLM_META_DESCRIPTION_MODEL.
+    """
+    prefix = f"LLM_{purpose}_"
+    return {
+        "model": os.getenv(f"{prefix}MODEL", model),
+        "max_output_tokens": int(
+            os.getenv(f"{prefix}MAX_TOKENS", str(max_output_tokens))
+        ),
+        "temperature": float(os.getenv(f"{prefix}TEMPERATURE", str(temperature))),
+    }
+
+
 class Settings:
     # API Keys
     GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY", "")
 
     # LLM Configuration
     LLM_MODEL = os.getenv("LLM_MODEL", "gemini-1.5-flash")
+    SECTION_CONCURRENCY = int(os.getenv("SECTION_CONCURRENCY", "8"))
+    SECTION_CONTEXT_TOKEN_BUDGET = int(
+        os.getenv("SECTION_CONTEXT_TOKEN_BUDGET", "1200")
+    )
+    LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "16"))
+
+    # Model Routing Configuration (max_output_tokens of 0 leaves output uncapped)
+    LLM_ROUTING_ENABLED = os.getenv("LLM_ROUTING_ENABLED", "True").lower() == "true"
+    LLM_FAST_MODEL = os.getenv("LLM_FAST_MODEL", "gemini-1.5-flash-8b")
+    # Keyed by call purpose or section name; other sections use "section"
+    LLM_ROUTES = {
+        "research": _llm_route("RESEARCH", LLM_FAST_MODEL, 1024, 0.3),
+        "trends": _llm_route("TRENDS", LLM_FAST_MODEL, 1024, 0.3),
+        "outline": _llm_route("OUTLINE", LLM_MODEL, 2048, 0.7),
+        "section": _llm_route("SECTION", LLM_MODEL, 4096, 0.7),
+        "FAQs": _llm_route("FAQS", LLM_FAST_MODEL, 1024, 0.5),
+        "Meta Description": _llm_route("META_DESCRIPTION", LLM_FAST_MODEL, 256, 0.5),
+        "References": _llm_route("REFERENCES", LLM_FAST_MODEL, 1024, 0.2),
+    }
 
     # Memory Configuration
     MEMORY_TYPE = os.getenv("MEMORY_TYPE", "buffer")  # buffer or buffer_window
     MEMORY_WINDOW_SIZE = int(os.getenv("MEMORY_WINDOW_SIZE", "5"))
     USE_MEMORY = os.getenv("USE_MEMORY", "True").lower() == "true"
+    SESSION_IDLE_TTL = int(os.getenv("SESSION_IDLE_TTL", "3600"))
+    SESSION_MAX_ENTRIES = int(os.getenv("SESSION_MAX_ENTRIES", "1000"))
+    SESSION_MAX_BYTES = int(os.getenv("SESSION_MAX_BYTES", str(256 * 1024 * 1024)))
+    SESSION_SWEEP_INTERVAL = int(os.getenv("SESSION_SWEEP_INTERVAL", "60"))
 
     # Database Configuration
     DB_URI = os.getenv("DB_URI", "")
     DB_NAME = os.getenv("DB_NAME", "blog_writer")
+    DB_POOL_MIN_CONNECTIONS = int(os.getenv("DB_POOL_MIN_CONNECTIONS", "1"))
+    DB_POOL_MAX_CONNECTIONS = int(os.getenv("DB_POOL_MAX_CONNECTIONS", "10"))
+
+    # Session Backend Configuration
+    SESSION_BACKEND = os.getenv(
+        "SESSION_BACKEND", "memory"
+    )  # memory, sqlite or postgres
+    SESSION_DB_PATH = os.getenv("SESSION_DB_PATH", ".cache/sessions.sqlite3")
 
     # SerpAPI Configuration
     SERPAPI_KEY = os.getenv("SERPAPI_KEY", "")
     SERPAPI_LANGUAGE = os.getenv("SERPAPI_LANGUAGE", "en")
     SERPAPI_GEO_LOCATION = os.getenv("SERPAPI_GEO_LOCATION", "us")
+    SERPAPI_TIMEOUT = float(os.getenv("SERPAPI_TIMEOUT", "15"))
+    HTTP_POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", "32"))
+
+    # Cache Configuration
+    CACHE_BACKEND = os.getenv("CACHE_BACKEND", "memory")  # none, memory or sqlite
+    CACHE_DB_PATH = os.getenv("CACHE_DB_PATH", ".cache/blog_writer.sqlite3")
+    CACHE_TTL = int(os.getenv("CACHE_TTL", "3600"))
+    CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "1000"))
+    TRENDS_CACHE_BACKEND = os.getenv("TRENDS_CACHE_BACKEND", CACHE_BACKEND)
+    TRENDS_CACHE_TTL = int(os.getenv("TRENDS_CACHE_TTL", "21600"))
+    TRENDS_DIGEST_MAX_BYTES = int(os.getenv("TRENDS_DIGEST_MAX_BYTES", "2048"))
+
+    # LLM Cache Configuration
+    LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "True").lower() == "true"
+    LLM_CACHE_BACKEND = os.getenv("LLM_CACHE_BACKEND", CACHE_BACKEND)
+    LLM_CACHE_TTL = int(os.getenv("LLM_CACHE_TTL", "86400"))
+    LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "5000"))
+    LLM_CACHE_SEMANTIC = os.getenv("LLM_CACHE_SEMANTIC", "False").lower() == "true"
+    LLM_CACHE_SIMILARITY_THRESHOLD = float(
+        os.getenv("LLM_CACHE_SIMILARITY_THRESHOLD", "0.95")
+    )
+    LLM_CACHE_EMBEDDING_MODEL = os.getenv(
+        "LLM_CACHE_EMBEDDING_MODEL", "models/embedding-001"
+    )
+
+    # Data Gathering Configuration
+    DATA_GATHER_TIMEOUT = float(os.getenv("DATA_GATHER_TIMEOUT", "60"))
+
+    # Rate Limit Configuration (0 disables a limit)
+    GEMINI_REQUESTS_PER_MINUTE = int(os.getenv("GEMINI_REQUESTS_PER_MINUTE", "300"))
+    GEMINI_TOKENS_PER_MINUTE = int(os.getenv("GEMINI_TOKENS_PER_MINUTE", "1000000"))
+    SERPAPI_REQUESTS_PER_MINUTE = int(os.getenv("SERPAPI_REQUESTS_PER_MINUTE", "60"))
+    RETRY_MAX_ATTEMPTS = int(os.getenv("RETRY_MAX_ATTEMPTS", "4"))
+    RETRY_BASE_DELAY = float(os.getenv("RETRY_BASE_DELAY", "1.0"))
+    RETRY_MAX_DELAY = float(os.getenv("RETRY_MAX_DELAY", "30.0"))
+
+    # Deadline and Hedging Configuration (0 disables a timeout)
+    REQUEST_TIMEOUT = float(os.getenv("REQUEST_TIMEOUT", "300"))
+    LLM_CALL_TIMEOUT = float(os.getenv("LLM_CALL_TIMEOUT", "120"))
+    HEDGE_ENABLED = os.getenv("HEDGE_ENABLED", "True").lower() == "true"
+    HEDGE_PERCENTILE = float(os.getenv("HEDGE_PERCENTILE", "95"))
+    HEDGE_MIN_SAMPLES = int(os.getenv("HEDGE_MIN_SAMPLES", "20"))
+    HEDGE_WINDOW = int(os.getenv("HEDGE_WINDOW", "200"))
+    HEDGE_MAX_RATIO = float(os.getenv("HEDGE_MAX_RATIO", "0.05"))
+
+    # Batch Job Configuration
+    BATCH_WORKERS = int(os.getenv("BATCH_WORKERS", "4"))
+    JOB_DB_PATH = os.getenv("JOB_DB_PATH", ".cache/jobs.sqlite3")
+    # Seconds before a running item is taken to belong to a dead worker
+    JOB_CLAIM_TTL = int(os.getenv("JOB_CLAIM_TTL", "900"))
+
+    # Run Checkpoint Configuration
+    RUN_DB_PATH = os.getenv("RUN_DB_PATH", ".cache/runs.sqlite3")
+    RUN_TTL = int(os.getenv("RUN_TTL", str(7 * 24 * 3600)))  # 0 keeps every run
+
+    # Article Store Configuration
+    ARTICLE_DB_PATH = os.getenv("ARTICLE_DB_PATH", ".cache/articles.sqlite3")
+    ARTICLE_TTL = int(os.getenv("ARTICLE_TTL", str(30 * 24 * 3600)))  # 0 keeps all
 
     # Application Settings
     DEBUG = os.getenv("DEBUG", "False").lower() == "true"
     LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+    LOG_JSON = os.getenv("LOG_JSON", "False").lower() == "true"
+
+    # Startup Configuration
+    WARM_UP_ON_STARTUP = os.getenv("WARM_UP_ON_STARTUP", "True").lower() == "true"
 
     # GOOGLE Drive Settings
     GOOGLE_SERVICE_ACCOUNT = os.getenv("GOOGLE_SERVICE_ACCOUNT", "")
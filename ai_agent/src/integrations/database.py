@@ -0,0 +1,265 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from config.settings import settings
+
+_SESSION_BACKEND = None
+_SESSION_BACKEND_LOCK = threading.Lock()
+# Returned in place of a value the caller already holds the latest version of
+UNCHANGED = object()
+
+
+@contextmanager
+def connect_sqlite(path: str) -> Iterator[sqlite3.Connection]:
+    """Open a SQLite connection that commits on success and always closes.
+
+    Args:
+        path: Path to the database file; parent directories are created
+
+    Yields:
+        The open connection
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    connection = sqlite3.connect(path, timeout=30)
+    try:
+        with connection:
+            yield connection
+    finally:
+        connection.close()
+
+
+class SessionBackend(ABC):
+    """Shared store for session data, keyed by session ID and data key.
+
+    Every write stamps the value with its update time, which readers use
+    as a version to skip re-reading values they already hold.
+    """
+
+    @abstractmethod
+    def set_session_data(self, session_id: str, key: str, value: Any) -> float:
+        """Store a value and return its version (update time)."""
+
+    @abstractmethod
+    def get_session_data(self, session_id: str, key: str, default: Any = None) -> Any:
+        """Read a value, or `default` if the key is not stored."""
+
+    @abstractmethod
+    def get_session_data_since(
+        self, session_id: str, key: str, version: Optional[float]
+    ) -> Optional[Tuple[float, Any]]:
+        """Read a value only if it changed since a known version.
+
+        Args:
+            session_id: The session ID
+            key: The data key
+            version: Version the caller holds, or None to always read the value
+
+        Returns:
+            None if the key is not stored, else (version, value), where value
+            is UNCHANGED if the stored version is not newer than `version`
+        """
+
+    @abstractmethod
+    def get_all_session_data(self, session_id: str) -> Dict[str, Any]:
+        """Read every value stored for a session, keyed by data key."""
+
+    @abstractmethod
+    def clear_session(self, session_id: str, idle_for: Optional[float] = None) -> None:
+        """Delete a session's data.
+
+        Args:
+            session_id: The session ID
+            idle_for: Only delete it if no value was written within this many
+                seconds, so sessions other workers still use are kept
+        """
+
+
+class SQLiteSessionBackend(SessionBackend):
+    """File-backed session store for single-node deployments."""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or settings.SESSION_DB_PATH
+        with connect_sqlite(self.path) as connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS session_data ("
+                "session_id TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL, "
+                "updated_at REAL NOT NULL, PRIMARY KEY (session_id, key))"
+            )
+
+    def set_session_data(self, session_id: str, key: str, value: Any) -> float:
+        updated_at = time.time()
+        with connect_sqlite(self.path) as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO session_data "
+                "(session_id, key, value, updated_at) VALUES (?, ?, ?, ?)",
+                (session_id, key, json.dumps(value), updated_at),
+            )
+        return updated_at
+
+    def get_session_data(self, session_id: str, key: str, default: Any = None) -> Any:
+        with connect_sqlite(self.path) as connection:
+            row = connection.execute(
+                "SELECT value FROM session_data WHERE session_id = ? AND key = ?",
+                (session_id, key),
+            ).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def get_session_data_since(
+        self, session_id: str, key: str, version: Optional[float]
+    ) -> Optional[Tuple[float, Any]]:
+        with connect_sqlite(self.path) as connection:
+            row = connection.execute(
+                "SELECT updated_at, CASE WHEN ? IS NULL OR updated_at > ? "
+                "THEN value END FROM session_data WHERE session_id = ? AND key = ?",
+                (version, version, session_id, key),
+            ).fetchone()
+        if row is None:
+            return None
+        updated_at, value = row
+        return updated_at, UNCHANGED if value is None else json.loads(value)
+
+    def get_all_session_data(self, session_id: str) -> Dict[str, Any]:
+        with connect_sqlite(self.path) as connection:
+            rows = connection.execute(
+                "SELECT key, value FROM session_data WHERE session_id = ?",
+                (session_id,),
+            ).fetchall()
+        return {key: json.loads(value) for key, value in rows}
+
+    def clear_session(self, session_id: str, idle_for: Optional[float] = None) -> None:
+        cutoff = float("inf") if idle_for is None else time.time() - idle_for
+        with connect_sqlite(self.path) as connection:
+            connection.execute(
+                "DELETE FROM session_data WHERE session_id = ? AND NOT EXISTS "
+                "(SELECT 1 FROM session_data WHERE session_id = ? AND updated_at > ?)",
+                (session_id, session_id, cutoff),
+            )
+
+
+class PostgresSessionBackend(SessionBackend):
+    """Postgres session store shared by every worker, using a connection pool."""
+
+    def __init__(
+        self,
+        dsn: Optional[str] = None,
+        dbname: Optional[str] = None,
+        min_connections: Optional[int] = None,
+        max_connections: Optional[int] = None,
+    ):
+        from psycopg2.pool import ThreadedConnectionPool
+
+        self._pool = ThreadedConnectionPool(
+            min_connections or settings.DB_POOL_MIN_CONNECTIONS,
+            max_connections or settings.DB_POOL_MAX_CONNECTIONS,
+            dsn=dsn or settings.DB_URI,
+            dbname=dbname or settings.DB_NAME,
+        )
+        with self._cursor() as cursor:
+            cursor.execute(
+                "CREATE TABLE IF NOT EXISTS session_data ("
+                "session_id TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL, "
+                "updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(), "
+                "PRIMARY KEY (session_id, key))"
+            )
+
+    @contextmanager
+    def _cursor(self):
+        connection = self._pool.getconn()
+        try:
+            with connection:
+                with connection.cursor() as cursor:
+                    yield cursor
+        finally:
+            self._pool.putconn(connection)
+
+    def set_session_data(self, session_id: str, key: str, value: Any) -> float:
+        with self._cursor() as cursor:
+            cursor.execute(
+                "INSERT INTO session_data (session_id, key, value) "
+                "VALUES (%s, %s, %s) ON CONFLICT (session_id, key) "
+                "DO UPDATE SET value = EXCLUDED.value, updated_at = NOW() "
+                "RETURNING EXTRACT(EPOCH FROM updated_at)",
+                (session_id, key, json.dumps(value)),
+            )
+            return float(cursor.fetchone()[0])
+
+    def get_session_data(self, session_id: str, key: str, default: Any = None) -> Any:
+        with self._cursor() as cursor:
+            cursor.execute(
+                "SELECT value FROM session_data WHERE session_id = %s AND key = %s",
+                (session_id, key),
+            )
+            row = cursor.fetchone()
+        return json.loads(row[0]) if row else default
+
+    def get_session_data_since(
+        self, session_id: str, key: str, version: Optional[float]
+    ) -> Optional[Tuple[float, Any]]:
+        with self._cursor() as cursor:
+            cursor.execute(
+                "SELECT EXTRACT(EPOCH FROM updated_at), CASE WHEN "
+                "%(version)s::float8 IS NULL OR "
+                "EXTRACT(EPOCH FROM updated_at) > %(version)s::float8 "
+                "THEN value END FROM session_data "
+                "WHERE session_id = %(session_id)s AND key = %(key)s",
+                {"version": version, "session_id": session_id, "key": key},
+            )
+            row = cursor.fetchone()
+        if row is None:
+            return None
+        updated_at, value = row
+        return float(updated_at), UNCHANGED if value is None else json.loads(value)
+
+    def get_all_session_data(self, session_id: str) -> Dict[str, Any]:
+        with self._cursor() as cursor:
+            cursor.execute(
+                "SELECT key, value FROM session_data WHERE session_id = %s",
+                (session_id,),
+            )
+            rows = cursor.fetchall()
+        return {key: json.loads(value) for key, value in rows}
+
+    def clear_session(self, session_id: str, idle_for: Optional[float] = None) -> None:
+        with self._cursor() as cursor:
+            cursor.execute(
+                "DELETE FROM session_data WHERE session_id = %(session_id)s "
+                "AND (%(idle_for)s::float8 IS NULL OR NOT EXISTS ("
+                "SELECT 1 FROM session_data WHERE session_id = %(session_id)s "
+                "AND updated_at > NOW() - make_interval(secs => %(idle_for)s)))",
+                {"session_id": session_id, "idle_for": idle_for},
+            )
+
+    def close(self) -> None:
+        self._pool.closeall()
+
+
+def get_session_backend() -> Optional[SessionBackend]:
+    """Get the configured shared session backend.
+
+    Returns:
+        The backend selected by SESSION_BACKEND ("sqlite" or "postgres"),
+        created on first use, or None for process-local sessions ("memory")
+    """
+    global _SESSION_BACKEND
+
+    backend = settings.SESSION_BACKEND.lower()
+    if backend not in ("sqlite", "postgres"):
+        return None
+
+    with _SESSION_BACKEND_LOCK:
+        if _SESSION_BACKEND is None:
+            if backend == "postgres":
+                _SESSION_BACKEND = PostgresSessionBackend()
+            else:
+                _SESSION_BACKEND = SQLiteSessionBackend()
+        return _SESSION_BACKEND
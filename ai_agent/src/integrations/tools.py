@@ -1,12 +1,57 @@
-from datetime import datetime
+import asyncio
+import threading
 from typing import Any, Dict, List
 
 from pydantic import BaseModel
-from serpapi import GoogleSearch
 
 from config.settings import settings
-from src.pipeline.ai_generator import get_gemini_llm
+from src.pipeline.model_router import get_routed_llm
 from src.pipeline.prompt_builder import PromptBuilder
+from src.utils.cache import get_cache, make_cache_key
+from src.utils.concurrency import SingleFlight
+from src.utils.deadline import call_timeout, get_hedger
+from src.utils.helpers import Helpers
+from src.utils.lazy_imports import LazyImport
+from src.utils.rate_limiter import (
+    RETRYABLE_STATUS_CODES,
+    UpstreamError,
+    get_scheduler,
+)
+from src.utils.telemetry import register_collector, span
+
+GoogleSearch = LazyImport("serpapi", "GoogleSearch")
+requests = LazyImport("requests")
+HTTPAdapter = LazyImport("requests.adapters", "HTTPAdapter")
+trends_analytics = LazyImport("src.integrations.trends_analytics")
+
+_HTTP_SESSION = None
+_HTTP_SESSION_LOCK = threading.Lock()
+_IN_FLIGHT = SingleFlight()
+
+
+def get_http_session() -> "requests.Session":
+    """Get the shared keep-alive HTTP session used for SerpAPI requests."""
+    global _HTTP_SESSION
+
+    with _HTTP_SESSION_LOCK:
+        if _HTTP_SESSION is None:
+            adapter = HTTPAdapter(
+                pool_connections=settings.HTTP_POOL_SIZE,
+                pool_maxsize=settings.HTTP_POOL_SIZE,
+            )
+            _HTTP_SESSION = requests.Session()
+            _HTTP_SESSION.mount("https://", adapter)
+            _HTTP_SESSION.mount("http://", adapter)
+        return _HTTP_SESSION
+
+
+def get_in_flight_calls() -> SingleFlight:
+    """Get the process-wide coalescer for trends, research and outline calls."""
+    return _IN_FLIGHT
+
+
+def _flight_key(kind: str, **params) -> str:
+    return make_cache_key(f"flight_{kind}", params)
 
 
 class UserStepAnalysis(BaseModel):
@@ -18,19 +63,35 @@ class FetchGoogleTrendsDataTool:
         self.settings = settings
         self.metadata_json = metadata_json
         self.query = metadata_json["topic"]
+        self.cache = get_cache(
+            "trends",
+            backend=settings.TRENDS_CACHE_BACKEND,
+            ttl=settings.TRENDS_CACHE_TTL,
+        )
 
-    def _get_trends_data(self, data_type="TIMESERIES", time_period="today 3-m") -> Dict:
+    def _get_trends_data(
+        self, data_type="TIMESERIES", time_period="today 3-m", query=None
+    ) -> Dict:
+        query = query or self.query
         params = {
             "api_key": self.settings.SERPAPI_KEY,
             "engine": "google_trends",
-            "q": self.query,
+            "q": query,
             "data_type": data_type,
             "date": time_period,
         }
         try:
-            search = GoogleSearch(params)
-            results = search.get_dict()
-            base_result = {"query": self.query}
+            cache_key = make_cache_key("trends", params, exclude=("api_key",))
+            results = self.cache.get(cache_key)
+            if results is None:
+                with span("serpapi", data_type=data_type):
+                    results = get_scheduler("serpapi").call(
+                        lambda: self._search(params)
+                    )
+                if "error" not in results:
+                    self.cache.set(cache_key, results)
+
+            base_result = {"query": query}
 
             if data_type == "TIMESERIES":
                 return {**base_result, **results.get("interest_over_time", {})}
@@ -40,113 +101,92 @@ class FetchGoogleTrendsDataTool:
             return {**base_result, **results}
         except (KeyError, ValueError, TypeError) as e:
             print(f"Error processing trends data: {str(e)}")
-            return {"query": self.query}
-
-    def format_trends_for_llm(self, trends_data: Dict) -> Dict:
-        formatted_data = {
-            "query": trends_data.get("query", ""),
-            "trend_summary": {},
-            "interest_peaks": [],
-            "related_topics": [],
-        }
+            return {"query": query}
+
+    @staticmethod
+    def _search(params: Dict) -> Dict:
+        search = GoogleSearch({**params, "output": "json"})
+        url, parameters = search.construct_url("/search")
+        response = get_http_session().get(
+            url, params=parameters, timeout=call_timeout(settings.SERPAPI_TIMEOUT)
+        )
+        if response.status_code in RETRYABLE_STATUS_CODES:
+            raise UpstreamError(response.status_code, response.text)
+        return response.json()
+
+    async def _aget_trends_data(
+        self, data_type="TIMESERIES", time_period="today 3-m", query=None
+    ) -> Dict:
+        """Fetch trends data off the event loop, bounded by SERPAPI_TIMEOUT.
+
+        The lookup is also bounded by the request deadline, and hedged when
+        it runs past the recent p95 latency of its data type. A failed or
+        timed-out lookup yields an empty result for its query so that
+        sibling lookups in the same fan-out still succeed.
+        """
+        query = query or self.query
+        try:
+            timeout = call_timeout(self.settings.SERPAPI_TIMEOUT)
+            return await get_hedger(f"serpapi:{data_type.lower()}").call(
+                lambda: asyncio.wait_for(
+                    asyncio.to_thread(
+                        self._get_trends_data, data_type, time_period, query
+                    ),
+                    timeout=timeout,
+                )
+            )
+        except (TimeoutError, OSError, UpstreamError) as e:
+            print(f"Trends lookup failed for '{query}' ({data_type}): {str(e)}")
+            return {"query": query}
 
-        # Process time periods
-        for period_key, period_data in trends_data.get("time_periods", {}).items():
-            if not period_data.get("available", False):
-                continue
-
-            timeline_data = period_data.get("data", {}).get("timeline_data", [])
-            if not timeline_data:
-                continue
-
-            peak_points = []
-            for point in timeline_data:
-                date = point.get("date", "")
-                for value in point.get("values", []):
-                    if (
-                        value.get("query", "") == trends_data.get("query", "")
-                        and int(value.get("extracted_value", 0)) > 50
-                    ):
-                        peak_points.append(
-                            {"date": date, "value": value.get("extracted_value", 0)}
-                        )
-
-            formatted_data["trend_summary"][period_key] = {
-                "period": period_data.get("period", ""),
-                "has_significant_interest": bool(peak_points),
-                "peak_count": len(peak_points),
-                "data_points": len(timeline_data),
-            }
-            formatted_data["interest_peaks"].extend(peak_points)
-
-        related_keywords = trends_data.get("related_keywords", {}).get("keywords", {})
-        for keyword, data in related_keywords.items():
-            if "timeline_data" in data:
-                peak_value = 0
-                peak_date = ""
-                for point in data.get("timeline_data", []):
-                    for value in point.get("values", []):
-                        extracted_value = int(value.get("extracted_value", 0))
-                        if extracted_value > peak_value:
-                            peak_value = extracted_value
-                            peak_date = point.get("date", "")
-
-                if peak_value > 0:
-                    formatted_data["related_topics"].append(
-                        {
-                            "keyword": keyword,
-                            "peak_interest": peak_value,
-                            "peak_date": peak_date,
-                        }
-                    )
+    def get_raw_trends(self) -> str:
+        return Helpers.run_sync(self.aget_raw_trends())
 
-        formatted_data["insights"] = self._generate_insights(formatted_data)
-        return formatted_data
+    async def aget_raw_trends(self) -> str:
+        """Fetch and summarize trends, sharing the work with identical callers."""
+        return await _IN_FLIGHT.ado(
+            _flight_key("raw_trends", topic=self.query), self._afetch_raw_trends
+        )
 
-    def get_raw_trends(self) -> str:
+    async def _afetch_raw_trends(self) -> str:
         try:
-            short_term = self._get_trends_data(
-                data_type="TIMESERIES", time_period="today 1-m"
+            related_keywords = self._generate_related_keywords()
+
+            # Fan out the topic and related-keyword lookups in one round trip
+            short_term, related_queries, *keyword_trends = await asyncio.gather(
+                self._aget_trends_data(data_type="TIMESERIES", time_period="today 1-m"),
+                self._aget_trends_data(data_type="RELATED_QUERIES"),
+                *(
+                    self._aget_trends_data(time_period="today 3-m", query=keyword)
+                    for keyword in related_keywords
+                ),
             )
-            related_queries = self._get_trends_data(data_type="RELATED_QUERIES")
 
             if not short_term or not related_queries:
                 return "No trends data available for the given topic."
 
-            related_keywords = self._generate_related_keywords()
-            related_keyword_trends = {}
-
-            # Get trends for related keywords
-            original_query = self.query
-            for keyword in related_keywords:
-                self.query = keyword
-                related_keyword_trends[keyword] = self._get_trends_data(
-                    time_period="today 3-m"
-                )
-            self.query = original_query
-
-            data = {
-                "query": self.query,
-                "time_periods": {
+            # Send fixed-size statistics instead of the raw timelines, so the
+            # prompt stays small whatever the time window
+            digest = trends_analytics.build_trends_digest(
+                self.query,
+                periods={
                     "short_term": {
                         "period": "Last 1 month",
-                        "data": short_term,
-                        "available": bool(short_term),
+                        "timeline_data": short_term.get("timeline_data", []),
                     },
                 },
-                "related_queries": related_queries,
-                "related_keywords": {
-                    "keywords": related_keyword_trends,
-                    "count": len(related_keyword_trends),
+                keyword_timelines={
+                    keyword: trends.get("timeline_data", [])
+                    for keyword, trends in zip(related_keywords, keyword_trends)
                 },
-                "meta": {
-                    "last_updated": datetime.utcnow().isoformat(),
-                    "query_variations_analyzed": len(related_keywords) + 1,
-                },
-            }
+                related_queries=related_queries,
+                max_bytes=self.settings.TRENDS_DIGEST_MAX_BYTES,
+            )
 
-            prompt_builder = PromptBuilder(self.metadata_json, trends_data=data)
-            return get_gemini_llm().invoke(prompt_builder.data_trends()).content
+            prompt_builder = PromptBuilder(self.metadata_json, trends_data=digest)
+            return (
+                await get_routed_llm("trends").ainvoke(prompt_builder.data_trends())
+            ).content
 
         except (KeyError, ValueError, TypeError) as e:
             print(f"Error in get_raw_trends: {str(e)}")
@@ -162,63 +202,67 @@ class FetchGoogleTrendsDataTool:
             f"{base_query} rankings",
         ]
 
-    def _generate_insights(self, formatted_data: Dict) -> List[str]:
-        insights = []
-
-        if formatted_data["interest_peaks"]:
-            sorted_peaks = sorted(
-                formatted_data["interest_peaks"], key=lambda x: x["value"], reverse=True
-            )
-            insights.append(
-                f"Peak interest in '{formatted_data['query']}' occurred on {sorted_peaks[0]['date']}"
-            )
-            if len(sorted_peaks) > 1:
-                insights.append(
-                    f"There were {len(sorted_peaks)} significant spikes in interest over the analyzed periods"
-                )
-        else:
-            insights.append(
-                f"Interest in '{formatted_data['query']}' has been relatively steady with no major spikes"
-            )
-
-        # Process related topics
-        if formatted_data["related_topics"]:
-            sorted_topics = sorted(
-                formatted_data["related_topics"],
-                key=lambda x: x["peak_interest"],
-                reverse=True,
-            )
-            top_related = sorted_topics[0]["keyword"]
-            insights.append(
-                f"'{top_related}' is a highly related topic with significant interest"
-            )
-            if len(sorted_topics) > 1:
-                other_topics = [
-                    topic["keyword"]
-                    for topic in sorted_topics[1 : min(4, len(sorted_topics))]
-                ]
-                insights.append(
-                    f"Other related topics of interest include: {', '.join(other_topics)}"
-                )
-        return insights
-
 
 class ResearchTool:
     def __init__(self, metadata_json: Dict[str, Any]):
         self.metadata_json = metadata_json
 
+    def _llm(self):
+        return get_routed_llm(
+            "research",
+            cache_namespace="research",
+            semantic_text=f"{self.metadata_json['topic']}\n{self.metadata_json['goal']}",
+        )
+
+    def _flight_key(self) -> str:
+        return _flight_key(
+            "research",
+            topic=self.metadata_json["topic"],
+            goal=self.metadata_json["goal"],
+        )
+
     def get_research(self) -> str:
-        prompt_builder = PromptBuilder(metadata_json=self.metadata_json)
-        return get_gemini_llm().invoke(prompt_builder.research_prompt()).content
+        prompt = PromptBuilder(metadata_json=self.metadata_json).research_prompt()
+        return _IN_FLIGHT.do(
+            self._flight_key(), lambda: self._llm().invoke(prompt).content
+        )
+
+    async def aget_research(self) -> str:
+        prompt = PromptBuilder(metadata_json=self.metadata_json).research_prompt()
+
+        async def research():
+            return (await self._llm().ainvoke(prompt)).content
+
+        return await _IN_FLIGHT.ado(self._flight_key(), research)
 
 
 class LLMTrendsTool:
     def __init__(self, metadata_json: Dict[str, Any]):
         self.metadata_json = metadata_json
 
+    def _llm(self):
+        return get_routed_llm(
+            "trends",
+            cache_namespace="llm_trends",
+            semantic_text=self.metadata_json["topic"],
+        )
+
+    def _flight_key(self) -> str:
+        return _flight_key("llm_trends", topic=self.metadata_json["topic"])
+
     def get_llm_trends(self) -> str:
-        prompt_builder = PromptBuilder(metadata_json=self.metadata_json)
-        return get_gemini_llm().invoke(prompt_builder.llm_trends()).content
+        prompt = PromptBuilder(metadata_json=self.metadata_json).llm_trends()
+        return _IN_FLIGHT.do(
+            self._flight_key(), lambda: self._llm().invoke(prompt).content
+        )
+
+    async def aget_llm_trends(self) -> str:
+        prompt = PromptBuilder(metadata_json=self.metadata_json).llm_trends()
+
+        async def llm_trends():
+            return (await self._llm().ainvoke(prompt)).content
+
+        return await _IN_FLIGHT.ado(self._flight_key(), llm_trends)
 
 
 class BlogOutlineTool:
@@ -234,11 +278,49 @@ class BlogOutlineTool:
         self.research_data = research_data
         self.user_input = user_input
 
-    def get_blog_outline(self) -> str:
-        prompt_builder = PromptBuilder(
+    def _prompt_builder(self) -> PromptBuilder:
+        return PromptBuilder(
             metadata_json=self.metadata_json,
             trends_data=self.trends_data,
             research_data=self.research_data,
             user_input=self.user_input,
         )
-        return get_gemini_llm().invoke(prompt_builder.blog_outline()).content
+
+    def get_blog_outline(self) -> str:
+        prompt = self._prompt_builder().blog_outline()
+        llm = get_routed_llm("outline", cache_namespace="outline")
+        # The prompt carries the metadata, trends, research and user input
+        return _IN_FLIGHT.do(
+            _flight_key("outline", prompt=prompt), lambda: llm.invoke(prompt).content
+        )
+
+    async def aget_blog_outline(self) -> str:
+        prompt = self._prompt_builder().blog_outline()
+        llm = get_routed_llm("outline", cache_namespace="outline")
+
+        async def outline():
+            return (await llm.ainvoke(prompt)).content
+
+        return await _IN_FLIGHT.ado(_flight_key("outline", prompt=prompt), outline)
+
+
+def _collect_metrics():
+    yield (
+        "blog_writer_in_flight_calls",
+        "gauge",
+        "Distinct trends, research and outline calls in flight",
+        {},
+        _IN_FLIGHT.in_flight,
+    )
+    for role in ("leaders", "coalesced"):
+        yield (
+            "blog_writer_single_flight_calls_total",
+            "counter",
+            "Trends, research and outline requests that ran (leaders) or "
+            "joined an identical in-flight call (coalesced)",
+            {"role": role},
+            _IN_FLIGHT.stats[role],
+        )
+
+
+register_collector(_collect_metrics)
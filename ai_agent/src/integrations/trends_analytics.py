@@ -0,0 +1,300 @@
+import json
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+DIGEST_TOP_K = 3
+CHANGE_POINT_MIN_SHIFT = 10.0
+
+
+def _round(value: float, digits: int) -> float:
+    # Adding 0.0 turns a rounded -0.0 into 0.0
+    return round(value, digits) + 0.0
+
+
+class TrendSeries:
+    """Interest-over-time values of one query held as NumPy arrays.
+
+    Dates are only looked up for the points a caller selects, so building
+    a series reads each SerpAPI value once and converts them in bulk.
+
+    Args:
+        query: The search query the values belong to
+        timeline_data: The SerpAPI points the series was built from
+        point_indices: Index into `timeline_data` of each value
+        values: Interest values (0-100)
+    """
+
+    __slots__ = ("query", "timeline_data", "point_indices", "values")
+
+    def __init__(
+        self,
+        query: str,
+        timeline_data: List[Dict[str, Any]],
+        point_indices: np.ndarray,
+        values: np.ndarray,
+    ):
+        self.query = query
+        self.timeline_data = timeline_data
+        self.point_indices = point_indices
+        self.values = values
+
+    @classmethod
+    def from_timeline(
+        cls, timeline_data: List[Dict[str, Any]], query: Optional[str] = None
+    ) -> "TrendSeries":
+        """Build a series from SerpAPI `timeline_data` points.
+
+        Args:
+            timeline_data: Points with a "date" and a list of per-query "values"
+            query: Keep only values for this query; None keeps every value
+
+        Returns:
+            The series, with one entry per kept value
+        """
+        point_values = [point.get("values", ()) for point in timeline_data]
+        counts = np.fromiter(map(len, point_values), dtype=np.intp)
+        entries = [value for values in point_values for value in values]
+        point_indices = np.repeat(np.arange(len(point_values)), counts)
+
+        if query is not None:
+            keep = np.fromiter(
+                (value.get("query", "") == query for value in entries), dtype=bool
+            )
+            point_indices = point_indices[keep]
+            entries = [value for value, kept in zip(entries, keep) if kept]
+
+        values = np.fromiter(
+            (value.get("extracted_value", 0) for value in entries),
+            dtype=float,
+            count=len(entries),
+        )
+        return cls(query or "", timeline_data, point_indices, values)
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def date(self, index: int) -> str:
+        """Date label of the point at a series index."""
+        return self.timeline_data[self.point_indices[index]].get("date", "")
+
+    def peak(self) -> Optional[int]:
+        """Index of the first point with the highest interest, if any."""
+        return int(np.argmax(self.values)) if len(self) else None
+
+    def slope(self) -> float:
+        """Least-squares change in interest per data point."""
+        if len(self) < 2:
+            return 0.0
+        return float(np.polyfit(np.arange(len(self)), self.values, 1)[0])
+
+    def change_points(
+        self, k: int = DIGEST_TOP_K, min_shift: float = CHANGE_POINT_MIN_SHIFT
+    ) -> List[Dict[str, Any]]:
+        """The k largest shifts in mean interest, in time order.
+
+        Each candidate point compares the mean of a window before it with
+        the mean of a window starting at it; the window is a tenth of the
+        series, so the result does not depend on the time period's length.
+
+        Args:
+            k: Maximum number of change points
+            min_shift: Smallest mean shift (0-100 scale) worth reporting
+
+        Returns:
+            Dicts with the point's date and the mean level before and after it
+        """
+        window = max(2, len(self) // 10)
+        if len(self) < 2 * window:
+            return []
+
+        totals = np.concatenate(([0.0], np.cumsum(self.values)))
+        candidates = np.arange(window, len(self) - window + 1)
+        before = (totals[candidates] - totals[candidates - window]) / window
+        after = (totals[candidates + window] - totals[candidates]) / window
+        shifts = np.abs(after - before)
+
+        chosen = []
+        for position in np.argsort(-shifts, kind="stable"):
+            if len(chosen) == k or shifts[position] < min_shift:
+                break
+            # Neighbouring candidates describe the same shift
+            if all(abs(position - other) >= window for other in chosen):
+                chosen.append(position)
+
+        return [
+            {
+                "date": self.date(candidates[position]),
+                "before": round(float(before[position]), 1),
+                "after": round(float(after[position]), 1),
+            }
+            for position in sorted(chosen)
+        ]
+
+    def summary(self, k: int = DIGEST_TOP_K) -> Dict[str, Any]:
+        """Fixed-size statistics of the series for an LLM prompt.
+
+        Args:
+            k: Number of peaks and change points to include
+
+        Returns:
+            Range, level, slope, top peaks and change points of the series
+        """
+        if not len(self):
+            return {"points": 0}
+
+        return {
+            "from": self.date(0),
+            "to": self.date(len(self) - 1),
+            "points": len(self),
+            "min": int(self.values.min()),
+            "max": int(self.values.max()),
+            "mean": round(float(self.values.mean()), 1),
+            "latest": int(self.values[-1]),
+            "slope_per_point": _round(self.slope(), 2),
+            "peaks": self.points(top_k(self.values, k)),
+            "change_points": self.change_points(k),
+        }
+
+    def points(self, indices: np.ndarray) -> List[Dict[str, Any]]:
+        """Date/value dicts for the given indices."""
+        return [
+            {"date": self.date(index), "value": int(value)}
+            for index, value in zip(indices, self.values[indices])
+        ]
+
+
+def top_k(values: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k largest values, largest first, earliest first on ties.
+
+    Uses a partial partition, so only the selected values are sorted.
+    """
+    values = np.asarray(values, dtype=float)
+    k = min(k, len(values))
+    if k <= 0:
+        return np.array([], dtype=int)
+
+    if k < len(values):
+        candidates = np.argpartition(-values, k - 1)[:k]
+    else:
+        candidates = np.arange(len(values))
+    return candidates[np.lexsort((candidates, -values[candidates]))]
+
+
+def _top_related_queries(
+    related_queries: Dict[str, Any], k: int
+) -> Dict[str, List[Dict[str, Any]]]:
+    ranked = {}
+    for kind in ("top", "rising"):
+        entries = related_queries.get(kind) or []
+        scores = np.fromiter(
+            (entry.get("extracted_value", 0) for entry in entries),
+            dtype=float,
+            count=len(entries),
+        )
+        ranked[kind] = [
+            {
+                "query": entries[index].get("query", ""),
+                "value": entries[index].get("value", ""),
+            }
+            for index in top_k(scores, k)
+        ]
+    return ranked
+
+
+def _trim_digest(digest: Dict[str, Any], limit: int) -> Dict[str, Any]:
+    def trim_series(summary: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            **summary,
+            "peaks": summary.get("peaks", [])[:limit],
+            "change_points": summary.get("change_points", [])[:limit],
+        }
+
+    return {
+        "query": digest["query"],
+        "periods": {
+            name: trim_series(summary) for name, summary in digest["periods"].items()
+        },
+        "related_keywords": dict(list(digest["related_keywords"].items())[:limit]),
+        "related_queries": {
+            kind: entries[:limit] for kind, entries in digest["related_queries"].items()
+        },
+    }
+
+
+def _dumps(data: Dict[str, Any]) -> str:
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+
+
+def build_trends_digest(
+    query: str,
+    periods: Dict[str, Dict[str, Any]],
+    keyword_timelines: Dict[str, List[Dict[str, Any]]],
+    related_queries: Dict[str, Any],
+    max_bytes: int,
+) -> str:
+    """Reduce SerpAPI trends payloads to a compact JSON digest for the LLM.
+
+    Every series becomes fixed-size statistics, so the digest does not grow
+    with the time window. When the digest is over `max_bytes`, peaks, change
+    points, related keywords and related queries are cut back together until
+    it fits.
+
+    Args:
+        query: The topic the trends were fetched for
+        periods: Period name mapped to {"period": label, "timeline_data": points}
+        keyword_timelines: Related keyword mapped to its timeline points
+        related_queries: SerpAPI related queries with "top" and "rising" lists
+        max_bytes: Hard cap on the UTF-8 size of the digest
+
+    Returns:
+        The digest as compact JSON
+    """
+    keyword_series = {
+        keyword: TrendSeries.from_timeline(timeline)
+        for keyword, timeline in keyword_timelines.items()
+    }
+    keyword_names = list(keyword_series)
+    keyword_means = np.fromiter(
+        (
+            series.values.mean() if len(series) else 0.0
+            for series in keyword_series.values()
+        ),
+        dtype=float,
+        count=len(keyword_series),
+    )
+
+    related_keywords = {}
+    for index in top_k(keyword_means, len(keyword_names)):
+        series = keyword_series[keyword_names[index]]
+        if not len(series):
+            continue
+        peak = series.peak()
+        related_keywords[keyword_names[index]] = {
+            "mean": round(float(keyword_means[index]), 1),
+            "max": int(series.values[peak]),
+            "peak_date": series.date(peak),
+            "slope_per_point": _round(series.slope(), 2),
+        }
+
+    digest = {
+        "query": query,
+        "periods": {
+            name: {
+                "period": period.get("period", ""),
+                **TrendSeries.from_timeline(period.get("timeline_data", [])).summary(),
+            }
+            for name, period in periods.items()
+        },
+        "related_keywords": related_keywords,
+        "related_queries": _top_related_queries(related_queries, DIGEST_TOP_K),
+    }
+
+    for limit in range(max(DIGEST_TOP_K, len(related_keywords)), -1, -1):
+        text = _dumps(_trim_digest(digest, limit))
+        if len(text.encode("utf-8")) <= max_bytes:
+            return text
+
+    # Only an oversized topic string gets here; cut it to honour the cap
+    text = _dumps({"query": query, "truncated": True})
+    return text.encode("utf-8")[:max_bytes].decode("utf-8", errors="ignore")
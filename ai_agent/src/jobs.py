@@ -0,0 +1,378 @@
+import asyncio
+import json
+import time
+import uuid
+from typing import Any, Dict, List, Optional, Tuple
+
+from config.settings import settings
+from src.integrations.database import connect_sqlite
+from src.main import ainitialize_ai_tools, arun_blog_generation, memory_handler
+from src.pipeline.ai_generator import get_memory
+from src.utils.cache import MemoryCache, make_cache_key
+from src.utils.rate_limiter import BATCH, priority_scope
+
+_JOB_QUEUE = None
+
+
+class JobStore:
+    """SQLite-backed record of batch jobs and the result of each item.
+
+    Workers sharing `JOB_DB_PATH` claim an item before running it, so each
+    item runs once. A running item whose claim is older than `JOB_CLAIM_TTL`
+    is taken to belong to a worker that died and can be claimed again.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or settings.JOB_DB_PATH
+        with connect_sqlite(self.path) as connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                "job_id TEXT PRIMARY KEY, created_at REAL NOT NULL)"
+            )
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS job_items ("
+                "job_id TEXT NOT NULL, item_index INTEGER NOT NULL, "
+                "request TEXT NOT NULL, status TEXT NOT NULL, content TEXT, "
+                "content_type TEXT, error TEXT, updated_at REAL NOT NULL, "
+                "owner TEXT, PRIMARY KEY (job_id, item_index))"
+            )
+            columns = [
+                row[1] for row in connection.execute("PRAGMA table_info(job_items)")
+            ]
+            if "owner" not in columns:
+                connection.execute("ALTER TABLE job_items ADD COLUMN owner TEXT")
+
+    def create_job(self, requests: List[Dict[str, Any]]) -> str:
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        with connect_sqlite(self.path) as connection:
+            connection.execute(
+                "INSERT INTO jobs (job_id, created_at) VALUES (?, ?)", (job_id, now)
+            )
+            connection.executemany(
+                "INSERT INTO job_items "
+                "(job_id, item_index, request, status, updated_at) "
+                "VALUES (?, ?, ?, 'queued', ?)",
+                [
+                    (job_id, index, json.dumps(request), now)
+                    for index, request in enumerate(requests)
+                ],
+            )
+        return job_id
+
+    def claim_item(self, job_id: str, index: int, owner: str) -> bool:
+        """Mark an item running for `owner` unless another worker holds it.
+
+        Args:
+            job_id: The job the item belongs to
+            index: Position of the item in the job
+            owner: ID of the claiming worker
+
+        Returns:
+            True if the claim succeeded and the caller should run the item
+        """
+        now = time.time()
+        with connect_sqlite(self.path) as connection:
+            cursor = connection.execute(
+                "UPDATE job_items SET status = 'running', owner = ?, updated_at = ? "
+                "WHERE job_id = ? AND item_index = ? AND (status = 'queued' "
+                "OR (status = 'running' AND updated_at < ?))",
+                (owner, now, job_id, index, now - settings.JOB_CLAIM_TTL),
+            )
+        return cursor.rowcount == 1
+
+    def release_items(self, owner: str) -> int:
+        """Queue the items `owner` is running again, for another worker to claim.
+
+        Returns:
+            The number of items released
+        """
+        with connect_sqlite(self.path) as connection:
+            cursor = connection.execute(
+                "UPDATE job_items SET status = 'queued', owner = NULL, "
+                "updated_at = ? WHERE owner = ? AND status = 'running'",
+                (time.time(), owner),
+            )
+        return cursor.rowcount
+
+    def finish_item(
+        self,
+        job_id: str,
+        index: int,
+        owner: str,
+        status: str,
+        content: Optional[str] = None,
+        content_type: Optional[str] = None,
+        error: Optional[str] = None,
+    ) -> None:
+        """Record the outcome of an item, if `owner` still holds its claim."""
+        with connect_sqlite(self.path) as connection:
+            connection.execute(
+                "UPDATE job_items SET status = ?, content = ?, content_type = ?, "
+                "error = ?, updated_at = ? "
+                "WHERE job_id = ? AND item_index = ? AND owner = ?",
+                (
+                    status,
+                    content,
+                    content_type,
+                    error,
+                    time.time(),
+                    job_id,
+                    index,
+                    owner,
+                ),
+            )
+
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with connect_sqlite(self.path) as connection:
+            job = connection.execute(
+                "SELECT created_at FROM jobs WHERE job_id = ?", (job_id,)
+            ).fetchone()
+            if job is None:
+                return None
+
+            rows = connection.execute(
+                "SELECT item_index, request, status, content, content_type, error "
+                "FROM job_items WHERE job_id = ? ORDER BY item_index",
+                (job_id,),
+            ).fetchall()
+
+        items = [
+            {
+                "index": index,
+                "session_id": json.loads(request).get("session_id"),
+                "status": status,
+                "content": content,
+                "type": content_type,
+                "error": error,
+            }
+            for index, request, status, content, content_type, error in rows
+        ]
+        counts = {
+            status: sum(item["status"] == status for item in items)
+            for status in ("queued", "running", "completed", "failed")
+        }
+
+        if counts["queued"] + counts["running"]:
+            job_status = (
+                "running" if counts["running"] or counts["completed"] else "queued"
+            )
+        elif counts["failed"] == len(items):
+            job_status = "failed"
+        else:
+            job_status = "completed"
+
+        return {
+            "job_id": job_id,
+            "status": job_status,
+            "created_at": job[0],
+            "total": len(items),
+            **counts,
+            "items": items,
+        }
+
+    def unfinished_items(self) -> List[Tuple[str, int, Dict[str, Any]]]:
+        with connect_sqlite(self.path) as connection:
+            rows = connection.execute(
+                "SELECT job_id, item_index, request FROM job_items "
+                "WHERE status IN ('queued', 'running') ORDER BY updated_at"
+            ).fetchall()
+        return [(job_id, index, json.loads(request)) for job_id, index, request in rows]
+
+
+class JobQueue:
+    """Worker pool that runs batch blog generations to completion.
+
+    Items whose metadata shares a topic and goal reuse one trends/research
+    lookup. Items run at BATCH priority, so interactive requests are
+    scheduled ahead of them, and every LLM call stays within the global
+    LLM_MAX_CONCURRENCY.
+    """
+
+    def __init__(self, store: Optional[JobStore] = None, workers: Optional[int] = None):
+        self.store = store or JobStore()
+        self.workers = max(1, workers or settings.BATCH_WORKERS)
+        self.owner = uuid.uuid4().hex
+        self._queue = None
+        self._tasks = []
+        self._shared_lookups = MemoryCache(
+            settings.TRENDS_CACHE_TTL, settings.CACHE_MAX_ENTRIES
+        )
+
+    async def start(self) -> None:
+        """Start the workers and queue the unfinished items of earlier runs.
+
+        Called from the app lifespan, so jobs interrupted by a restart resume
+        without waiting for a new submission. Items another worker is still
+        running are skipped when their claim fails.
+        """
+        if self._tasks:
+            return
+
+        self._queue = asyncio.Queue()
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        for job_id, index, request in await asyncio.to_thread(
+            self.store.unfinished_items
+        ):
+            self._queue.put_nowait((job_id, index, request))
+
+    async def stop(self) -> None:
+        """Cancel the workers and queue their running items again.
+
+        Released items are picked up by the next `start`, here or in
+        another process sharing `JOB_DB_PATH`.
+        """
+        tasks, self._tasks = self._tasks, []
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await asyncio.to_thread(self.store.release_items, self.owner)
+
+    async def submit(self, requests: List[Dict[str, Any]]) -> str:
+        """Persist a batch of blog requests and queue them for generation.
+
+        Args:
+            requests: Serialized BlogRequest payloads
+
+        Returns:
+            The job ID to poll for status and results
+        """
+        await self.start()
+        job_id = await asyncio.to_thread(self.store.create_job, requests)
+        for index, request in enumerate(requests):
+            self._queue.put_nowait((job_id, index, request))
+        return job_id
+
+    async def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return await asyncio.to_thread(self.store.get_job, job_id)
+
+    async def _worker(self) -> None:
+        while True:
+            job_id, index, request = await self._queue.get()
+            try:
+                await self._run_item(job_id, index, request)
+            finally:
+                self._queue.task_done()
+
+    async def _run_item(self, job_id: str, index: int, request: Dict[str, Any]) -> None:
+        if not await asyncio.to_thread(
+            self.store.claim_item, job_id, index, self.owner
+        ):
+            return
+
+        try:
+            with priority_scope(BATCH):
+                content, content_type, success = await self._generate(
+                    request, request.get("run_id") or f"{job_id}-{index}"
+                )
+        except Exception as e:
+            await asyncio.to_thread(
+                self.store.finish_item,
+                job_id,
+                index,
+                self.owner,
+                "failed",
+                error=str(e),
+            )
+            return
+
+        if success:
+            await asyncio.to_thread(
+                self.store.finish_item,
+                job_id,
+                index,
+                self.owner,
+                "completed",
+                content=content,
+                content_type=content_type,
+            )
+        else:
+            await asyncio.to_thread(
+                self.store.finish_item,
+                job_id,
+                index,
+                self.owner,
+                "failed",
+                error=content,
+            )
+
+    async def _generate(
+        self, request: Dict[str, Any], run_id: str
+    ) -> Tuple[str, str, bool]:
+        metadata = request["blog"]
+        find_trends_type = request["find_trends_type"]
+        session_id = request["session_id"]
+
+        if request.get("clear_memory"):
+            memory = await asyncio.to_thread(get_memory, session_id=session_id)
+            memory.clear()
+
+        trends_data, research_data = await self._shared_data(metadata, find_trends_type)
+        await asyncio.to_thread(
+            memory_handler,
+            session_id,
+            trends_data=trends_data,
+            research_data=research_data,
+        )
+
+        content, content_type, success = await arun_blog_generation(
+            dict(metadata),
+            find_trends_type,
+            session_id=session_id,
+            user_input=request.get("user_input"),
+            step="blog_outline",
+            run_id=run_id,
+            timeout=request.get("timeout_seconds"),
+        )
+        if not success:
+            return content, content_type, success
+
+        return await arun_blog_generation(
+            dict(metadata),
+            find_trends_type,
+            session_id=session_id,
+            step="generate_blog",
+            regenerate_sections=request.get("regenerate_sections"),
+            run_id=run_id,
+            timeout=request.get("timeout_seconds"),
+            use_stored_result=request.get("use_stored_result", True),
+        )
+
+    async def _shared_data(
+        self, metadata: Dict[str, Any], find_trends_type: str
+    ) -> Tuple[Any, Any]:
+        key = make_cache_key(
+            "batch_data",
+            {
+                "topic": metadata["topic"],
+                "goal": metadata["goal"],
+                "find_trends_type": find_trends_type,
+            },
+        )
+        task = self._shared_lookups.get(key)
+        if task is None:
+            task = asyncio.create_task(
+                ainitialize_ai_tools(dict(metadata), find_trends_type)
+            )
+            self._shared_lookups.set(key, task)
+
+        try:
+            trends_data, research_data = await asyncio.shield(task)
+        except Exception:
+            self._shared_lookups.delete(key)
+            raise
+
+        if not trends_data or not research_data:
+            # Don't share a partial lookup; the next item retries it
+            self._shared_lookups.delete(key)
+        return trends_data, research_data
+
+
+def get_job_queue() -> JobQueue:
+    """Get the process-wide batch job queue."""
+    global _JOB_QUEUE
+
+    if _JOB_QUEUE is None:
+        _JOB_QUEUE = JobQueue()
+    return _JOB_QUEUE
@@ -1,4 +1,14 @@
-from typing import Any, Dict, Optional, Tuple
+import asyncio
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+)
 
 from config.settings import settings
 from src.integrations.tools import (
@@ -7,9 +17,30 @@ from src.integrations.tools import (
     LLMTrendsTool,
     ResearchTool,
 )
-from src.pipeline.ai_generator import get_gemini_llm, get_memory
+from src.pipeline.ai_generator import get_memory
+from src.pipeline.article_store import article_hash, get_article_store
+from src.pipeline.model_router import get_routed_llm
 from src.pipeline.prompt_builder import PromptBuilder
+from src.pipeline.prompt_compactor import count_tokens
+from src.pipeline.run_store import RunCheckpoint
+from src.pipeline.section_cache import SectionCache
+from src.pipeline.section_generator import SectionGenerator
 from src.utils.constants import Constants
+from src.utils.deadline import call_timeout, deadline_scope
+from src.utils.helpers import Helpers
+from src.utils.telemetry import SECTIONS, span
+
+# Session artifacts each step reads, and the artifacts each one is built
+# from. A step only computes what it needs and the session lacks.
+STEP_REQUIREMENTS = {
+    "blog_outline": ("trends_data", "research_data"),
+    "generate_blog": ("blog_outline",),
+}
+ARTIFACT_DEPENDENCIES = {
+    "trends_data": (),
+    "research_data": (),
+    "blog_outline": ("trends_data", "research_data"),
+}
 
 
 def memory_handler(
@@ -65,6 +96,23 @@ def initialize_ai_tools(
 ) -> Tuple[Any, Any]:
     """Initialize and run AI tools to gather trends and research data.
 
+    Synchronous wrapper around `ainitialize_ai_tools`.
+
+    Args:
+        metadata: The metadata for the blog
+        find_trends_type: The type of trends to find
+
+    Returns:
+        Tuple of trends_data and research_data
+    """
+    return Helpers.run_sync(ainitialize_ai_tools(metadata, find_trends_type))
+
+
+async def ainitialize_ai_tools(
+    metadata: Dict[str, Any], find_trends_type: str
+) -> Tuple[Any, Any]:
+    """Gather trends and research data without blocking the event loop.
+
     Args:
         metadata: The metadata for the blog
         find_trends_type: The type of trends to find
@@ -72,17 +120,51 @@ def initialize_ai_tools(
     Returns:
         Tuple of trends_data and research_data
     """
+    with span("data_gathering"):
+        trends_data, research_data = await asyncio.gather(
+            _produce_artifact("trends_data", metadata, find_trends_type, {}),
+            _produce_artifact("research_data", metadata, find_trends_type, {}),
+        )
+
+    return trends_data, research_data
+
+
+def _trends_call(
+    metadata: Dict[str, Any], find_trends_type: str
+) -> Optional[Callable[[], Awaitable[str]]]:
     constants = Constants()
-    trends_data = None
 
     if find_trends_type == constants.FIND_TRENDS_TYPE["GOOGLE_TRENDS"]:
-        trends_data = FetchGoogleTrendsDataTool(metadata).get_raw_trends()
-    elif find_trends_type == constants.FIND_TRENDS_TYPE["LLM"]:
-        trends_data = LLMTrendsTool(metadata).get_llm_trends()
+        return FetchGoogleTrendsDataTool(metadata).aget_raw_trends
+    if find_trends_type == constants.FIND_TRENDS_TYPE["LLM"]:
+        return LLMTrendsTool(metadata).aget_llm_trends
+    return None
 
-    research_data = ResearchTool(metadata).get_research()
 
-    return trends_data, research_data
+async def _gather_with_timeout(
+    name: str, call: Optional[Callable[[], Awaitable]]
+) -> Any:
+    """Await one data-gathering call, tolerating its failure.
+
+    Args:
+        name: Name of the artifact being gathered, used in error messages
+        call: Function starting the call, or None to skip. It is only called
+            once the deadline allows the call to start.
+
+    Returns:
+        The call's result, or None if it failed or exceeded DATA_GATHER_TIMEOUT
+        or the request deadline
+    """
+    if call is None:
+        return None
+
+    try:
+        with span(name):
+            timeout = call_timeout(settings.DATA_GATHER_TIMEOUT)
+            return await asyncio.wait_for(call(), timeout=timeout)
+    except Exception as e:
+        print(f"Error gathering {name} data: {str(e)}")
+        return None
 
 
 def run_blog_generation(
@@ -92,9 +174,16 @@ def run_blog_generation(
     clear_memory: bool = False,
     user_input: Optional[str] = None,
     step: Optional[str] = None,
+    regenerate_sections: Optional[List[str]] = None,
+    run_id: Optional[str] = None,
+    timeout: Optional[float] = None,
+    use_stored_result: bool = True,
+    on_article_hash: Optional[Callable[[str], None]] = None,
 ) -> Tuple[str, str, bool]:
     """Generate a blog based on metadata and optional session data.
 
+    Synchronous wrapper around `arun_blog_generation` for existing callers.
+
     Args:
         metadata: The metadata for the blog
         find_trends_type: The type of trends to find
@@ -102,67 +191,473 @@ def run_blog_generation(
         clear_memory: Whether to clear memory for this session
         user_input: Optional user input to incorporate
         step: The step of the blog generation process
+        regenerate_sections: Sections to generate again even if unchanged
+        run_id: Optional run ID to checkpoint the run under and resume from
+        timeout: Deadline in seconds for the run and every upstream call in
+            it; defaults to REQUEST_TIMEOUT
+        use_stored_result: Serve a blog already stored for the same metadata,
+            outline and models instead of generating it again
+        on_article_hash: Called with the blog's article store hash in the
+            generate_blog step
 
     Returns:
         Tuple of (content, content_type, success_flag)
     """
-    trends_data = None
-    research_data = None
-    blog_outline = None
+    return Helpers.run_sync(
+        arun_blog_generation(
+            metadata,
+            find_trends_type,
+            session_id=session_id,
+            clear_memory=clear_memory,
+            user_input=user_input,
+            step=step,
+            regenerate_sections=regenerate_sections,
+            run_id=run_id,
+            timeout=timeout,
+            use_stored_result=use_stored_result,
+            on_article_hash=on_article_hash,
+        )
+    )
+
+
+async def arun_blog_generation(
+    metadata: Dict[str, Any],
+    find_trends_type: str,
+    session_id: Optional[str] = None,
+    clear_memory: bool = False,
+    user_input: Optional[str] = None,
+    step: Optional[str] = None,
+    regenerate_sections: Optional[List[str]] = None,
+    run_id: Optional[str] = None,
+    timeout: Optional[float] = None,
+    use_stored_result: bool = True,
+    on_article_hash: Optional[Callable[[str], None]] = None,
+) -> Tuple[str, str, bool]:
+    """Generate a blog using async LLM calls and non-blocking trend fetches.
 
-    try:
-        if session_id and settings.USE_MEMORY:
-            if clear_memory:
-                memory = get_memory(session_id=session_id)
-                memory.clear()
-
-            stored_data = retrieve_data_from_memory(session_id)
-            trends_data = stored_data.get("trends_data")
-            research_data = stored_data.get("research_data")
-            blog_outline = stored_data.get("blog_outline")
-
-            if not trends_data or not research_data:
-                trends_data, research_data = initialize_ai_tools(
-                    metadata, find_trends_type
-                )
+    With a run ID, trends, research, the outline, every section and each
+    step's result are checkpointed as they complete. Calling again with the
+    same run ID after a failure only computes what is missing, and a step
+    that already finished returns its stored result. Finished blogs are
+    kept in the article store, so generating the same blog again from the
+    same outline costs no LLM calls.
 
-                memory_handler(
+    Args:
+        metadata: The metadata for the blog
+        find_trends_type: The type of trends to find
+        session_id: Optional session ID for memory retrieval/storage
+        clear_memory: Whether to clear memory for this session
+        user_input: Optional user input to incorporate
+        step: The step of the blog generation process
+        regenerate_sections: Sections to generate again even if unchanged
+        run_id: Optional run ID to checkpoint the run under and resume from
+        timeout: Deadline in seconds for the run and every upstream call in
+            it; defaults to REQUEST_TIMEOUT
+        use_stored_result: Serve a blog already stored for the same metadata,
+            outline and models instead of generating it again
+        on_article_hash: Called with the blog's article store hash in the
+            generate_blog step
+
+    Returns:
+        Tuple of (content, content_type, success_flag)
+    """
+    checkpoint = None
+    try:
+        step_label = step if step in ("blog_outline", "generate_blog") else "other"
+        with (
+            span("blog_generation", step=step_label),
+            deadline_scope(timeout or settings.REQUEST_TIMEOUT),
+        ):
+            if session_id and settings.USE_MEMORY:
+                if run_id:
+                    # Session, checkpoint and article stores block on SQLite or
+                    # Postgres, so they are reached from a worker thread
+                    checkpoint = await asyncio.to_thread(
+                        RunCheckpoint, run_id, metadata, find_trends_type
+                    )
+                    stored = (
+                        None
+                        if regenerate_sections
+                        else await asyncio.to_thread(
+                            checkpoint.result, step, user_input
+                        )
+                    )
+                    if stored:
+                        print(f"Run {run_id} already completed {step}")
+                        return stored[0], stored[1], True
+                    await asyncio.to_thread(checkpoint.start, step)
+
+                artifacts = await aload_step_artifacts(
+                    metadata,
+                    find_trends_type,
                     session_id,
-                    trends_data=trends_data,
-                    research_data=research_data,
+                    step,
+                    clear_memory,
+                    checkpoint,
                 )
 
-            if step == "blog_outline":
-                blog_outline = BlogOutlineTool(
-                    metadata, trends_data, research_data, user_input
-                ).get_blog_outline()
+                if step == "blog_outline":
+                    blog_outline = await _produce_artifact(
+                        "blog_outline",
+                        metadata,
+                        find_trends_type,
+                        artifacts,
+                        user_input,
+                    )
+
+                    await asyncio.to_thread(
+                        memory_handler, session_id, blog_outline=blog_outline
+                    )
+                    if checkpoint:
+                        await asyncio.to_thread(
+                            checkpoint.save, "blog_outline", blog_outline
+                        )
+                        await asyncio.to_thread(
+                            checkpoint.complete,
+                            step,
+                            blog_outline,
+                            "blog_outline",
+                            user_input,
+                        )
+
+                    print(f"############ Blog outline: \n{blog_outline}\n############")
+
+                    return blog_outline, "blog_outline", True
+
+                if step == "generate_blog":
+                    blog_outline = artifacts.get("blog_outline")
+                    prompts = build_section_prompts(metadata, blog_outline)
+                    blog_hash = article_hash(metadata, blog_outline, prompts)
+                    if on_article_hash:
+                        on_article_hash(blog_hash)
+
+                    section_cache = await asyncio.to_thread(SectionCache, session_id)
+                    article_store = await asyncio.to_thread(get_article_store)
+                    article = (
+                        await asyncio.to_thread(article_store.get, blog_hash)
+                        if use_stored_result and not regenerate_sections
+                        else None
+                    )
+                    if article:
+                        print(f"Serving stored blog {blog_hash}")
+                        SECTIONS.inc(len(article["sections"]), source="stored")
+                        # Later section edits in this session start from it
+                        await asyncio.to_thread(
+                            section_cache.save, prompts, article["sections"]
+                        )
+                        if checkpoint:
+                            await asyncio.to_thread(
+                                checkpoint.complete,
+                                step,
+                                article["content"],
+                                article["type"],
+                                user_input,
+                            )
+                        return article["content"], article["type"], True
+
+                    sections, pending = await asyncio.to_thread(
+                        section_cache.split, prompts, regenerate_sections
+                    )
+                    SECTIONS.inc(len(sections), source="cached")
+                    if checkpoint:
+                        restored = await asyncio.to_thread(
+                            checkpoint.sections, pending, regenerate_sections
+                        )
+                        SECTIONS.inc(len(restored), source="checkpoint")
+                        sections.update(restored)
+                        pending = {
+                            section: prompt
+                            for section, prompt in pending.items()
+                            if section not in restored
+                        }
+                    print(
+                        f"Reusing {len(prompts) - len(pending)} of {len(prompts)} "
+                        "stored sections"
+                    )
+                    SECTIONS.inc(len(pending), source="generated")
+
+                    callbacks = (
+                        checkpoint.section_callbacks(pending) if checkpoint else {}
+                    )
+                    generated = await SectionGenerator(
+                        llm_for_section=get_routed_llm
+                    ).agenerate(pending, **callbacks)
+                    await asyncio.to_thread(section_cache.save, pending, generated)
+                    sections.update(generated)
+                    full_blog = SectionGenerator.assemble(sections, list(prompts))
+                    await asyncio.to_thread(
+                        article_store.put,
+                        blog_hash,
+                        metadata,
+                        blog_outline,
+                        sections,
+                        full_blog,
+                    )
+                    if checkpoint:
+                        await asyncio.to_thread(
+                            checkpoint.complete,
+                            step,
+                            full_blog,
+                            "markdown",
+                            user_input,
+                        )
+
+                    print(f"############ Full blog: \n{full_blog}\n############")
+
+                    return full_blog, "markdown", True
+
+            return "", "", False
+
+    except (KeyError, ValueError, ConnectionError, TimeoutError) as e:
+        error_message = f"Error during blog generation: {str(e)}"
+        print(error_message)
+        if checkpoint:
+            await asyncio.to_thread(checkpoint.fail, error_message)
+        return error_message, "", False
+    except Exception as e:
+        if checkpoint:
+            await asyncio.to_thread(checkpoint.fail, str(e))
+        raise
 
-                memory_handler(session_id, blog_outline=blog_outline)
 
-                print(f"############ Blog outline: \n{blog_outline}\n############")
+async def astream_blog_generation(
+    metadata: Dict[str, Any],
+    find_trends_type: str,
+    session_id: Optional[str] = None,
+    clear_memory: bool = False,
+    regenerate_sections: Optional[List[str]] = None,
+    use_stored_result: bool = True,
+    on_article_hash: Optional[Callable[[str], None]] = None,
+) -> AsyncIterator[Tuple[str, str]]:
+    """Stream the generate_blog step as (section, text chunk) pairs.
+
+    Sections are generated concurrently but yielded in the structure's
+    step order, so the first chunk arrives as soon as the first section's
+    first token is available. Stored sections whose inputs are unchanged,
+    and every section of a blog already in the article store, are yielded
+    whole instead of being generated again.
+
+    Args:
+        metadata: The metadata for the blog
+        find_trends_type: The type of trends to find
+        session_id: Optional session ID for memory retrieval/storage
+        clear_memory: Whether to clear memory for this session
+        regenerate_sections: Sections to generate again even if unchanged
+        use_stored_result: Serve a blog already stored for the same metadata,
+            outline and models instead of generating it again
+        on_article_hash: Called with the blog's article store hash
+
+    Yields:
+        Tuples of (section name, text chunk)
+    """
+    blog_outline = None
+    section_cache = None
+    if session_id and settings.USE_MEMORY:
+        artifacts = await aload_step_artifacts(
+            metadata, find_trends_type, session_id, "generate_blog", clear_memory
+        )
+        blog_outline = artifacts.get("blog_outline")
+        section_cache = await asyncio.to_thread(SectionCache, session_id)
+
+    prompts = build_section_prompts(metadata, blog_outline)
+    blog_hash = article_hash(metadata, blog_outline, prompts)
+    if on_article_hash:
+        on_article_hash(blog_hash)
+
+    article_store = await asyncio.to_thread(get_article_store)
+    article = (
+        await asyncio.to_thread(article_store.get, blog_hash)
+        if use_stored_result and not regenerate_sections
+        else None
+    )
+    if article:
+        SECTIONS.inc(len(article["sections"]), source="stored")
+        if section_cache:
+            await asyncio.to_thread(section_cache.save, prompts, article["sections"])
+        for section in prompts:
+            if section in article["sections"]:
+                yield section, article["sections"][section]
+        return
 
-                return blog_outline, "blog_outline", True
+    cached, pending = {}, prompts
+    if section_cache:
+        cached, pending = await asyncio.to_thread(
+            section_cache.split, prompts, regenerate_sections
+        )
+    SECTIONS.inc(len(cached), source="cached")
+    SECTIONS.inc(len(pending), source="generated")
+
+    steps = list(prompts)
+    position = 0
+    generated = {section: [] for section in pending}
+
+    # Pending sections stream in step order; stored sections are yielded
+    # whole once every section before them has been streamed.
+    async for section, chunk in SectionGenerator(
+        llm_for_section=get_routed_llm
+    ).astream(pending):
+        while steps[position] != section:
+            if steps[position] in cached:
+                yield steps[position], cached[steps[position]]
+            position += 1
+        generated[section].append(chunk)
+        yield section, chunk
+
+    for step in steps[position:]:
+        if step in cached:
+            yield step, cached[step]
+
+    generated = {section: "".join(chunks) for section, chunks in generated.items()}
+    if section_cache:
+        await asyncio.to_thread(section_cache.save, pending, generated)
+    sections = {**cached, **generated}
+    await asyncio.to_thread(
+        article_store.put,
+        blog_hash,
+        metadata,
+        blog_outline,
+        sections,
+        SectionGenerator.assemble(sections, steps),
+    )
+
+
+def plan_artifacts(step: Optional[str], available: Dict[str, Any]) -> List[List[str]]:
+    """Plan the artifacts to compute before a step can run.
 
-            if step == "generate_blog":
-                prompts = PromptBuilder(
-                    metadata, blog_outline_data=blog_outline
-                ).build_prompt()
-                llm = get_gemini_llm()
+    Args:
+        step: The step of the blog generation process
+        available: Artifacts already stored for the session
 
-                blog_sections = [
-                    f"{llm.invoke(prompt_template.format(**metadata)).content}\n"
-                    for prompt_template in prompts.values()
-                ]
+    Returns:
+        Stages of missing artifacts in dependency order; artifacts within a
+        stage do not depend on each other and can be computed concurrently
+    """
+    depths = {}
 
-                full_blog = "\n".join(blog_sections)
+    def visit(artifact: str) -> int:
+        if artifact not in depths:
+            missing_dependencies = [
+                dependency
+                for dependency in ARTIFACT_DEPENDENCIES[artifact]
+                if not available.get(dependency)
+            ]
+            depths[artifact] = 1 + max(map(visit, missing_dependencies), default=-1)
+        return depths[artifact]
 
-                print(f"############ Full blog: \n{full_blog}\n############")
+    for artifact in STEP_REQUIREMENTS.get(step, ()):
+        if not available.get(artifact):
+            visit(artifact)
 
-                return full_blog, "markdown", True
+    stages = [[] for _ in range(max(depths.values(), default=-1) + 1)]
+    for artifact, depth in depths.items():
+        stages[depth].append(artifact)
+    return stages
 
-        return "", "", False
 
-    except (KeyError, ValueError, ConnectionError, TimeoutError) as e:
-        error_message = f"Error during blog generation: {str(e)}"
-        print(error_message)
-        return error_message, "", False
+async def aload_step_artifacts(
+    metadata: Dict[str, Any],
+    find_trends_type: str,
+    session_id: str,
+    step: Optional[str],
+    clear_memory: bool = False,
+    checkpoint: Optional[RunCheckpoint] = None,
+) -> Dict[str, Any]:
+    """Load the session artifacts a step needs, computing only missing ones.
+
+    Computed artifacts are saved to the session, so later steps reuse them.
+
+    Args:
+        metadata: The metadata for the blog
+        find_trends_type: The type of trends to find
+        session_id: The session ID
+        step: The step of the blog generation process
+        clear_memory: Whether to clear memory for this session first
+        checkpoint: Optional run checkpoint to restore artifacts from and
+            record computed ones in
+
+    Returns:
+        Dict of trends_data, research_data and blog_outline; artifacts the
+        step does not need are only present if already stored
+    """
+    if clear_memory:
+        memory = await asyncio.to_thread(get_memory, session_id=session_id)
+        memory.clear()
+
+    artifacts = await asyncio.to_thread(retrieve_data_from_memory, session_id)
+
+    if checkpoint:
+        restored = {
+            name: value
+            for name, value in (await asyncio.to_thread(checkpoint.artifacts)).items()
+            if not artifacts.get(name)
+        }
+        artifacts.update(restored)
+        await asyncio.to_thread(memory_handler, session_id, **restored)
+
+    for stage in plan_artifacts(step, artifacts):
+        results = await asyncio.gather(
+            *(
+                _produce_artifact(artifact, metadata, find_trends_type, artifacts)
+                for artifact in stage
+            )
+        )
+        produced = dict(zip(stage, results))
+        artifacts.update(produced)
+        await asyncio.to_thread(memory_handler, session_id, **produced)
+        if checkpoint:
+            for artifact, value in produced.items():
+                await asyncio.to_thread(checkpoint.save, artifact, value)
+
+    return artifacts
+
+
+async def _produce_artifact(
+    artifact: str,
+    metadata: Dict[str, Any],
+    find_trends_type: str,
+    artifacts: Dict[str, Any],
+    user_input: Optional[str] = None,
+) -> Any:
+    """Compute one session artifact from the artifacts it depends on."""
+    if artifact == "trends_data":
+        return await _gather_with_timeout(
+            "trends", _trends_call(metadata, find_trends_type)
+        )
+    if artifact == "research_data":
+        return await _gather_with_timeout(
+            "research", ResearchTool(metadata).aget_research
+        )
+    if artifact == "blog_outline":
+        with span("outline"):
+            return await BlogOutlineTool(
+                metadata,
+                artifacts.get("trends_data"),
+                artifacts.get("research_data"),
+                user_input,
+            ).aget_blog_outline()
+    raise ValueError(f"Unknown artifact: {artifact}")
+
+
+def build_section_prompts(
+    metadata: Dict[str, Any], blog_outline: Optional[str] = None
+) -> Dict[str, str]:
+    """Format the section prompts for a blog, in the structure's step order.
+
+    Args:
+        metadata: The metadata for the blog
+        blog_outline: Optional blog outline to ground the sections in
+
+    Returns:
+        Dict of formatted prompt text keyed by section name
+    """
+    with span("prompt_building"):
+        prompt_builder = PromptBuilder(metadata, blog_outline_data=blog_outline)
+        prompts = {
+            section: prompt_template.format(**metadata)
+            for section, prompt_template in prompt_builder.build_prompt().items()
+        }
+
+    prompt_tokens = sum(count_tokens(prompt) for prompt in prompts.values())
+    print(f"Prompt tokens: {prompt_tokens} across {len(prompts)} sections")
+
+    return prompts
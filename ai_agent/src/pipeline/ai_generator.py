@@ -1,52 +1,51 @@
-from langchain.memory import (
-    ConversationBufferMemory,
-    ConversationBufferWindowMemory,
-)
-from langchain_google_genai import ChatGoogleGenerativeAI
+import asyncio
+import hashlib
+import json
+import math
+import threading
+import time
+import weakref
+from collections import OrderedDict
 
 from config.settings import settings
+from src.integrations.database import get_session_backend
+from src.pipeline.session_store import SessionStore
+from src.utils.cache import get_cache, make_cache_key
+from src.utils.concurrency import ConcurrencyLimiter
+from src.utils.deadline import call_timeout, get_hedger
+from src.utils.lazy_imports import LazyImport
+from src.utils.rate_limiter import estimate_tokens, get_scheduler
+from src.utils.telemetry import (
+    current_stage,
+    record_llm_usage,
+    register_collector,
+    span,
+)
 
-_SESSION_MEMORIES = {}
-
-
-class SessionMemory(ConversationBufferMemory):
-    """Extended ConversationBufferMemory that can store session data."""
-
-    def __init__(self, **kwargs):
-        super().__init__(**kwargs)
-        self._session_data = {}
-
-    def set_session_data(self, key, value):
-        """Store arbitrary data in session memory."""
-        self._session_data[key] = value
-
-    def get_session_data(self, key, default=None):
-        """Retrieve arbitrary data from session memory."""
-        return self._session_data.get(key, default)
-
-    def get_all_session_data(self):
-        """Get all session data."""
-        return self._session_data
-
+ChatGoogleGenerativeAI = LazyImport("langchain_google_genai", "ChatGoogleGenerativeAI")
+GoogleGenerativeAIEmbeddings = LazyImport(
+    "langchain_google_genai", "GoogleGenerativeAIEmbeddings"
+)
+AIMessage = LazyImport("langchain_core.messages", "AIMessage")
+session_memory = LazyImport("src.pipeline.session_memory")
 
-class SessionWindowMemory(ConversationBufferWindowMemory):
-    """Extended ConversationBufferWindowMemory that can store session data."""
+_SESSION_STORE = SessionStore()
+_LLM_LIMITER = ConcurrencyLimiter(settings.LLM_MAX_CONCURRENCY)
+_LLM_CLIENTS = {}
+_LOOP_LLM_CLIENTS = weakref.WeakKeyDictionary()
+_LLM_CLIENTS_LOCK = threading.Lock()
+_SEMANTIC_INDEXES = {}
+_SEMANTIC_INDEXES_LOCK = threading.Lock()
 
-    def __init__(self, **kwargs):
-        super().__init__(**kwargs)
-        self._session_data = {}
 
-    def set_session_data(self, key, value):
-        """Store arbitrary data in session memory."""
-        self._session_data[key] = value
+def get_session_store():
+    """Get the process-wide session store."""
+    return _SESSION_STORE
 
-    def get_session_data(self, key, default=None):
-        """Retrieve arbitrary data from session memory."""
-        return self._session_data.get(key, default)
 
-    def get_all_session_data(self):
-        """Get all session data."""
-        return self._session_data
+def get_llm_limiter():
+    """Get the process-wide LLM concurrency limiter."""
+    return _LLM_LIMITER
 
 
 def get_memory(session_id=None, memory_type=None, k=None):
@@ -60,8 +59,10 @@ def get_memory(session_id=None, memory_type=None, k=None):
     Returns:
         A memory instance
     """
-    if session_id and session_id in _SESSION_MEMORIES:
-        return _SESSION_MEMORIES[session_id]
+    if session_id:
+        memory = _SESSION_STORE.get(session_id)
+        if memory is not None:
+            return memory
 
     if memory_type is None:
         memory_type = settings.MEMORY_TYPE
@@ -70,14 +71,19 @@ def get_memory(session_id=None, memory_type=None, k=None):
         k = settings.MEMORY_WINDOW_SIZE
 
     if memory_type.lower() == "buffer_window":
-        memory = SessionWindowMemory(
+        memory = session_memory.SessionWindowMemory(
             k=k, return_messages=True, memory_key="chat_history"
         )
     else:
-        memory = SessionMemory(return_messages=True, memory_key="chat_history")
+        memory = session_memory.SessionMemory(
+            return_messages=True, memory_key="chat_history"
+        )
 
     if session_id:
-        _SESSION_MEMORIES[session_id] = memory
+        backend = get_session_backend()
+        if backend:
+            memory.attach_backend(session_id, backend)
+        _SESSION_STORE.set(session_id, memory)
 
     return memory
 
@@ -91,12 +97,435 @@ def clear_memory(session_id):
     Returns:
         True if memory was found and cleared, False otherwise
     """
-    if session_id in _SESSION_MEMORIES:
-        _SESSION_MEMORIES[session_id].clear()
+    memory = _SESSION_STORE.get(session_id)
+    if memory is not None:
+        memory.clear()
         return True
     return False
 
 
-def get_gemini_llm(model=settings.LLM_MODEL, **kwargs):
-    """Get a Gemini LLM instance."""
-    return ChatGoogleGenerativeAI(model=model, **kwargs)
+def _request_kwargs(kwargs, timeout=None):
+    # The Gemini client passes extra call arguments on to the request. The
+    # scheduler owns retries, so the gRPC layer's own retry is turned off,
+    # and a request timeout bounds the whole RPC, streamed or not
+    request = {"retry": None, **kwargs}
+    if timeout is not None:
+        request.setdefault("timeout", timeout)
+    return request
+
+
+class ScheduledLLM:
+    """Chat model wrapper that coordinates every call with the Gemini scheduler.
+
+    Each call waits for the provider's request/token budget at the caller's
+    priority, holds a global LLM_MAX_CONCURRENCY slot while it runs, and is
+    retried with jittered backoff on 429/5xx errors. Calls are bounded by
+    LLM_CALL_TIMEOUT and the request deadline, passed to the client as the
+    request timeout on the sync paths, and async calls running past their
+    stage's p95 latency are hedged.
+    """
+
+    def __init__(self, llm, limiter, scheduler):
+        self.llm = llm
+        self.limiter = limiter
+        self.scheduler = scheduler
+
+    def __getattr__(self, name):
+        return getattr(self.llm, name)
+
+    def _record_usage(self, stage, estimated_tokens, message):
+        usage = getattr(message, "usage_metadata", None) or {}
+        self.scheduler.record_usage(estimated_tokens, usage.get("total_tokens"))
+        record_llm_usage(
+            stage,
+            usage.get("input_tokens", estimated_tokens),
+            usage.get("output_tokens", estimate_tokens(message.content)),
+            model=getattr(self.llm, "model", ""),
+        )
+
+    def invoke(self, prompt, *args, **kwargs):
+        estimated_tokens = estimate_tokens(prompt)
+        stage = current_stage()
+
+        def call():
+            timeout = call_timeout(settings.LLM_CALL_TIMEOUT)
+            with self.limiter:
+                return self.llm.invoke(
+                    prompt, *args, **_request_kwargs(kwargs, timeout)
+                )
+
+        with span("llm_call"):
+            response = self.scheduler.call(call, tokens=estimated_tokens)
+            self._record_usage(stage, estimated_tokens, response)
+        return response
+
+    async def ainvoke(self, prompt, *args, **kwargs):
+        estimated_tokens = estimate_tokens(prompt)
+        stage = current_stage()
+
+        async def attempt():
+            async with asyncio.timeout(call_timeout(settings.LLM_CALL_TIMEOUT)):
+                async with self.limiter:
+                    return await self.llm.ainvoke(
+                        prompt, *args, **_request_kwargs(kwargs)
+                    )
+
+        async def call():
+            return await self.scheduler.acall(attempt, tokens=estimated_tokens)
+
+        with span("llm_call"):
+            # Routed models have their own latency, so each gets its own hedger
+            model = getattr(self.llm, "model", "")
+            response = await get_hedger(f"gemini:{stage}:{model}").call(call)
+            self._record_usage(stage, estimated_tokens, response)
+        return response
+
+    def stream(self, prompt, *args, **kwargs):
+        estimated_tokens = estimate_tokens(prompt)
+        stage = current_stage()
+        message = None
+
+        self.scheduler.acquire(estimated_tokens)
+        # Taken after the wait for budget, so the wait counts against it
+        timeout = call_timeout(settings.LLM_CALL_TIMEOUT)
+        with self.limiter:
+            for chunk in self.llm.stream(
+                prompt, *args, **_request_kwargs(kwargs, timeout)
+            ):
+                message = chunk if message is None else message + chunk
+                yield chunk
+
+        if message is not None:
+            self._record_usage(stage, estimated_tokens, message)
+
+    async def astream(self, prompt, *args, **kwargs):
+        estimated_tokens = estimate_tokens(prompt)
+        stage = current_stage()
+        message = None
+
+        timeout = call_timeout(settings.LLM_CALL_TIMEOUT)
+        expires_at = None if timeout is None else time.monotonic() + timeout
+        await self.scheduler.aacquire(estimated_tokens)
+        async with self.limiter:
+            chunks = aiter(self.llm.astream(prompt, *args, **_request_kwargs(kwargs)))
+            while True:
+                # Bound each chunk by what is left of the call's timeout
+                left = None if expires_at is None else expires_at - time.monotonic()
+                try:
+                    chunk = await asyncio.wait_for(anext(chunks), timeout=left)
+                except StopAsyncIteration:
+                    break
+                message = chunk if message is None else message + chunk
+                yield chunk
+
+        if message is not None:
+            self._record_usage(stage, estimated_tokens, message)
+
+
+class SemanticIndex:
+    """Bounded in-process index of prompt embeddings for near-duplicate lookup."""
+
+    def __init__(self, threshold, max_entries):
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _similarity(first, second):
+        dot = sum(a * b for a, b in zip(first, second))
+        norm = math.sqrt(sum(a * a for a in first)) * math.sqrt(
+            sum(b * b for b in second)
+        )
+        return dot / norm if norm else 0.0
+
+    def lookup(self, vector):
+        """Return the cache key of the most similar entry above the threshold."""
+        with self._lock:
+            entries = list(self._entries.items())
+
+        best_key, best_score = None, self.threshold
+        for key, candidate in entries:
+            score = self._similarity(vector, candidate)
+            if score >= best_score:
+                best_key, best_score = key, score
+        return best_key
+
+    def add(self, key, vector):
+        with self._lock:
+            self._entries[key] = vector
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+def _get_semantic_index(namespace):
+    with _SEMANTIC_INDEXES_LOCK:
+        if namespace not in _SEMANTIC_INDEXES:
+            _SEMANTIC_INDEXES[namespace] = SemanticIndex(
+                settings.LLM_CACHE_SIMILARITY_THRESHOLD,
+                settings.LLM_CACHE_MAX_ENTRIES,
+            )
+        return _SEMANTIC_INDEXES[namespace]
+
+
+class CachedLLM:
+    """Chat model wrapper that serves repeated prompts from the LLM cache.
+
+    Exact matches are keyed on the model name and a hash of the prompt text.
+    When `semantic_text` is given and LLM_CACHE_SEMANTIC is enabled, prompts
+    whose `semantic_text` embedding is close enough to an earlier one reuse
+    that response as well. The embedding is only computed on an exact miss,
+    and goes through the Gemini scheduler like any other call.
+    """
+
+    def __init__(self, llm, model, namespace, semantic_text=None):
+        self.llm = llm
+        self.model = model
+        self.namespace = namespace
+        self.semantic_text = semantic_text
+        self.cache = get_cache(
+            f"llm_{namespace}",
+            backend=settings.LLM_CACHE_BACKEND,
+            ttl=settings.LLM_CACHE_TTL,
+            max_entries=settings.LLM_CACHE_MAX_ENTRIES,
+        )
+        self.semantic_index = (
+            _get_semantic_index(namespace)
+            if semantic_text and settings.LLM_CACHE_SEMANTIC
+            else None
+        )
+
+    def __getattr__(self, name):
+        return getattr(self.llm, name)
+
+    def _cache_key(self, prompt):
+        prompt_hash = hashlib.sha256(str(prompt).encode("utf-8")).hexdigest()
+        return make_cache_key(
+            self.namespace, {"model": self.model, "prompt": prompt_hash}
+        )
+
+    def _cached(self, key):
+        content = self.cache.get(key)
+        return AIMessage(content=content) if content is not None else None
+
+    def _similar(self, vector):
+        similar_key = self.semantic_index.lookup(vector)
+        return self._cached(similar_key) if similar_key is not None else None
+
+    def _store(self, key, vector, response):
+        self.cache.set(key, response.content)
+        if vector is not None:
+            self.semantic_index.add(key, vector)
+
+    async def _off_loop(self, fn, *args):
+        # SQLite-backed caches block on disk I/O; in-memory ones answer at once
+        if self.cache.backend == "sqlite":
+            return await asyncio.to_thread(fn, *args)
+        return fn(*args)
+
+    def _embed(self):
+        def call():
+            call_timeout(settings.LLM_CALL_TIMEOUT)
+            with _LLM_LIMITER:
+                return get_embeddings_client().embed_query(self.semantic_text)
+
+        try:
+            return get_scheduler("gemini").call(
+                call, tokens=estimate_tokens(self.semantic_text)
+            )
+        except Exception as e:
+            print(f"Error embedding prompt for the LLM cache: {str(e)}")
+            return None
+
+    async def _aembed(self):
+        async def call():
+            async with asyncio.timeout(call_timeout(settings.LLM_CALL_TIMEOUT)):
+                async with _LLM_LIMITER:
+                    return await get_embeddings_client().aembed_query(
+                        self.semantic_text
+                    )
+
+        try:
+            return await get_scheduler("gemini").acall(
+                call, tokens=estimate_tokens(self.semantic_text)
+            )
+        except Exception as e:
+            print(f"Error embedding prompt for the LLM cache: {str(e)}")
+            return None
+
+    def invoke(self, prompt, *args, **kwargs):
+        key = self._cache_key(prompt)
+        cached = self._cached(key)
+        if cached is not None:
+            return cached
+
+        # Embed only on an exact miss, and serve a near-duplicate if found
+        vector = self._embed() if self.semantic_index else None
+        cached = self._similar(vector) if vector is not None else None
+        if cached is not None:
+            return cached
+
+        response = self.llm.invoke(prompt, *args, **kwargs)
+        self._store(key, vector, response)
+        return response
+
+    async def ainvoke(self, prompt, *args, **kwargs):
+        key = self._cache_key(prompt)
+        cached = await self._off_loop(self._cached, key)
+        if cached is not None:
+            return cached
+
+        vector = await self._aembed() if self.semantic_index else None
+        # Scanning the index compares against every stored embedding
+        cached = (
+            await asyncio.to_thread(self._similar, vector)
+            if vector is not None
+            else None
+        )
+        if cached is not None:
+            return cached
+
+        response = await self.llm.ainvoke(prompt, *args, **kwargs)
+        await self._off_loop(self._store, key, vector, response)
+        return response
+
+
+def _get_pooled_client(key, build):
+    with _LLM_CLIENTS_LOCK:
+        try:
+            clients = _LOOP_LLM_CLIENTS.setdefault(asyncio.get_running_loop(), {})
+        except RuntimeError:
+            clients = _LLM_CLIENTS
+
+        if key not in clients:
+            clients[key] = build()
+        return clients[key]
+
+
+def get_llm_client(model=settings.LLM_MODEL, **kwargs):
+    """Get a long-lived ChatGoogleGenerativeAI client for a model and kwargs.
+
+    Clients are built once and reused, so calls share the client's gRPC
+    channel instead of paying setup and TLS handshakes each time. Async gRPC
+    channels are bound to the event loop that created them, so inside a
+    running loop clients are kept per loop and dropped with it.
+
+    Args:
+        model: Gemini model name
+        **kwargs: Extra arguments passed to ChatGoogleGenerativeAI
+
+    Returns:
+        A shared, thread-safe client instance
+    """
+    key = (model, json.dumps(kwargs, sort_keys=True, default=repr))
+    return _get_pooled_client(
+        key,
+        # Retries belong to the Gemini scheduler, so one 429 is not retried
+        # again inside the client for every scheduler attempt
+        lambda: ChatGoogleGenerativeAI(model=model, **{"max_retries": 0, **kwargs}),
+    )
+
+
+def get_embeddings_client(model=None):
+    """Get a long-lived embeddings client for semantic LLM cache lookups.
+
+    Pooled like `get_llm_client`, per event loop inside a running loop.
+
+    Args:
+        model: Embedding model name; defaults to LLM_CACHE_EMBEDDING_MODEL
+
+    Returns:
+        A shared GoogleGenerativeAIEmbeddings instance
+    """
+    model = model or settings.LLM_CACHE_EMBEDDING_MODEL
+    return _get_pooled_client(
+        ("embeddings", model), lambda: GoogleGenerativeAIEmbeddings(model=model)
+    )
+
+
+async def warm_up_llm_clients(clients=None):
+    """Build the given clients ahead of the first request.
+
+    Args:
+        clients: `get_llm_client` keyword arguments of each client to build,
+            e.g. the model routes; defaults to LLM_MODEL alone
+    """
+    for kwargs in clients or [{"model": settings.LLM_MODEL}]:
+        model = kwargs.get("model", settings.LLM_MODEL)
+        try:
+            llm = get_llm_client(**kwargs)
+            # Accessing async_client opens the loop-bound gRPC channel now
+            if llm.async_client is None:
+                print(f"No async client available for {model}")
+        except Exception as e:
+            print(f"Error warming up LLM client for {model}: {str(e)}")
+
+
+def get_gemini_llm(
+    model=settings.LLM_MODEL, cache_namespace=None, semantic_text=None, **kwargs
+):
+    """Get a Gemini LLM instance.
+
+    Args:
+        model: Gemini model name
+        cache_namespace: Optional namespace to serve repeated prompts from the
+            LLM response cache (e.g. "research")
+        semantic_text: Optional text used for near-duplicate cache matching
+        **kwargs: Extra arguments passed to ChatGoogleGenerativeAI
+
+    Returns:
+        A pooled chat model coordinated by the Gemini scheduler, wrapped in CachedLLM
+        when a cache namespace is given
+    """
+    llm = ScheduledLLM(
+        get_llm_client(model, **kwargs),
+        _LLM_LIMITER,
+        get_scheduler("gemini"),
+    )
+    if cache_namespace and settings.LLM_CACHE_ENABLED:
+        return CachedLLM(llm, model, cache_namespace, semantic_text=semantic_text)
+    return llm
+
+
+def _collect_metrics():
+    store = _SESSION_STORE.stats()
+    yield (
+        "blog_writer_sessions",
+        "gauge",
+        "Sessions held in the process-local session store",
+        {},
+        store["sessions"],
+    )
+    yield (
+        "blog_writer_session_store_bytes",
+        "gauge",
+        "Approximate bytes held by the session store",
+        {},
+        store["bytes"],
+    )
+    for reason in ("evictions", "expirations"):
+        yield (
+            "blog_writer_session_removals_total",
+            "counter",
+            "Sessions removed from the store, by reason",
+            {"reason": reason},
+            store[reason],
+        )
+    yield (
+        "blog_writer_llm_active_calls",
+        "gauge",
+        "LLM calls holding an LLM_MAX_CONCURRENCY slot",
+        {},
+        _LLM_LIMITER.active,
+    )
+    yield (
+        "blog_writer_llm_waiting_calls",
+        "gauge",
+        "LLM calls waiting for an LLM_MAX_CONCURRENCY slot",
+        {},
+        _LLM_LIMITER.waiting,
+    )
+
+
+register_collector(_collect_metrics)
@@ -0,0 +1,163 @@
+import hashlib
+import json
+import threading
+import time
+from typing import Any, Dict, Iterable, Optional
+
+from config.settings import settings
+from src.integrations.database import connect_sqlite
+from src.pipeline.model_router import resolve_route
+from src.pipeline.run_store import METADATA_FIELDS
+from src.utils.telemetry import register_collector
+
+_ARTICLE_STORE = None
+_ARTICLE_STORE_LOCK = threading.Lock()
+
+
+def article_hash(
+    metadata: Dict[str, Any], blog_outline: Optional[str], sections: Iterable[str]
+) -> str:
+    """Content address of a finished blog.
+
+    The outline is hashed as given, so edits to its case or formatting
+    address a different blog. Routes are included whole, so changing a
+    section's model, temperature or output cap does too.
+
+    Args:
+        metadata: The metadata for the blog
+        blog_outline: The outline the sections were generated from
+        sections: Section names of the blog, in step order
+
+    Returns:
+        Hex SHA-256 digest of the metadata, outline and each section's route
+    """
+    payload = json.dumps(
+        {
+            "metadata": {field: metadata.get(field) for field in METADATA_FIELDS},
+            "outline": blog_outline,
+            "sections": [
+                {"section": section, "route": resolve_route(section)}
+                for section in sections
+            ],
+        },
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ArticleStore:
+    """SQLite-backed store of finished blogs, addressed by `article_hash`.
+
+    Identical metadata and outline produce the same blog, so a repeat
+    request, or a client retrying after a timeout, is served from here
+    without any LLM calls.
+    """
+
+    def __init__(self, path: Optional[str] = None, ttl: Optional[int] = None):
+        self.path = path or settings.ARTICLE_DB_PATH
+        self.ttl = settings.ARTICLE_TTL if ttl is None else ttl
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "writes": 0}
+        with connect_sqlite(self.path) as connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS articles ("
+                "hash TEXT PRIMARY KEY, metadata TEXT NOT NULL, outline TEXT, "
+                "sections TEXT NOT NULL, content TEXT NOT NULL, "
+                "content_type TEXT NOT NULL, created_at REAL NOT NULL)"
+            )
+        self.prune()
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self.stats[key] += 1
+
+    def get(self, article_hash: str) -> Optional[Dict[str, Any]]:
+        """A stored blog with its metadata, outline and sections, if any."""
+        with connect_sqlite(self.path) as connection:
+            row = connection.execute(
+                "SELECT metadata, outline, sections, content, content_type, "
+                "created_at FROM articles WHERE hash = ?",
+                (article_hash,),
+            ).fetchone()
+        if row is None:
+            self._count("misses")
+            return None
+
+        self._count("hits")
+        metadata, outline, sections, content, content_type, created_at = row
+        return {
+            "hash": article_hash,
+            "metadata": json.loads(metadata),
+            "outline": outline,
+            "sections": json.loads(sections),
+            "content": content,
+            "type": content_type,
+            "created_at": created_at,
+        }
+
+    def put(
+        self,
+        article_hash: str,
+        metadata: Dict[str, Any],
+        blog_outline: Optional[str],
+        sections: Dict[str, str],
+        content: str,
+        content_type: str = "markdown",
+    ) -> None:
+        """Store a finished blog under its hash, replacing an older copy."""
+        with connect_sqlite(self.path) as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO articles "
+                "(hash, metadata, outline, sections, content, content_type, "
+                "created_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    article_hash,
+                    json.dumps(
+                        {field: metadata.get(field) for field in METADATA_FIELDS}
+                    ),
+                    blog_outline,
+                    json.dumps(sections),
+                    content,
+                    content_type,
+                    time.time(),
+                ),
+            )
+        self._count("writes")
+
+    def prune(self) -> None:
+        """Delete blogs older than the TTL; a TTL of 0 keeps every blog."""
+        if self.ttl <= 0:
+            return
+
+        with connect_sqlite(self.path) as connection:
+            connection.execute(
+                "DELETE FROM articles WHERE created_at < ?", (time.time() - self.ttl,)
+            )
+
+
+def get_article_store() -> ArticleStore:
+    """Get the process-wide article store."""
+    global _ARTICLE_STORE
+
+    with _ARTICLE_STORE_LOCK:
+        if _ARTICLE_STORE is None:
+            _ARTICLE_STORE = ArticleStore()
+        return _ARTICLE_STORE
+
+
+def _collect_metrics():
+    if _ARTICLE_STORE is None:
+        return
+    for result in ("hits", "misses", "writes"):
+        yield (
+            "blog_writer_article_store_operations_total",
+            "counter",
+            "Article store lookups (hits/misses) and writes",
+            {"result": result},
+            _ARTICLE_STORE.stats[result],
+        )
+
+
+register_collector(_collect_metrics)
@@ -0,0 +1,89 @@
+import threading
+from typing import Any, Dict, List, Optional
+
+from config.settings import settings
+from src.pipeline.ai_generator import get_gemini_llm
+from src.utils.telemetry import LLM_ROUTES, annotate_span
+
+_LOGGED_ROUTES = set()
+_LOGGED_ROUTES_LOCK = threading.Lock()
+
+
+def resolve_route(purpose: str) -> Dict[str, Any]:
+    """Model settings for an LLM call purpose.
+
+    Purposes are "research", "trends", "outline" or a section name from
+    `Constants.STRUCTURE_STEPS`. Section names match LLM_ROUTES case
+    insensitively, and sections without a route of their own use the
+    "section" route.
+
+    Args:
+        purpose: What the call is for
+
+    Returns:
+        Dict with "model" and, when routing is enabled, the "max_output_tokens"
+        and "temperature" to call it with
+    """
+    if not settings.LLM_ROUTING_ENABLED:
+        return {"model": settings.LLM_MODEL}
+
+    routes = {name.lower(): route for name, route in settings.LLM_ROUTES.items()}
+    route = routes.get(purpose.lower()) or routes.get("section") or {}
+    resolved = {"model": route.get("model") or settings.LLM_MODEL}
+    if route.get("max_output_tokens"):
+        resolved["max_output_tokens"] = route["max_output_tokens"]
+    if route.get("temperature") is not None:
+        resolved["temperature"] = route["temperature"]
+    return resolved
+
+
+def _log_route(purpose: str, route: Dict[str, Any]) -> None:
+    LLM_ROUTES.inc(purpose=purpose, model=route["model"])
+    annotate_span(route=purpose, model=route["model"])
+
+    decision = (purpose, tuple(sorted(route.items())))
+    with _LOGGED_ROUTES_LOCK:
+        if decision in _LOGGED_ROUTES:
+            return
+        _LOGGED_ROUTES.add(decision)
+    options = ", ".join(f"{key}={value}" for key, value in route.items())
+    print(f"Routing {purpose} LLM calls to {options}")
+
+
+def get_routed_llm(
+    purpose: str,
+    cache_namespace: Optional[str] = None,
+    semantic_text: Optional[str] = None,
+):
+    """Get the Gemini LLM routed for a call purpose.
+
+    Short auxiliary calls (research, trends, FAQs, meta description,
+    references) go to LLM_FAST_MODEL by default, while the outline and
+    body sections keep LLM_MODEL. Each decision is counted in
+    `blog_writer_llm_routes_total`, attached to the current span and
+    printed the first time it is made.
+
+    Args:
+        purpose: What the call is for, see `resolve_route`
+        cache_namespace: Optional LLM response cache namespace
+        semantic_text: Optional text used for near-duplicate cache matching
+
+    Returns:
+        The chat model from `get_gemini_llm` for the routed model settings
+    """
+    route = resolve_route(purpose)
+    _log_route(purpose, route)
+    return get_gemini_llm(
+        cache_namespace=cache_namespace, semantic_text=semantic_text, **route
+    )
+
+
+def routed_client_kwargs() -> List[Dict[str, Any]]:
+    """Distinct `get_llm_client` arguments of every route, for warm-up."""
+    purposes = ["research", "trends", "outline", "section", *settings.LLM_ROUTES]
+    clients = []
+    for purpose in purposes:
+        route = resolve_route(purpose)
+        if route not in clients:
+            clients.append(route)
+    return clients
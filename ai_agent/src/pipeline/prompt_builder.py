@@ -1,8 +1,11 @@
+from functools import lru_cache
 from typing import Any, Dict
 
-from langchain.prompts import PromptTemplate
-
+from src.pipeline.prompt_compactor import PromptCompactor
 from src.utils.constants import Constants
+from src.utils.lazy_imports import LazyImport
+
+PromptTemplate = LazyImport("langchain.prompts", "PromptTemplate")
 
 
 class BlogLengthManager:
@@ -26,6 +29,104 @@ class BlogLengthManager:
         return f"Write between {min_words} and {max_words} words."
 
 
+_CONTEXT_SECTIONS = {"introduction", "main content", "guide body", "step-by-step guide"}
+_METADATA_VARIABLES = ["structure", "persona", "topic", "tone", "keyword", "goal"]
+
+
+def _escape_braces(text):
+    return text.replace("{", "{{").replace("}", "}}")
+
+
+@lru_cache(maxsize=256)
+def compile_section_template(structure, section, has_outline, has_trends, has_research):
+    """Build the prompt template for one section, memoized per process.
+
+    The outline, trends and research context stay template variables, so
+    one compiled template serves every request with the same shape.
+
+    Args:
+        structure: Blog structure type as given in the metadata
+        section: Section name from Constants.STRUCTURE_STEPS
+        has_outline: Whether the prompt includes outline context
+        has_trends: Whether the prompt includes trend insights
+        has_research: Whether the prompt includes research insights
+
+    Returns:
+        A PromptTemplate taking the blog metadata and context variables
+    """
+    input_variables = list(_METADATA_VARIABLES)
+    blog_outline_text = trends_text = research_text = ""
+
+    if has_outline:
+        blog_outline_text = "\nBlog outline to consider:\n{blog_outline}\n"
+        input_variables.append("blog_outline")
+    if has_trends:
+        trends_text = "\nTrend insights to consider (summarized):\n{trends}\n"
+        input_variables.append("trends")
+    if has_research:
+        research_text = "\nResearch insights to consider (summarized):\n{research}\n"
+        input_variables.append("research")
+
+    if section.lower() == "meta description":
+        guidelines = "- Write a natural-sounding, SEO-optimized meta description (150–160 characters) that clearly conveys the article's value.\n"
+    elif section.lower() == "faqs":
+        guidelines = "- List 3–5 unique, practical FAQs with clear, non-repetitive answers that address common reader concerns.\n"
+    else:
+        guidelines = (
+            "- Begin with a relatable or thought-provoking opening line if relevant.\n"
+            "- Use natural phrasing and varied sentence lengths to engage readers.\n"
+            "- Integrate keywords contextually, without sounding robotic.\n"
+            "- Include real-world examples, statistics, or quotes where appropriate.\n"
+            "- Use subheadings for clarity, and ensure smooth transitions between ideas.\n"
+        )
+
+    return PromptTemplate(
+        input_variables=input_variables,
+        template=(
+            f"You are a highly experienced human blog writer, not an AI.\n"
+            f"Write only the **{_escape_braces(section)}** section of a {_escape_braces(structure)} article.\n"
+            "Your writing must sound completely human and avoid common AI patterns.\n\n"
+            "Content Brief:\n"
+            "- Topic: {topic}\n"
+            "- Tone: {tone}\n"
+            "- Primary Keyword: {keyword}\n"
+            "- Purpose: {goal}\n"
+            "- Intended Audience: {persona}\n\n"
+            f"{blog_outline_text}\n"
+            f"{trends_text}\n"
+            f"{research_text}\n"
+            "Writing Guidelines:\n"
+            f"{guidelines}"
+            "Keep the language fluid, insightful, and grounded. Avoid generic phrasing and overly polished structure.\n"
+            "Avoid using placeholder phrases such as 'Okay, here's...' or 'Let me...' at the beginning of sections.\n"
+            "Write in a professional, third-person voice with a touch of authenticity.\n"
+        ),
+    )
+
+
+class SectionPrompt:
+    """A compiled section template bound to one request's context.
+
+    `format(**metadata)` fills the template directly, so context text may
+    contain braces and no new PromptTemplate is built per request.
+    """
+
+    __slots__ = ("template", "context")
+
+    def __init__(self, template, **context):
+        self.template = template
+        self.context = context
+
+    @property
+    def input_variables(self):
+        return [
+            name for name in self.template.input_variables if name not in self.context
+        ]
+
+    def format(self, **kwargs):
+        return self.template.template.format(**{**kwargs, **self.context})
+
+
 class PromptBuilder:
     def __init__(self, metadata_json: Dict[str, Any], **kwargs):
         self.metadata_json = metadata_json
@@ -51,82 +152,41 @@ class PromptBuilder:
 
     def build_prompt(self):
         prompts = {}
+        context_steps = [
+            section for section in self.steps if section.lower() in _CONTEXT_SECTIONS
+        ]
+        compactor = PromptCompactor(context_steps, self.blog_outline_data)
 
         for section in self.steps:
-            trends_text = (
-                f"\nTrend insights to consider (summarized):\n{self.trends_data}\n"
-                if self.trends_data
-                and section.lower()
-                in ["introduction", "main content", "guide body", "step-by-step guide"]
-                else ""
-            )
-
-            research_text = (
-                f"\nResearch insights to consider (summarized):\n{self.research_data}\n"
-                if self.research_data
-                and section.lower()
-                in ["introduction", "main content", "guide body", "step-by-step guide"]
-                else ""
-            )
-
-            blog_outline_text = (
-                f"\nBlog outline to consider:\n{self.blog_outline_data}\n"
-                if self.blog_outline_data
-                and section.lower()
-                in ["introduction", "main content", "guide body", "step-by-step guide"]
-                else ""
-            )
-
-            if section.lower() == "meta description":
-                guidelines = "- Write a natural-sounding, SEO-optimized meta description (150–160 characters) that clearly conveys the article's value.\n"
-            elif section.lower() == "faqs":
-                guidelines = "- List 3–5 unique, practical FAQs with clear, non-repetitive answers that address common reader concerns.\n"
-            else:
-                guidelines = (
-                    "- Begin with a relatable or thought-provoking opening line if relevant.\n"
-                    "- Use natural phrasing and varied sentence lengths to engage readers.\n"
-                    "- Integrate keywords contextually, without sounding robotic.\n"
-                    "- Include real-world examples, statistics, or quotes where appropriate.\n"
-                    "- Use subheadings for clarity, and ensure smooth transitions between ideas.\n"
+            if section in context_steps:
+                outline_context, trends_context, research_context = (
+                    compactor.context_for(section, self.trends_data, self.research_data)
                 )
-
-            template = PromptTemplate(
-                input_variables=[
-                    "structure",
-                    "persona",
-                    "topic",
-                    "tone",
-                    "keyword",
-                    "goal",
-                ],
-                template=(
-                    f"You are a highly experienced human blog writer, not an AI.\n"
-                    f"Write only the **{section}** section of a {self.metadata_json['structure']} article.\n"
-                    "Your writing must sound completely human and avoid common AI patterns.\n\n"
-                    "Content Brief:\n"
-                    "- Topic: {topic}\n"
-                    "- Tone: {tone}\n"
-                    "- Primary Keyword: {keyword}\n"
-                    "- Purpose: {goal}\n"
-                    "- Intended Audience: {persona}\n\n"
-                    f"{blog_outline_text}\n"
-                    f"{trends_text}\n"
-                    f"{research_text}\n"
-                    "Writing Guidelines:\n"
-                    f"{guidelines}"
-                    "Keep the language fluid, insightful, and grounded. Avoid generic phrasing and overly polished structure.\n"
-                    "Avoid using placeholder phrases such as 'Okay, here's...' or 'Let me...' at the beginning of sections.\n"
-                    "Write in a professional, third-person voice with a touch of authenticity.\n"
-                ),
+            else:
+                outline_context = trends_context = research_context = ""
+
+            template = compile_section_template(
+                self.metadata_json["structure"],
+                section,
+                bool(outline_context),
+                bool(trends_context),
+                bool(research_context),
+            )
+            prompts[section] = SectionPrompt(
+                template,
+                blog_outline=outline_context,
+                trends=trends_context,
+                research=research_context,
             )
-
-            prompts[section] = template
 
         return prompts
 
     def data_trends(self):
         prompt_text = f"""
-        Analyze the following Google Trends data related to "{self.metadata_json["topic"]}":
+        Analyze the following Google Trends data related to "{self.metadata_json["topic"]}".
+        Interest is on a 0-100 scale. Each series is summarized by its range,
+        mean, latest value, slope per data point, highest peaks and change
+        points (dates where the mean level shifted).
 
         {self.trends_data}
 
@@ -0,0 +1,186 @@
+import re
+from typing import Dict, List, Optional, Tuple
+
+from config.settings import settings
+from src.utils.rate_limiter import estimate_tokens
+
+_TOP_LEVEL_HEADING = re.compile(
+    r"^[\s#*>_-]*(?P<numeral>[IVXLC]+)[.)]\s+(?P<title>.+?)[\s*_]*$"
+)
+_ROMAN_NUMERALS = [
+    (100, "C"),
+    (90, "XC"),
+    (50, "L"),
+    (40, "XL"),
+    (10, "X"),
+    (9, "IX"),
+    (5, "V"),
+    (4, "IV"),
+    (1, "I"),
+]
+_WORD = re.compile(r"[a-z0-9]+")
+_STOPWORDS = {"a", "an", "and", "for", "in", "of", "on", "or", "the", "to", "with"}
+_FRAMING_SECTIONS = {
+    "introduction",
+    "conclusion",
+    "faqs",
+    "meta description",
+    "references",
+}
+
+
+def count_tokens(text: Optional[str]) -> int:
+    """Approximate the number of tokens in a prompt or context string."""
+    return estimate_tokens(text) if text else 0
+
+
+def trim_to_budget(text: Optional[str], budget: int) -> str:
+    """Trim text to a token budget, cutting at line boundaries.
+
+    Args:
+        text: Context text to trim
+        budget: Maximum number of tokens to keep
+
+    Returns:
+        The text unchanged if it fits, otherwise its leading lines that fit
+    """
+    if not text or budget <= 0:
+        return ""
+    if count_tokens(text) <= budget:
+        return text
+
+    kept, used = [], 0
+    for line in str(text).splitlines():
+        line_tokens = count_tokens(line) + 1
+        if used + line_tokens > budget:
+            break
+        kept.append(line)
+        used += line_tokens
+    return "\n".join(kept + ["[...]"])
+
+
+def _to_roman(number: int) -> str:
+    numerals = []
+    for value, numeral in _ROMAN_NUMERALS:
+        count, number = divmod(number, value)
+        numerals.append(numeral * count)
+    return "".join(numerals)
+
+
+def parse_outline(outline: str) -> List[Tuple[str, str]]:
+    """Split an outline into its top-level (I, II, III, ...) sections.
+
+    Args:
+        outline: Outline text using an I/A/1 hierarchy
+
+    Returns:
+        List of (heading title, full section text) in outline order
+    """
+    sections = []
+    for line in outline.splitlines():
+        match = _TOP_LEVEL_HEADING.match(line)
+        # Only the next numeral in sequence starts a section, so sub-level
+        # letters such as "C." are not mistaken for roman numerals.
+        if match and match.group("numeral") == _to_roman(len(sections) + 1):
+            sections.append([match.group("title").strip(" :*"), [line]])
+        elif sections:
+            sections[-1][1].append(line)
+    return [(title, "\n".join(lines).strip()) for title, lines in sections]
+
+
+def _words(text: str) -> set:
+    words = {
+        word[:-1] if word.endswith("s") and len(word) > 3 else word
+        for word in _WORD.findall(text.lower())
+        if word not in _STOPWORDS
+    }
+    if {"frequently", "asked"} <= words:
+        words.add("faq")
+    return words
+
+
+class PromptCompactor:
+    """Fit per-section prompt context into SECTION_CONTEXT_TOKEN_BUDGET.
+
+    The outline is split among `steps`, the sections that take context.
+    Each receives only the outline slice whose top-level heading matches
+    it. Outline headings that match none of them go to the body sections,
+    or to the first section when only framing sections (introduction,
+    conclusion, ...) take context. Sections without a slice get the list
+    of top-level headings instead.
+    """
+
+    def __init__(
+        self,
+        steps: List[str],
+        blog_outline: Optional[str] = None,
+        budget: Optional[int] = None,
+    ):
+        self.steps = steps
+        self.budget = budget or settings.SECTION_CONTEXT_TOKEN_BUDGET
+        self.outline_sections = parse_outline(blog_outline) if blog_outline else []
+        self.outline_slices = self._match_outline_sections()
+        self.blog_outline = blog_outline
+
+    def _match_outline_sections(self) -> Dict[str, List[str]]:
+        slices = {step: [] for step in self.steps}
+        body_steps = [
+            step for step in self.steps if step.lower() not in _FRAMING_SECTIONS
+        ] or self.steps[:1]
+        unmatched = []
+
+        for title, text in self.outline_sections:
+            title_words = _words(title)
+            scores = {step: len(title_words & _words(step)) for step in self.steps}
+            best_step = max(scores, key=scores.get) if scores else None
+            if best_step and scores[best_step] > 0:
+                slices[best_step].append(text)
+            else:
+                unmatched.append((title_words, text))
+
+        for title_words, text in unmatched:
+            if not body_steps:
+                break
+            best_step = max(
+                body_steps,
+                key=lambda step: (len(title_words & _words(step)), not slices[step]),
+            )
+            slices[best_step].append(text)
+
+        return slices
+
+    def outline_for(self, section: str) -> str:
+        """Get the outline context for a section, within its share of the budget."""
+        if not self.blog_outline:
+            return ""
+
+        if not self.outline_sections:
+            return trim_to_budget(self.blog_outline, self.budget)
+
+        section_slice = "\n\n".join(self.outline_slices.get(section, []))
+        if not section_slice:
+            section_slice = "Article structure:\n" + "\n".join(
+                f"- {title}" for title, _ in self.outline_sections
+            )
+        return trim_to_budget(section_slice, self.budget)
+
+    def context_for(
+        self, section: str, trends_data: Optional[str], research_data: Optional[str]
+    ) -> Tuple[str, str, str]:
+        """Get outline, trends and research context for a section.
+
+        The outline slice is kept first; trends and research split whatever
+        budget remains.
+
+        Returns:
+            Tuple of (outline text, trends text, research text)
+        """
+        outline_text = self.outline_for(section)
+        remaining = self.budget - count_tokens(outline_text)
+        shares = [data for data in (trends_data, research_data) if data]
+        share = remaining // len(shares) if shares else 0
+        return (
+            outline_text,
+            trim_to_budget(trends_data, share),
+            trim_to_budget(research_data, share),
+        )
@@ -0,0 +1,319 @@
+import json
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+from config.settings import settings
+from src.integrations.database import connect_sqlite
+from src.pipeline.model_router import resolve_route
+from src.pipeline.section_cache import section_hash
+from src.utils.cache import make_cache_key
+
+_RUN_STORE = None
+_RUN_STORE_LOCK = threading.Lock()
+_SECTION_PREFIX = "section:"
+_RESULT_PREFIX = "result:"
+# Fields of the API's Blog model; anything the pipeline adds is derived from them
+METADATA_FIELDS = ("structure", "persona", "topic", "tone", "keyword", "goal")
+
+
+class RunStore:
+    """SQLite-backed checkpoints of pipeline runs, one row per artifact.
+
+    A run records the trends, research, outline, each generated section and
+    each finished step's result as it completes, so a retry with the same
+    run ID only computes what is missing.
+    """
+
+    def __init__(self, path: Optional[str] = None, ttl: Optional[int] = None):
+        self.path = path or settings.RUN_DB_PATH
+        self.ttl = settings.RUN_TTL if ttl is None else ttl
+        with connect_sqlite(self.path) as connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS runs ("
+                "run_id TEXT PRIMARY KEY, fingerprint TEXT NOT NULL, "
+                "status TEXT NOT NULL, step TEXT, error TEXT, "
+                "created_at REAL NOT NULL, updated_at REAL NOT NULL)"
+            )
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS run_artifacts ("
+                "run_id TEXT NOT NULL, name TEXT NOT NULL, status TEXT NOT NULL, "
+                "content TEXT, hash TEXT, error TEXT, updated_at REAL NOT NULL, "
+                "PRIMARY KEY (run_id, name))"
+            )
+        self.prune()
+
+    def verify(self, run_id: str, fingerprint: str) -> None:
+        """Check that an existing run was started for the same inputs.
+
+        Raises:
+            ValueError: If the run ID was used for different inputs
+        """
+        with connect_sqlite(self.path) as connection:
+            row = connection.execute(
+                "SELECT fingerprint FROM runs WHERE run_id = ?", (run_id,)
+            ).fetchone()
+        if row is not None and row[0] != fingerprint:
+            raise ValueError(f"Run {run_id} was started with different blog metadata")
+
+    def start(self, run_id: str, fingerprint: str, step: Optional[str]) -> None:
+        """Create a run, or mark an existing one as running a step.
+
+        Raises:
+            ValueError: If the run ID was used for different inputs
+        """
+        self.verify(run_id, fingerprint)
+        now = time.time()
+        with connect_sqlite(self.path) as connection:
+            connection.execute(
+                "INSERT INTO runs "
+                "(run_id, fingerprint, status, step, created_at, updated_at) "
+                "VALUES (?, ?, 'running', ?, ?, ?) "
+                "ON CONFLICT (run_id) DO UPDATE SET status = 'running', "
+                "step = excluded.step, error = NULL, updated_at = excluded.updated_at",
+                (run_id, fingerprint, step, now, now),
+            )
+
+    def finish(self, run_id: str, status: str, error: Optional[str] = None) -> None:
+        with connect_sqlite(self.path) as connection:
+            connection.execute(
+                "UPDATE runs SET status = ?, error = ?, updated_at = ? "
+                "WHERE run_id = ?",
+                (status, error, time.time(), run_id),
+            )
+
+    def save_artifact(
+        self,
+        run_id: str,
+        name: str,
+        content: Any,
+        content_hash: Optional[str] = None,
+    ) -> None:
+        with connect_sqlite(self.path) as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO run_artifacts "
+                "(run_id, name, status, content, hash, updated_at) "
+                "VALUES (?, ?, 'completed', ?, ?, ?)",
+                (run_id, name, json.dumps(content), content_hash, time.time()),
+            )
+
+    def fail_artifact(self, run_id: str, name: str, error: str) -> None:
+        with connect_sqlite(self.path) as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO run_artifacts "
+                "(run_id, name, status, error, updated_at) "
+                "VALUES (?, ?, 'failed', ?, ?)",
+                (run_id, name, error, time.time()),
+            )
+
+    def completed_artifacts(self, run_id: str) -> Dict[str, Tuple[Any, Optional[str]]]:
+        """Completed artifacts of a run as {name: (content, hash)}."""
+        with connect_sqlite(self.path) as connection:
+            rows = connection.execute(
+                "SELECT name, content, hash FROM run_artifacts "
+                "WHERE run_id = ? AND status = 'completed'",
+                (run_id,),
+            ).fetchall()
+        return {name: (json.loads(content), digest) for name, content, digest in rows}
+
+    def get_run(self, run_id: str) -> Optional[Dict[str, Any]]:
+        """Status of a run and each of its artifacts, without their content."""
+        with connect_sqlite(self.path) as connection:
+            run = connection.execute(
+                "SELECT status, step, error, created_at, updated_at "
+                "FROM runs WHERE run_id = ?",
+                (run_id,),
+            ).fetchone()
+            if run is None:
+                return None
+
+            rows = connection.execute(
+                "SELECT name, status, error, updated_at FROM run_artifacts "
+                "WHERE run_id = ? ORDER BY updated_at",
+                (run_id,),
+            ).fetchall()
+
+        status, step, error, created_at, updated_at = run
+        return {
+            "run_id": run_id,
+            "status": status,
+            "step": step,
+            "error": error,
+            "created_at": created_at,
+            "updated_at": updated_at,
+            "artifacts": [
+                {
+                    "name": name,
+                    "status": artifact_status,
+                    "error": artifact_error,
+                    "updated_at": artifact_updated_at,
+                }
+                for name, artifact_status, artifact_error, artifact_updated_at in rows
+            ],
+        }
+
+    def prune(self) -> None:
+        """Delete runs not updated within the TTL; a TTL of 0 keeps every run."""
+        if self.ttl <= 0:
+            return
+
+        cutoff = time.time() - self.ttl
+        with connect_sqlite(self.path) as connection:
+            connection.execute(
+                "DELETE FROM run_artifacts WHERE run_id IN "
+                "(SELECT run_id FROM runs WHERE updated_at < ?)",
+                (cutoff,),
+            )
+            connection.execute("DELETE FROM runs WHERE updated_at < ?", (cutoff,))
+
+
+class RunCheckpoint:
+    """Checkpoints of one run, bound to the inputs it was started with.
+
+    Args:
+        run_id: Caller-chosen run identifier
+        metadata: The metadata for the blog
+        find_trends_type: The type of trends to find
+        store: Run store; defaults to the process-wide one
+
+    Raises:
+        ValueError: If the run ID was used for different inputs
+    """
+
+    def __init__(
+        self,
+        run_id: str,
+        metadata: Dict[str, Any],
+        find_trends_type: str,
+        store: Optional[RunStore] = None,
+    ):
+        self.run_id = run_id
+        self.store = store or get_run_store()
+        # PromptBuilder adds derived fields such as min_words to the metadata
+        # in place, so only the fields a caller declares identify the run
+        self.fingerprint = make_cache_key(
+            "run",
+            {
+                "metadata": {field: metadata.get(field) for field in METADATA_FIELDS},
+                "find_trends_type": find_trends_type,
+            },
+        )
+        self.store.verify(run_id, self.fingerprint)
+
+    def start(self, step: Optional[str]) -> None:
+        self.store.start(self.run_id, self.fingerprint, step)
+
+    def result(
+        self, step: Optional[str], user_input: Optional[str] = None
+    ) -> Optional[Tuple[str, str]]:
+        """The (content, content_type) a finished step returned, if any.
+
+        A step that finished with different user input has no result, so
+        it runs again with the new input.
+        """
+        stored = self.store.completed_artifacts(self.run_id).get(
+            f"{_RESULT_PREFIX}{step}"
+        )
+        if not stored:
+            return None
+        content, content_type, *stored_input = stored[0]
+        if (stored_input[0] if stored_input else None) != user_input:
+            return None
+        return content, content_type
+
+    def complete(
+        self,
+        step: Optional[str],
+        content: str,
+        content_type: str,
+        user_input: Optional[str] = None,
+    ) -> None:
+        self.store.save_artifact(
+            self.run_id,
+            f"{_RESULT_PREFIX}{step}",
+            [content, content_type, user_input],
+        )
+        self.store.finish(self.run_id, "completed")
+
+    def fail(self, error: str) -> None:
+        self.store.finish(self.run_id, "failed", error)
+
+    def artifacts(self) -> Dict[str, Any]:
+        """Completed trends, research and outline artifacts of the run."""
+        return {
+            name: content
+            for name, (content, _) in self.store.completed_artifacts(
+                self.run_id
+            ).items()
+            if not name.startswith((_SECTION_PREFIX, _RESULT_PREFIX))
+        }
+
+    def save(self, name: str, value: Any) -> None:
+        """Checkpoint an artifact; an empty value is recorded as failed."""
+        if value:
+            self.store.save_artifact(self.run_id, name, value)
+        else:
+            self.store.fail_artifact(self.run_id, name, "No data produced")
+
+    def sections(
+        self,
+        prompts: Dict[str, str],
+        regenerate_sections: Optional[Iterable[str]] = None,
+    ) -> Dict[str, str]:
+        """Checkpointed sections whose prompt is unchanged.
+
+        Args:
+            prompts: Formatted prompt text keyed by section name
+            regenerate_sections: Section names not to restore
+
+        Returns:
+            Stored content keyed by section name
+        """
+        forced = {section.lower() for section in regenerate_sections or []}
+        stored = self.store.completed_artifacts(self.run_id)
+        restored = {}
+        for section, prompt in prompts.items():
+            entry = stored.get(f"{_SECTION_PREFIX}{section}")
+            if (
+                section.lower() not in forced
+                and entry
+                and entry[1] == section_hash(prompt, resolve_route(section)["model"])
+            ):
+                restored[section] = entry[0]
+        return restored
+
+    def section_callbacks(self, prompts: Dict[str, str]) -> Dict[str, Callable]:
+        """SectionGenerator callbacks that checkpoint each section as it ends.
+
+        Args:
+            prompts: Formatted prompt text keyed by section name
+
+        Returns:
+            Keyword arguments for `SectionGenerator.agenerate`
+        """
+
+        def on_section(section: str, content: str) -> None:
+            self.store.save_artifact(
+                self.run_id,
+                f"{_SECTION_PREFIX}{section}",
+                content,
+                section_hash(prompts[section], resolve_route(section)["model"]),
+            )
+
+        def on_error(section: str, error: Exception) -> None:
+            self.store.fail_artifact(
+                self.run_id, f"{_SECTION_PREFIX}{section}", str(error)
+            )
+
+        return {"on_section": on_section, "on_error": on_error}
+
+
+def get_run_store() -> RunStore:
+    """Get the process-wide run checkpoint store."""
+    global _RUN_STORE
+
+    with _RUN_STORE_LOCK:
+        if _RUN_STORE is None:
+            _RUN_STORE = RunStore()
+        return _RUN_STORE
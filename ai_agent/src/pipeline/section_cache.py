@@ -0,0 +1,92 @@
+import hashlib
+from typing import Dict, Iterable, Optional, Tuple
+
+from config.settings import settings
+from src.pipeline.ai_generator import get_memory
+from src.pipeline.model_router import resolve_route
+
+_SECTIONS_KEY = "generated_sections"
+
+
+def section_hash(prompt: str, model: Optional[str] = None) -> str:
+    """Hash a section's prompt inputs.
+
+    The formatted prompt already holds the metadata and the section's
+    outline slice, so a changed hash means the section is out of date.
+
+    Args:
+        prompt: Formatted prompt text for the section
+        model: Model the section is routed to; defaults to LLM_MODEL
+
+    Returns:
+        Hex digest identifying the section's inputs
+    """
+    digest = hashlib.sha256()
+    digest.update((model or settings.LLM_MODEL).encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(prompt.encode("utf-8"))
+    return digest.hexdigest()
+
+
+class SectionCache:
+    """Generated sections of one session, keyed by section name and prompt hash.
+
+    Sections are kept in session memory, so they share the session's
+    backend and lifetime.
+    """
+
+    def __init__(self, session_id: str):
+        self.memory = get_memory(session_id=session_id)
+
+    def _stored(self) -> Dict[str, Dict[str, str]]:
+        return self.memory.get_session_data(_SECTIONS_KEY) or {}
+
+    def split(
+        self,
+        prompts: Dict[str, str],
+        regenerate_sections: Optional[Iterable[str]] = None,
+    ) -> Tuple[Dict[str, str], Dict[str, str]]:
+        """Split section prompts into stored content and prompts to generate.
+
+        Args:
+            prompts: Formatted prompt text keyed by section name
+            regenerate_sections: Section names to generate again even if stored
+
+        Returns:
+            Tuple of (stored content keyed by section, prompts still to generate)
+        """
+        forced = {section.lower() for section in regenerate_sections or []}
+        stored = self._stored()
+        cached, pending = {}, {}
+
+        for section, prompt in prompts.items():
+            entry = stored.get(section)
+            if (
+                section.lower() not in forced
+                and entry
+                and entry.get("hash")
+                == section_hash(prompt, resolve_route(section)["model"])
+            ):
+                cached[section] = entry["content"]
+            else:
+                pending[section] = prompt
+
+        return cached, pending
+
+    def save(self, prompts: Dict[str, str], sections: Dict[str, str]) -> None:
+        """Store newly generated sections alongside their prompt hashes.
+
+        Args:
+            prompts: Formatted prompt text keyed by section name
+            sections: Generated content keyed by section name
+        """
+        if not sections:
+            return
+
+        stored = self._stored()
+        for section, content in sections.items():
+            stored[section] = {
+                "hash": section_hash(prompts[section], resolve_route(section)["model"]),
+                "content": content,
+            }
+        self.memory.set_session_data(_SECTIONS_KEY, stored)
@@ -0,0 +1,145 @@
+import asyncio
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+from config.settings import settings
+from src.utils.telemetry import span
+
+_END_OF_SECTION = object()
+
+
+class SectionGenerator:
+    """Generate blog sections concurrently, a bounded number at a time.
+
+    Args:
+        llm: Chat model used for every section
+        max_concurrency: Sections generated at once; defaults to SECTION_CONCURRENCY
+        llm_for_section: Optional callable returning the chat model for a
+            section name, e.g. `get_routed_llm`; takes precedence over `llm`
+    """
+
+    def __init__(
+        self,
+        llm: Any = None,
+        max_concurrency: Optional[int] = None,
+        llm_for_section: Optional[Callable[[str], Any]] = None,
+    ):
+        self.llm = llm
+        self.max_concurrency = max(1, max_concurrency or settings.SECTION_CONCURRENCY)
+        self.llm_for_section = llm_for_section
+
+    def _llm(self, section: str) -> Any:
+        return self.llm_for_section(section) if self.llm_for_section else self.llm
+
+    async def _agenerate_section(
+        self,
+        semaphore: asyncio.Semaphore,
+        section: str,
+        prompt: str,
+        on_section: Optional[Callable[[str, str], None]],
+        on_error: Optional[Callable[[str, Exception], None]],
+    ) -> str:
+        async with semaphore:
+            with span("section", section=section):
+                try:
+                    content = (await self._llm(section).ainvoke(prompt)).content
+                except Exception as e:
+                    if on_error:
+                        await asyncio.to_thread(on_error, section, e)
+                    raise
+        if on_section:
+            # Callbacks may write to a store, so they run off the event loop
+            await asyncio.to_thread(on_section, section, content)
+        return content
+
+    async def agenerate(
+        self,
+        prompts: Dict[str, str],
+        on_section: Optional[Callable[[str, str], None]] = None,
+        on_error: Optional[Callable[[str, Exception], None]] = None,
+    ) -> Dict[str, str]:
+        """Generate every section at once with the LLM's native `ainvoke`.
+
+        When a section fails, the other sections still run to completion
+        before the first error is raised, so callbacks see every section
+        that could be generated.
+
+        Args:
+            prompts: Formatted prompt text keyed by section name
+            on_section: Called with (section, content) as each section
+                finishes, in a worker thread
+            on_error: Called with (section, error) when a section fails, in a
+                worker thread
+
+        Returns:
+            Dict of generated content keyed by section name, in prompt order
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        results = await asyncio.gather(
+            *(
+                self._agenerate_section(
+                    semaphore, section, prompt, on_section, on_error
+                )
+                for section, prompt in prompts.items()
+            ),
+            return_exceptions=True,
+        )
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+        return dict(zip(prompts.keys(), results))
+
+    async def _astream_section(
+        self,
+        semaphore: asyncio.Semaphore,
+        section: str,
+        prompt: str,
+        queue: asyncio.Queue,
+    ) -> None:
+        try:
+            async with semaphore:
+                with span("section", section=section):
+                    async for chunk in self._llm(section).astream(prompt):
+                        if chunk.content:
+                            await queue.put(chunk.content)
+        except Exception as e:
+            await queue.put(e)
+        finally:
+            await queue.put(_END_OF_SECTION)
+
+    async def astream(self, prompts: Dict[str, str]) -> AsyncIterator[Tuple[str, str]]:
+        """Stream every section concurrently, yielding chunks in prompt order.
+
+        Chunks of later sections are buffered until every earlier section
+        has finished streaming.
+
+        Args:
+            prompts: Formatted prompt text keyed by section name
+
+        Yields:
+            Tuples of (section name, text chunk)
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        queues = {section: asyncio.Queue() for section in prompts}
+        tasks = [
+            asyncio.create_task(
+                self._astream_section(semaphore, section, prompt, queues[section])
+            )
+            for section, prompt in prompts.items()
+        ]
+
+        try:
+            for section, queue in queues.items():
+                while (chunk := await queue.get()) is not _END_OF_SECTION:
+                    if isinstance(chunk, Exception):
+                        raise chunk
+                    yield section, chunk
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    @staticmethod
+    def assemble(sections: Dict[str, str], steps: List[str]) -> str:
+        """Join generated sections in the structure's step order."""
+        return "\n".join(
+            f"{sections[section]}\n" for section in steps if section in sections
+        )
@@ -0,0 +1,110 @@
+from langchain.memory import (
+    ConversationBufferMemory,
+    ConversationBufferWindowMemory,
+)
+
+from src.integrations.database import UNCHANGED
+from src.pipeline.session_store import approximate_size
+
+
+class SessionDataMixin:
+    """Session data storage shared by the session memory classes."""
+
+    def _init_session_data(self):
+        self._session_data = {}
+        self._versions = {}
+        self._on_change = None
+        self._backend = None
+        self._session_id = None
+
+    def attach_backend(self, session_id, backend):
+        """Write session data through to a shared backend and read it back."""
+        self._session_id = session_id
+        self._backend = backend
+
+    def set_session_data(self, key, value):
+        """Store arbitrary data in session memory."""
+        self._session_data[key] = value
+        if self._backend:
+            self._versions[key] = self._backend.set_session_data(
+                self._session_id, key, value
+            )
+        if self._on_change:
+            self._on_change()
+
+    def get_session_data(self, key, default=None):
+        """Retrieve arbitrary data from session memory.
+
+        With a shared backend every read checks the stored version, so a
+        value another worker rewrote replaces the local copy; an unchanged
+        value is not transferred again.
+        """
+        if self._backend:
+            stored = self._backend.get_session_data_since(
+                self._session_id, key, self._versions.get(key)
+            )
+            if stored is None:
+                changed = self._session_data.pop(key, None) is not None
+                self._versions.pop(key, None)
+            else:
+                version, value = stored
+                changed = value is not UNCHANGED
+                if changed:
+                    self._session_data[key] = value
+                    self._versions[key] = version
+            if changed and self._on_change:
+                self._on_change()
+
+        return self._session_data.get(key, default)
+
+    def get_all_session_data(self):
+        """Get all session data."""
+        if self._backend:
+            # The backend holds the latest copy of every key
+            self._session_data = self._backend.get_all_session_data(self._session_id)
+            self._versions.clear()
+            if self._on_change:
+                self._on_change()
+        return self._session_data
+
+    def save_context(self, inputs, outputs):
+        super().save_context(inputs, outputs)
+        if self._on_change:
+            self._on_change()
+
+    def clear(self):
+        super().clear()
+        if self._on_change:
+            self._on_change()
+
+    def expire(self, idle_ttl):
+        """Drop the session's shared data once no worker wrote it for `idle_ttl`."""
+        if self._backend:
+            self._backend.clear_session(self._session_id, idle_for=idle_ttl)
+
+    def approximate_size(self):
+        """Approximate number of bytes held by the session data and messages."""
+        data_size = sum(
+            len(str(key)) + approximate_size(value)
+            for key, value in self._session_data.items()
+        )
+        message_size = sum(
+            approximate_size(message.content) for message in self.chat_memory.messages
+        )
+        return data_size + message_size
+
+
+class SessionMemory(SessionDataMixin, ConversationBufferMemory):
+    """Extended ConversationBufferMemory that can store session data."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._init_session_data()
+
+
+class SessionWindowMemory(SessionDataMixin, ConversationBufferWindowMemory):
+    """Extended ConversationBufferWindowMemory that can store session data."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._init_session_data()
@@ -0,0 +1,189 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+from config.settings import settings
+
+
+def approximate_size(value: Any) -> int:
+    """Approximate the number of bytes a stored value occupies."""
+    if value is None:
+        return 0
+    if isinstance(value, str):
+        return len(value.encode("utf-8"))
+    return len(json.dumps(value, default=str).encode("utf-8"))
+
+
+class SessionStore:
+    """Bounded, evicting store of per-session memories.
+
+    Sessions expire after `idle_ttl` seconds without access, and the least
+    recently used sessions are evicted once either `max_entries` or
+    `max_bytes` is exceeded. Expired sessions are swept at most every
+    `sweep_interval` seconds as a side effect of normal store access. An
+    expired session's shared backend data is deleted too, unless another
+    worker wrote to it within `idle_ttl`.
+    """
+
+    def __init__(
+        self,
+        idle_ttl: Optional[int] = None,
+        max_entries: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        sweep_interval: Optional[int] = None,
+    ):
+        self.idle_ttl = settings.SESSION_IDLE_TTL if idle_ttl is None else idle_ttl
+        self.max_entries = max_entries or settings.SESSION_MAX_ENTRIES
+        self.max_bytes = max_bytes or settings.SESSION_MAX_BYTES
+        self.sweep_interval = (
+            settings.SESSION_SWEEP_INTERVAL
+            if sweep_interval is None
+            else sweep_interval
+        )
+        self._entries = OrderedDict()
+        self._last_access = {}
+        self._sizes = {}
+        self._total_bytes = 0
+        self._evictions = 0
+        self._expirations = 0
+        self._last_sweep = time.monotonic()
+        self._lock = threading.RLock()
+
+    def __contains__(self, session_id: str) -> bool:
+        return self.get(session_id) is not None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, session_id: str) -> Any:
+        """Get the memory for a session, or None if missing or expired."""
+        with self._lock:
+            expired = self._maybe_sweep()
+            memory = self._entries.get(session_id)
+            if memory is not None and self._is_expired(session_id, time.monotonic()):
+                self._remove(session_id)
+                self._expirations += 1
+                expired.append(memory)
+                memory = None
+            elif memory is not None:
+                self._touch(session_id)
+
+        self._expire_shared(expired)
+        return memory
+
+    def set(self, session_id: str, memory: Any) -> None:
+        """Store the memory for a session, evicting older sessions if needed."""
+        with self._lock:
+            expired = self._maybe_sweep()
+            if session_id in self._entries:
+                self._remove(session_id)
+
+            self._entries[session_id] = memory
+            self._sizes[session_id] = 0
+            memory._on_change = lambda: self.refresh_size(session_id)
+            self._measure(session_id)
+            self._touch(session_id)
+            self._enforce_limits()
+
+        self._expire_shared(expired)
+
+    def pop(self, session_id: str) -> Any:
+        """Remove and return the memory for a session, or None if missing."""
+        with self._lock:
+            memory = self._entries.get(session_id)
+            if memory is not None:
+                self._remove(session_id)
+            return memory
+
+    def refresh_size(self, session_id: str) -> None:
+        """Re-measure a session after its data changed and enforce the caps."""
+        with self._lock:
+            if session_id not in self._entries:
+                return
+            self._measure(session_id)
+            self._touch(session_id)
+            self._enforce_limits()
+
+    def sweep(self) -> int:
+        """Remove every expired session.
+
+        Returns:
+            The number of sessions removed
+        """
+        with self._lock:
+            expired = self._sweep_locked()
+        self._expire_shared(expired)
+        return len(expired)
+
+    def _sweep_locked(self) -> List[Any]:
+        now = time.monotonic()
+        self._last_sweep = now
+        expired = [
+            session_id
+            for session_id in self._entries
+            if self._is_expired(session_id, now)
+        ]
+        memories = [self._entries[session_id] for session_id in expired]
+        for session_id in expired:
+            self._remove(session_id)
+        self._expirations += len(expired)
+        return memories
+
+    def _expire_shared(self, memories: List[Any]) -> None:
+        # Runs outside the lock, as it may reach a shared backend
+        for memory in memories:
+            expire = getattr(memory, "expire", None)
+            if expire is None:
+                continue
+            try:
+                expire(self.idle_ttl)
+            except Exception as e:
+                print(f"Error expiring shared session data: {str(e)}")
+
+    def stats(self) -> Dict[str, Any]:
+        """Get memory-usage statistics for the store."""
+        with self._lock:
+            return {
+                "sessions": len(self._entries),
+                "bytes": self._total_bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "idle_ttl": self.idle_ttl,
+                "evictions": self._evictions,
+                "expirations": self._expirations,
+            }
+
+    def _is_expired(self, session_id: str, now: float) -> bool:
+        return (
+            bool(self.idle_ttl) and now - self._last_access[session_id] > self.idle_ttl
+        )
+
+    def _measure(self, session_id: str) -> None:
+        # Sizes only change on writes, so reads reuse the cached size
+        size = self._entries[session_id].approximate_size()
+        self._total_bytes += size - self._sizes[session_id]
+        self._sizes[session_id] = size
+
+    def _touch(self, session_id: str) -> None:
+        self._last_access[session_id] = time.monotonic()
+        self._entries.move_to_end(session_id)
+
+    def _remove(self, session_id: str) -> None:
+        memory = self._entries.pop(session_id)
+        memory._on_change = None
+        self._total_bytes -= self._sizes.pop(session_id)
+        del self._last_access[session_id]
+
+    def _enforce_limits(self) -> None:
+        while len(self._entries) > 1 and (
+            len(self._entries) > self.max_entries or self._total_bytes > self.max_bytes
+        ):
+            self._remove(next(iter(self._entries)))
+            self._evictions += 1
+
+    def _maybe_sweep(self) -> List[Any]:
+        if time.monotonic() - self._last_sweep >= self.sweep_interval:
+            return self._sweep_locked()
+        return []
@@ -0,0 +1,342 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, Optional
+
+from config.settings import settings
+from src.utils.telemetry import register_collector
+
+_CACHES = {}
+_CACHES_LOCK = threading.Lock()
+
+
+class CacheStats:
+    """Hit/miss counters for a cache instance."""
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self._lock = threading.Lock()
+
+    def record(self, name: str, count: int = 1):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + count)
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_rate": round(self.hit_rate, 4),
+        }
+
+
+class BaseCache:
+    """Key/value cache with per-entry TTL and a bounded number of entries."""
+
+    backend = "base"
+
+    def __init__(self, ttl: int, max_entries: int):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.stats = CacheStats()
+
+    def get(self, key: str, default: Any = None) -> Any:
+        raise NotImplementedError
+
+    def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
+        raise NotImplementedError
+
+    def delete(self, key: str) -> None:
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        raise NotImplementedError
+
+    def __len__(self) -> int:
+        raise NotImplementedError
+
+    def _expires_at(self, ttl: Optional[int]) -> Optional[float]:
+        ttl = self.ttl if ttl is None else ttl
+        return time.time() + ttl if ttl and ttl > 0 else None
+
+
+class NullCache(BaseCache):
+    """Cache that never stores anything, used when caching is disabled."""
+
+    backend = "none"
+
+    def get(self, key: str, default: Any = None) -> Any:
+        self.stats.record("misses")
+        return default
+
+    def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
+        return None
+
+    def delete(self, key: str) -> None:
+        return None
+
+    def clear(self) -> None:
+        return None
+
+    def __len__(self) -> int:
+        return 0
+
+
+class MemoryCache(BaseCache):
+    """In-process LRU cache with TTL expiry."""
+
+    backend = "memory"
+
+    def __init__(self, ttl: int, max_entries: int):
+        super().__init__(ttl, max_entries)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.stats.record("misses")
+                return default
+
+            expires_at, value = entry
+            if expires_at is not None and expires_at <= time.time():
+                del self._entries[key]
+                self.stats.record("expirations")
+                self.stats.record("misses")
+                return default
+
+            self._entries.move_to_end(key)
+            self.stats.record("hits")
+            return value
+
+    def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
+        with self._lock:
+            self._entries[key] = (self._expires_at(ttl), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats.record("evictions")
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteCache(BaseCache):
+    """On-disk LRU cache with TTL expiry, shared by every worker on the host.
+
+    Values must be JSON serializable.
+    """
+
+    backend = "sqlite"
+
+    def __init__(self, path: str, namespace: str, ttl: int, max_entries: int):
+        super().__init__(ttl, max_entries)
+        self.path = path
+        self.table = f"cache_{namespace}"
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with self._connect() as connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                f"CREATE TABLE IF NOT EXISTS {self.table} ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+                "expires_at REAL, accessed_at REAL NOT NULL)"
+            )
+            connection.execute(
+                f"CREATE INDEX IF NOT EXISTS {self.table}_accessed_at "
+                f"ON {self.table} (accessed_at)"
+            )
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        connection = sqlite3.connect(self.path, timeout=30)
+        try:
+            with connection:
+                yield connection
+        finally:
+            connection.close()
+
+    def get(self, key: str, default: Any = None) -> Any:
+        now = time.time()
+        with self._connect() as connection:
+            row = connection.execute(
+                f"SELECT value, expires_at FROM {self.table} WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.stats.record("misses")
+                return default
+
+            value, expires_at = row
+            if expires_at is not None and expires_at <= now:
+                connection.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+                self.stats.record("expirations")
+                self.stats.record("misses")
+                return default
+
+            connection.execute(
+                f"UPDATE {self.table} SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+
+        self.stats.record("hits")
+        return json.loads(value)
+
+    def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
+        now = time.time()
+        with self._connect() as connection:
+            connection.execute(
+                f"INSERT OR REPLACE INTO {self.table} "
+                "(key, value, expires_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value), self._expires_at(ttl), now),
+            )
+            connection.execute(
+                f"DELETE FROM {self.table} WHERE expires_at IS NOT NULL "
+                "AND expires_at <= ?",
+                (now,),
+            )
+            evicted = connection.execute(
+                f"DELETE FROM {self.table} WHERE key IN ("
+                f"SELECT key FROM {self.table} ORDER BY accessed_at DESC "
+                "LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            ).rowcount
+        if evicted > 0:
+            self.stats.record("evictions", evicted)
+
+    def delete(self, key: str) -> None:
+        with self._connect() as connection:
+            connection.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+
+    def clear(self) -> None:
+        with self._connect() as connection:
+            connection.execute(f"DELETE FROM {self.table}")
+
+    def __len__(self) -> int:
+        with self._connect() as connection:
+            row = connection.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()
+        return row[0]
+
+
+def _normalize(value: Any) -> Any:
+    if isinstance(value, str):
+        return " ".join(value.lower().split())
+    if isinstance(value, dict):
+        return {str(key): _normalize(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(item) for item in value]
+    return value
+
+
+def make_cache_key(
+    namespace: str, params: Dict[str, Any], exclude: Iterable[str] = ()
+) -> str:
+    """Build a content-addressed cache key from normalized params.
+
+    Args:
+        namespace: Cache namespace, part of the hashed key
+        params: Parameters identifying the cached response
+        exclude: Parameter names that must not affect the key (e.g. API keys)
+
+    Returns:
+        A hex SHA-256 digest of the namespace and normalized params
+    """
+    excluded = set(exclude)
+    normalized = _normalize(
+        {key: value for key, value in params.items() if key not in excluded}
+    )
+    payload = json.dumps([namespace, normalized], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def get_cache(
+    namespace: str,
+    backend: Optional[str] = None,
+    ttl: Optional[int] = None,
+    max_entries: Optional[int] = None,
+) -> BaseCache:
+    """Get the process-wide cache registered under a namespace.
+
+    Args:
+        namespace: Cache namespace, e.g. "trends"
+        backend: "none", "memory" or "sqlite"; defaults to CACHE_BACKEND
+        ttl: Default entry lifetime in seconds; defaults to CACHE_TTL
+        max_entries: Maximum number of entries; defaults to CACHE_MAX_ENTRIES
+
+    Returns:
+        The cache instance for the namespace, created on first use
+    """
+    with _CACHES_LOCK:
+        if namespace in _CACHES:
+            return _CACHES[namespace]
+
+        backend = (backend or settings.CACHE_BACKEND).lower()
+        ttl = settings.CACHE_TTL if ttl is None else ttl
+        max_entries = max_entries or settings.CACHE_MAX_ENTRIES
+
+        if backend == "sqlite":
+            cache = SQLiteCache(settings.CACHE_DB_PATH, namespace, ttl, max_entries)
+        elif backend == "memory":
+            cache = MemoryCache(ttl, max_entries)
+        else:
+            cache = NullCache(ttl, max_entries)
+
+        _CACHES[namespace] = cache
+        return cache
+
+
+def get_cache_stats() -> Dict[str, Dict[str, Any]]:
+    """Get hit/miss metrics for every registered cache, keyed by namespace."""
+    with _CACHES_LOCK:
+        caches = dict(_CACHES)
+
+    return {
+        namespace: {"backend": cache.backend, **cache.stats.as_dict()}
+        for namespace, cache in caches.items()
+    }
+
+
+def _collect_metrics():
+    for namespace, stats in get_cache_stats().items():
+        labels = {"namespace": namespace, "backend": stats["backend"]}
+        for name in ("hits", "misses", "evictions", "expirations"):
+            yield (
+                f"blog_writer_cache_{name}_total",
+                "counter",
+                f"Cache {name} by namespace",
+                labels,
+                stats[name],
+            )
+        yield (
+            "blog_writer_cache_hit_ratio",
+            "gauge",
+            "Share of cache lookups that were hits, by namespace",
+            labels,
+            stats["hit_rate"],
+        )
+
+
+register_collector(_collect_metrics)
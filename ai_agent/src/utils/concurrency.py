@@ -0,0 +1,203 @@
+import asyncio
+import concurrent.futures
+import threading
+from collections import deque
+from typing import Any, Awaitable, Callable, Hashable
+
+
+class ConcurrencyLimiter:
+    """Cap the number of concurrent operations across threads and event loops.
+
+    Slots are handed to waiters in FIFO order. Synchronous callers use
+    `with limiter:`; coroutines use `async with limiter:` and never block
+    their event loop while waiting.
+    """
+
+    def __init__(self, limit: int):
+        self.limit = max(1, limit)
+        self._active = 0
+        self._waiters = deque()
+        self._lock = threading.Lock()
+
+    @property
+    def active(self) -> int:
+        return self._active
+
+    @property
+    def waiting(self) -> int:
+        return len(self._waiters)
+
+    def _try_acquire(self) -> bool:
+        if self._active < self.limit and not self._waiters:
+            self._active += 1
+            return True
+        return False
+
+    def acquire(self) -> None:
+        with self._lock:
+            if self._try_acquire():
+                return
+            event = threading.Event()
+            self._waiters.append(event)
+        event.wait()
+
+    async def aacquire(self) -> None:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if self._try_acquire():
+                return
+            future = loop.create_future()
+            waiter = (loop, future)
+            self._waiters.append(waiter)
+
+        try:
+            await future
+        except asyncio.CancelledError:
+            with self._lock:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+                    raise
+            # The slot was already handed over; pass it on unless the
+            # hand-over callback will do so for the cancelled future.
+            if future.done() and not future.cancelled():
+                self.release()
+            raise
+
+    def release(self) -> None:
+        with self._lock:
+            if not self._waiters:
+                self._active -= 1
+                return
+            waiter = self._waiters.popleft()
+
+        if isinstance(waiter, threading.Event):
+            waiter.set()
+        else:
+            loop, future = waiter
+            try:
+                loop.call_soon_threadsafe(self._hand_over, future)
+            except RuntimeError:
+                # The waiter's event loop is closed; give the slot to the next one
+                self.release()
+
+    def _hand_over(self, future: asyncio.Future) -> None:
+        if future.cancelled():
+            self.release()
+        else:
+            future.set_result(None)
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.release()
+
+    async def __aenter__(self):
+        await self.aacquire()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.release()
+
+
+class _LeaderCancelledError(Exception):
+    """The call being waited on was cancelled before it produced a result."""
+
+
+class SingleFlight:
+    """Share one in-flight call among concurrent callers with the same key.
+
+    The first caller for a key runs the call; callers arriving while it is
+    in flight wait for its result instead of repeating it. Waiting works
+    across threads and event loops because the shared result is a
+    `concurrent.futures.Future`. Results are not kept once the call ends.
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+        self.stats = {"leaders": 0, "coalesced": 0}
+
+    def _join(self, key: Hashable) -> tuple:
+        """Get the in-flight future for a key and whether the caller leads it."""
+        with self._lock:
+            future = self._calls.get(key)
+            if future is not None:
+                self.stats["coalesced"] += 1
+                return future, False
+
+            future = concurrent.futures.Future()
+            # A running future cannot be cancelled by one impatient waiter
+            future.set_running_or_notify_cancel()
+            self._calls[key] = future
+            self.stats["leaders"] += 1
+            return future, True
+
+    def _finish(self, key: Hashable, future: concurrent.futures.Future) -> None:
+        with self._lock:
+            if self._calls.get(key) is future:
+                del self._calls[key]
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """Run `fn`, or wait for the identical call already in flight.
+
+        If the leading call is interrupted, its waiters start the call
+        again rather than failing with it.
+
+        Args:
+            key: Identifies calls that produce the same result
+            fn: The call to run when no identical call is in flight
+
+        Returns:
+            The result of `fn` or of the call that was joined
+        """
+        while True:
+            future, leader = self._join(key)
+            if not leader:
+                try:
+                    return future.result()
+                except _LeaderCancelledError:
+                    continue
+
+            try:
+                result = fn()
+            except Exception as e:
+                future.set_exception(e)
+                raise
+            except BaseException:
+                future.set_exception(_LeaderCancelledError())
+                raise
+            else:
+                future.set_result(result)
+                return result
+            finally:
+                self._finish(key, future)
+
+    async def ado(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Async variant of `do` for coroutine functions."""
+        while True:
+            future, leader = self._join(key)
+            if not leader:
+                try:
+                    return await asyncio.wrap_future(future)
+                except _LeaderCancelledError:
+                    continue
+
+            try:
+                result = await fn()
+            except Exception as e:
+                future.set_exception(e)
+                raise
+            except BaseException:
+                future.set_exception(_LeaderCancelledError())
+                raise
+            else:
+                future.set_result(result)
+                return result
+            finally:
+                self._finish(key, future)
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._calls)
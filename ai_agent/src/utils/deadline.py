@@ -0,0 +1,202 @@
+import asyncio
+import math
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Dict, Iterator, Optional
+
+from config.settings import settings
+from src.utils.telemetry import register_collector
+
+_deadline = ContextVar("request_deadline", default=None)
+_HEDGERS = {}
+_HEDGERS_LOCK = threading.Lock()
+
+
+class DeadlineExceededError(TimeoutError):
+    """The request's deadline passed before a call could start or finish."""
+
+
+@contextmanager
+def deadline_scope(seconds: Optional[float]) -> Iterator[None]:
+    """Bound the enclosed calls, and tasks started from them, by a deadline.
+
+    Nested scopes can only shorten the deadline. Like request priorities,
+    the deadline follows asyncio tasks, `asyncio.to_thread` calls and
+    copied contexts.
+
+    Args:
+        seconds: Time budget from now; None or 0 leaves the deadline as is
+    """
+    current = _deadline.get()
+    if seconds:
+        candidate = time.monotonic() + seconds
+        current = candidate if current is None else min(current, candidate)
+    token = _deadline.set(current)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining() -> Optional[float]:
+    """Seconds left until the current deadline, or None without one."""
+    deadline = _deadline.get()
+    return None if deadline is None else deadline - time.monotonic()
+
+
+def call_timeout(per_call: Optional[float] = None) -> Optional[float]:
+    """Timeout for one upstream call: its own limit, capped by the deadline.
+
+    Args:
+        per_call: The call's own timeout in seconds; None or 0 for no limit
+
+    Returns:
+        Seconds the call may take, or None for no limit
+
+    Raises:
+        DeadlineExceededError: If the deadline has already passed
+    """
+    left = remaining()
+    if left is not None and left <= 0:
+        raise DeadlineExceededError("Request deadline exceeded")
+    limits = [limit for limit in (per_call or None, left) if limit is not None]
+    return min(limits) if limits else None
+
+
+class Hedger:
+    """Duplicates calls that run past a latency percentile, within a budget.
+
+    When a call is still running after the recent p95 (HEDGE_PERCENTILE)
+    latency of its kind, a second identical call is started and the first
+    result wins; the other call is cancelled. At most HEDGE_MAX_RATIO of
+    calls are hedged, and hedging waits for HEDGE_MIN_SAMPLES latencies.
+    Only use it for idempotent calls.
+
+    Args:
+        name: Kind of call, e.g. "gemini:section"
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._latencies = deque(maxlen=max(1, settings.HEDGE_WINDOW))
+        self._lock = threading.Lock()
+        self.stats = {"calls": 0, "hedged": 0, "hedge_wins": 0}
+
+    def hedge_delay(self) -> Optional[float]:
+        """Seconds to wait before hedging, or None while there are too few samples."""
+        with self._lock:
+            if len(self._latencies) < max(1, settings.HEDGE_MIN_SAMPLES):
+                return None
+            ordered = sorted(self._latencies)
+        rank = math.ceil(settings.HEDGE_PERCENTILE / 100 * len(ordered))
+        return ordered[max(0, rank - 1)]
+
+    def record(self, latency: float) -> None:
+        with self._lock:
+            self._latencies.append(latency)
+
+    def _try_spend(self) -> bool:
+        if settings.HEDGE_MAX_RATIO <= 0:
+            return False
+        with self._lock:
+            # One hedge of headroom, so the first slow call can be hedged
+            allowance = settings.HEDGE_MAX_RATIO * self.stats["calls"] + 1
+            allowed = self.stats["hedged"] < allowance
+            if allowed:
+                self.stats["hedged"] += 1
+            return allowed
+
+    async def call(self, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Await `fn()`, hedging it with a second `fn()` if it runs slow.
+
+        Args:
+            fn: Coroutine function making one idempotent call
+
+        Returns:
+            The result of whichever call finished first
+        """
+        with self._lock:
+            self.stats["calls"] += 1
+        started_at = time.monotonic()
+        delay = self.hedge_delay() if settings.HEDGE_ENABLED else None
+        left = remaining()
+        if delay is None or (left is not None and left <= delay):
+            result = await fn()
+            self.record(time.monotonic() - started_at)
+            return result
+
+        primary = asyncio.ensure_future(fn())
+        tasks = {primary}
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if not done and self._try_spend():
+                tasks.add(asyncio.ensure_future(fn()))
+
+            while True:
+                done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                winner = next(iter(done))
+                if winner.exception() is None or len(tasks) == 1:
+                    break
+                # One call failed while the other is still running; wait for it
+                tasks.discard(winner)
+
+            result = winner.result()
+            self.record(time.monotonic() - started_at)
+            if winner is not primary:
+                with self._lock:
+                    self.stats["hedge_wins"] += 1
+            return result
+        finally:
+            for task in tasks:
+                task.cancel()
+
+
+def get_hedger(name: str) -> Hedger:
+    """Get the process-wide hedger for one kind of call."""
+    with _HEDGERS_LOCK:
+        if name not in _HEDGERS:
+            _HEDGERS[name] = Hedger(name)
+        return _HEDGERS[name]
+
+
+def get_hedging_stats() -> Dict[str, Dict[str, Any]]:
+    """Get call, hedge and hedge-win counters for every kind of call."""
+    with _HEDGERS_LOCK:
+        hedgers = dict(_HEDGERS)
+    return {
+        name: {**hedger.stats, "hedge_delay": hedger.hedge_delay()}
+        for name, hedger in hedgers.items()
+    }
+
+
+def _collect_metrics():
+    for name, stats in get_hedging_stats().items():
+        labels = {"call": name}
+        yield (
+            "blog_writer_hedged_calls_total",
+            "counter",
+            "Calls that were duplicated after running past the hedge delay",
+            labels,
+            stats["hedged"],
+        )
+        yield (
+            "blog_writer_hedge_wins_total",
+            "counter",
+            "Hedged calls where the duplicate finished first",
+            labels,
+            stats["hedge_wins"],
+        )
+        if stats["hedge_delay"] is not None:
+            yield (
+                "blog_writer_hedge_delay_seconds",
+                "gauge",
+                "Latency percentile after which a call is hedged",
+                labels,
+                stats["hedge_delay"],
+            )
+
+
+register_collector(_collect_metrics)
@@ -1,4 +1,11 @@
-import markdown
+import asyncio
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Coroutine
+
+from src.utils.lazy_imports import LazyImport
+
+markdown = LazyImport("markdown")
 
 
 class Helpers:
@@ -6,3 +13,21 @@ class Helpers:
     def markdown_to_text(md_content):
         html = markdown.markdown(md_content)
         return html
+
+    @staticmethod
+    def run_sync(coroutine: Coroutine[Any, Any, Any]) -> Any:
+        """Run a coroutine to completion from synchronous code.
+
+        When called from a thread that already runs an event loop, the
+        coroutine is executed on a fresh loop in a worker thread instead,
+        with the caller's context (deadline, priority, current span).
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(coroutine)
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            return executor.submit(
+                contextvars.copy_context().run, asyncio.run, coroutine
+            ).result()
@@ -0,0 +1,113 @@
+import importlib
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+from src.utils.telemetry import register_collector
+
+_REGISTRY = []
+_LOAD_TIMES = {}
+_LOAD_TIMES_LOCK = threading.Lock()
+
+
+class LazyImport:
+    """A module, or one of its attributes, imported on first use.
+
+    Heavy SDKs (LangChain, Gemini, SerpAPI, markdown) take over a second to
+    import, so they are bound through this proxy and load on first call or
+    attribute access, or during the background warm-up, keeping server
+    start-up fast. Rebinding the module attribute, as the benchmark fakes
+    do, replaces the proxy as usual.
+
+    Args:
+        module: Dotted module path, e.g. "langchain_google_genai"
+        attribute: Optional attribute of the module, e.g. "ChatGoogleGenerativeAI"
+    """
+
+    def __init__(self, module: str, attribute: Optional[str] = None):
+        self._module = module
+        self._attribute = attribute
+        self._target = None
+        self._lock = threading.Lock()
+        _REGISTRY.append(self)
+
+    @property
+    def name(self) -> str:
+        """Dotted name of the imported object."""
+        return f"{self._module}.{self._attribute}" if self._attribute else self._module
+
+    @property
+    def loaded(self) -> bool:
+        return self._target is not None
+
+    def load(self) -> Any:
+        """Import the target if needed and return it."""
+        if self._target is None:
+            with self._lock:
+                if self._target is None:
+                    started_at = time.perf_counter()
+                    target = importlib.import_module(self._module)
+                    if self._attribute:
+                        target = getattr(target, self._attribute)
+                    with _LOAD_TIMES_LOCK:
+                        _LOAD_TIMES[self.name] = time.perf_counter() - started_at
+                    self._target = target
+        return self._target
+
+    def __call__(self, *args, **kwargs) -> Any:
+        return self.load()(*args, **kwargs)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.load(), name)
+
+    def __repr__(self) -> str:
+        state = "loaded" if self.loaded else "not loaded"
+        return f"<LazyImport {self.name} ({state})>"
+
+
+def preload_lazy_imports(names: Optional[Iterable[str]] = None) -> Dict[str, float]:
+    """Import every registered lazy target now, e.g. from a warm-up task.
+
+    Args:
+        names: Only preload targets with these dotted names; defaults to all
+
+    Returns:
+        Seconds each target took to import, keyed by dotted name
+    """
+    wanted = set(names) if names is not None else None
+    for lazy in list(_REGISTRY):
+        if wanted is None or lazy.name in wanted:
+            try:
+                lazy.load()
+            except Exception as e:
+                print(f"Error preloading {lazy.name}: {str(e)}")
+    return import_profile()
+
+
+def import_profile() -> Dict[str, float]:
+    """Seconds each lazy target took to import, in load order.
+
+    A target imported after another one that shares its dependencies only
+    pays for what was not loaded yet.
+    """
+    with _LOAD_TIMES_LOCK:
+        return dict(_LOAD_TIMES)
+
+
+def pending_lazy_imports() -> List[str]:
+    """Dotted names of registered targets that have not been imported yet."""
+    return [lazy.name for lazy in _REGISTRY if not lazy.loaded]
+
+
+def _collect_metrics():
+    for name, seconds in import_profile().items():
+        yield (
+            "blog_writer_lazy_import_seconds",
+            "gauge",
+            "Time taken to import a lazily loaded SDK",
+            {"module": name},
+            seconds,
+        )
+
+
+register_collector(_collect_metrics)
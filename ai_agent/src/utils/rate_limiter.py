@@ -0,0 +1,286 @@
+import asyncio
+import heapq
+import itertools
+import random
+import re
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Dict, Iterator, Optional
+
+from config.settings import settings
+from src.utils.deadline import DeadlineExceededError, remaining
+from src.utils.telemetry import register_collector
+
+INTERACTIVE = 0
+BATCH = 1
+
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+_RETRYABLE_MESSAGE = re.compile(
+    r"\b(429|500|502|503|504)\b|RESOURCE_EXHAUSTED|UNAVAILABLE|rate limit",
+    re.IGNORECASE,
+)
+_POLL_INTERVAL = 0.05
+
+_request_priority = ContextVar("request_priority", default=INTERACTIVE)
+_SCHEDULERS = {}
+_SCHEDULERS_LOCK = threading.Lock()
+
+
+class UpstreamError(Exception):
+    """Error response from an upstream API, carrying its HTTP status code."""
+
+    def __init__(self, status_code: int, message: str = ""):
+        super().__init__(f"{status_code}: {message}")
+        self.status_code = status_code
+
+
+class TokenBucket:
+    """Continuously refilling token bucket sized in units per minute."""
+
+    def __init__(self, per_minute: float):
+        self.capacity = per_minute
+        self.rate = per_minute / 60.0
+        self.tokens = per_minute
+        self.updated_at = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(
+            self.capacity, self.tokens + (now - self.updated_at) * self.rate
+        )
+        self.updated_at = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until `amount` tokens are available (0 if they are now)."""
+        self._refill()
+        amount = min(amount, self.capacity)
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self.rate
+
+    def consume(self, amount: float) -> None:
+        """Take tokens out of the bucket; the balance may go negative as debt."""
+        self._refill()
+        self.tokens -= amount
+
+
+class ProviderScheduler:
+    """Admits calls to one provider within its request and token budgets.
+
+    Waiting calls are granted in priority order (INTERACTIVE before BATCH),
+    then in arrival order.
+
+    Args:
+        name: Provider name, e.g. "gemini"
+        requests_per_minute: Request budget; 0 disables the limit
+        tokens_per_minute: Token budget; 0 disables the limit
+    """
+
+    def __init__(self, name: str, requests_per_minute: int, tokens_per_minute: int = 0):
+        self.name = name
+        self.request_bucket = (
+            TokenBucket(requests_per_minute) if requests_per_minute > 0 else None
+        )
+        self.token_bucket = (
+            TokenBucket(tokens_per_minute) if tokens_per_minute > 0 else None
+        )
+        self._waiters = []
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+        self.stats = {"granted": 0, "retries": 0, "throttled_seconds": 0.0}
+
+    def _enqueue(self) -> tuple:
+        entry = (_request_priority.get(), next(self._counter))
+        with self._lock:
+            heapq.heappush(self._waiters, entry)
+        return entry
+
+    def _try_grant(self, entry: tuple, tokens: int) -> float:
+        """Grant the call if it is next in line and within budget.
+
+        Returns:
+            0 when granted, otherwise the number of seconds to wait
+        """
+        with self._lock:
+            if self._waiters[0] != entry:
+                return _POLL_INTERVAL
+
+            waits = [0.0]
+            if self.request_bucket:
+                waits.append(self.request_bucket.wait_time(1))
+            if self.token_bucket:
+                waits.append(self.token_bucket.wait_time(tokens))
+            wait = max(waits)
+            if wait > 0:
+                return wait
+
+            heapq.heappop(self._waiters)
+            if self.request_bucket:
+                self.request_bucket.consume(1)
+            if self.token_bucket:
+                self.token_bucket.consume(tokens)
+            self.stats["granted"] += 1
+            return 0.0
+
+    def _check_deadline(self) -> None:
+        left = remaining()
+        if left is not None and left <= 0:
+            raise DeadlineExceededError(
+                f"Request deadline exceeded waiting for {self.name}"
+            )
+
+    def _abandon(self, entry: tuple) -> None:
+        with self._lock:
+            if entry in self._waiters:
+                self._waiters.remove(entry)
+                heapq.heapify(self._waiters)
+
+    def acquire(self, tokens: int = 0) -> None:
+        """Block until the call may proceed."""
+        entry = self._enqueue()
+        started_at = time.monotonic()
+        try:
+            while (wait := self._try_grant(entry, tokens)) > 0:
+                self._check_deadline()
+                time.sleep(min(wait, _POLL_INTERVAL))
+        finally:
+            self._abandon(entry)
+            self.stats["throttled_seconds"] += time.monotonic() - started_at
+
+    async def aacquire(self, tokens: int = 0) -> None:
+        """Wait without blocking the event loop until the call may proceed."""
+        entry = self._enqueue()
+        started_at = time.monotonic()
+        try:
+            while (wait := self._try_grant(entry, tokens)) > 0:
+                self._check_deadline()
+                await asyncio.sleep(min(wait, _POLL_INTERVAL))
+        finally:
+            self._abandon(entry)
+            self.stats["throttled_seconds"] += time.monotonic() - started_at
+
+    def record_usage(self, estimated_tokens: int, actual_tokens: Optional[int]) -> None:
+        """Charge the token budget for the difference from the estimate."""
+        if self.token_bucket and actual_tokens is not None:
+            with self._lock:
+                self.token_bucket.consume(actual_tokens - estimated_tokens)
+
+    def call(self, fn: Callable[[], Any], tokens: int = 0) -> Any:
+        """Run `fn` once admitted, retrying 429/5xx failures with backoff."""
+        for attempt in itertools.count():
+            self.acquire(tokens)
+            try:
+                return fn()
+            except Exception as e:
+                if not self._should_retry(e, attempt):
+                    raise
+            time.sleep(backoff_delay(attempt))
+
+    async def acall(self, fn: Callable[[], Awaitable[Any]], tokens: int = 0) -> Any:
+        """Async variant of `call` for coroutine functions."""
+        for attempt in itertools.count():
+            await self.aacquire(tokens)
+            try:
+                return await fn()
+            except Exception as e:
+                if not self._should_retry(e, attempt):
+                    raise
+            await asyncio.sleep(backoff_delay(attempt))
+
+    def _should_retry(self, error: Exception, attempt: int) -> bool:
+        if attempt + 1 >= settings.RETRY_MAX_ATTEMPTS or not is_retryable(error):
+            return False
+        left = remaining()
+        if left is not None and left <= 0:
+            return False
+        self.stats["retries"] += 1
+        print(f"Retrying {self.name} call after error: {str(error)}")
+        return True
+
+
+def is_retryable(error: Exception) -> bool:
+    """Whether an error is a rate-limit (429) or transient server (5xx) error."""
+    response = getattr(error, "response", None)
+    for status_code in (
+        getattr(error, "status_code", None),
+        getattr(error, "code", None),
+        getattr(response, "status_code", None),
+    ):
+        if isinstance(status_code, int):
+            return status_code in RETRYABLE_STATUS_CODES
+    return bool(_RETRYABLE_MESSAGE.search(str(error)))
+
+
+def backoff_delay(attempt: int) -> float:
+    """Exponential backoff with full jitter for the given retry attempt."""
+    ceiling = min(settings.RETRY_MAX_DELAY, settings.RETRY_BASE_DELAY * 2**attempt)
+    return random.uniform(0, ceiling)
+
+
+def estimate_tokens(text: Any) -> int:
+    """Rough token estimate (about four characters per token)."""
+    return max(1, len(str(text)) // 4)
+
+
+@contextmanager
+def priority_scope(priority: int) -> Iterator[None]:
+    """Run the enclosed calls, and tasks started from them, at a priority."""
+    token = _request_priority.set(priority)
+    try:
+        yield
+    finally:
+        _request_priority.reset(token)
+
+
+def get_scheduler(provider: str) -> ProviderScheduler:
+    """Get the process-wide scheduler for "gemini" or "serpapi"."""
+    with _SCHEDULERS_LOCK:
+        if provider not in _SCHEDULERS:
+            if provider == "gemini":
+                _SCHEDULERS[provider] = ProviderScheduler(
+                    provider,
+                    settings.GEMINI_REQUESTS_PER_MINUTE,
+                    settings.GEMINI_TOKENS_PER_MINUTE,
+                )
+            else:
+                _SCHEDULERS[provider] = ProviderScheduler(
+                    provider, settings.SERPAPI_REQUESTS_PER_MINUTE
+                )
+        return _SCHEDULERS[provider]
+
+
+def get_scheduler_stats() -> Dict[str, Dict[str, Any]]:
+    """Get grant, retry and throttling counters for every scheduler."""
+    with _SCHEDULERS_LOCK:
+        return {name: dict(scheduler.stats) for name, scheduler in _SCHEDULERS.items()}
+
+
+def _collect_metrics():
+    for provider, stats in get_scheduler_stats().items():
+        labels = {"provider": provider}
+        yield (
+            "blog_writer_upstream_calls_total",
+            "counter",
+            "Upstream calls admitted by the provider scheduler",
+            labels,
+            stats["granted"],
+        )
+        yield (
+            "blog_writer_upstream_retries_total",
+            "counter",
+            "Upstream calls retried after a 429/5xx error",
+            labels,
+            stats["retries"],
+        )
+        yield (
+            "blog_writer_upstream_throttled_seconds_total",
+            "counter",
+            "Time calls spent waiting for the provider's rate limits",
+            labels,
+            stats["throttled_seconds"],
+        )
+
+
+register_collector(_collect_metrics)
@@ -0,0 +1,299 @@
+import itertools
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from loguru import logger
+
+from config.settings import settings
+
+DURATION_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+    120.0,
+)
+
+# A collector returns (metric name, type, help, labels, value) samples that
+# are read when /metrics is scraped, e.g. cache and session-store gauges.
+Sample = Tuple[str, str, str, Dict[str, Any], float]
+
+_current_span = ContextVar("current_span", default=None)
+_span_ids = itertools.count(1)
+_COLLECTORS = []
+_LOGGING_LOCK = threading.Lock()
+_logging_configured = False
+
+
+def _label_key(labels: Dict[str, Any]) -> Tuple[Tuple[str, str], ...]:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _format_labels(labels: Iterable[Tuple[str, str]]) -> str:
+    pairs = [
+        '{}="{}"'.format(
+            key,
+            value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"),
+        )
+        for key, value in labels
+    ]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """Monotonic counter with labels, rendered in Prometheus text format."""
+
+    def __init__(self, name: str, description: str):
+        self.name = name
+        self.description = description
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self) -> List[str]:
+        with self._lock:
+            values = dict(self._values)
+        lines = [
+            f"# HELP {self.name} {self.description}",
+            f"# TYPE {self.name} counter",
+        ]
+        lines += [
+            f"{self.name}{_format_labels(key)} {_format_value(value)}"
+            for key, value in sorted(values.items())
+        ]
+        return lines
+
+
+class Histogram:
+    """Cumulative-bucket histogram with labels, rendered in Prometheus text format."""
+
+    def __init__(
+        self, name: str, description: str, buckets: Tuple[float, ...] = DURATION_BUCKETS
+    ):
+        self.name = name
+        self.description = description
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            series = self._series.setdefault(
+                key, {"counts": [0] * len(self.buckets), "sum": 0.0, "count": 0}
+            )
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series["counts"][index] += 1
+            series["sum"] += value
+            series["count"] += 1
+
+    def render(self) -> List[str]:
+        with self._lock:
+            series = {
+                key: {**values, "counts": list(values["counts"])}
+                for key, values in self._series.items()
+            }
+        lines = [
+            f"# HELP {self.name} {self.description}",
+            f"# TYPE {self.name} histogram",
+        ]
+        for key, values in sorted(series.items()):
+            for bound, count in zip(self.buckets, values["counts"]):
+                labels = key + (("le", _format_value(float(bound))),)
+                lines.append(f"{self.name}_bucket{_format_labels(labels)} {count}")
+            lines.append(
+                f"{self.name}_sum{_format_labels(key)} {_format_value(values['sum'])}"
+            )
+            lines.append(f"{self.name}_count{_format_labels(key)} {values['count']}")
+        return lines
+
+
+SPAN_DURATION = Histogram(
+    "blog_writer_span_duration_seconds", "Duration of pipeline stages and calls"
+)
+SPAN_ERRORS = Counter(
+    "blog_writer_span_errors_total", "Pipeline stages and calls that raised"
+)
+LLM_CALLS = Counter("blog_writer_llm_calls_total", "LLM invocations by pipeline stage")
+LLM_TOKENS = Counter(
+    "blog_writer_llm_tokens_total", "LLM prompt and completion tokens by pipeline stage"
+)
+SECTIONS = Counter(
+    "blog_writer_sections_total", "Blog sections served, by source (cached/generated)"
+)
+LLM_ROUTES = Counter(
+    "blog_writer_llm_routes_total", "LLM routing decisions, by call purpose and model"
+)
+_METRICS = [SPAN_DURATION, SPAN_ERRORS, LLM_CALLS, LLM_TOKENS, SECTIONS, LLM_ROUTES]
+
+
+class Span:
+    """One timed stage of a pipeline run, linked to its parent stage."""
+
+    __slots__ = (
+        "name",
+        "labels",
+        "attributes",
+        "trace_id",
+        "span_id",
+        "parent_id",
+        "started_at",
+    )
+
+    def __init__(self, name: str, labels: Dict[str, Any], parent: Optional["Span"]):
+        self.name = name
+        self.labels = labels
+        self.attributes = {}
+        self.span_id = next(_span_ids)
+        self.parent_id = parent.span_id if parent else None
+        self.trace_id = parent.trace_id if parent else self.span_id
+        self.started_at = time.perf_counter()
+
+    def set(self, **attributes) -> None:
+        """Attach attributes, such as token counts, to the span's log record."""
+        self.attributes.update(attributes)
+
+
+@contextmanager
+def span(name: str, **labels) -> Iterator[Span]:
+    """Time a pipeline stage as a span nested under the current one.
+
+    The duration is recorded in SPAN_DURATION under the span name and
+    labels, and the span is logged as JSON when LOG_JSON is enabled. Spans
+    follow asyncio tasks and `asyncio.to_thread` calls through contextvars.
+
+    Args:
+        name: Stage name, e.g. "outline" or "serpapi"
+        **labels: Low-cardinality labels, e.g. section="Introduction"
+
+    Yields:
+        The active span
+    """
+    current = Span(name, labels, _current_span.get())
+    token = _current_span.set(current)
+    status = "ok"
+    try:
+        yield current
+    except Exception:
+        status = "error"
+        raise
+    except BaseException:
+        status = "cancelled"
+        raise
+    finally:
+        _current_span.reset(token)
+        duration = time.perf_counter() - current.started_at
+        SPAN_DURATION.observe(duration, span=name, **labels)
+        if status == "error":
+            SPAN_ERRORS.inc(span=name, **labels)
+        _log_span(current, duration, status)
+
+
+def current_stage() -> str:
+    """Name of the innermost active span, or "unscoped" outside any span."""
+    current = _current_span.get()
+    return current.name if current else "unscoped"
+
+
+def annotate_span(**attributes) -> None:
+    """Attach attributes to the current span's log record, if there is one."""
+    current = _current_span.get()
+    if current:
+        current.set(**attributes)
+
+
+def record_llm_usage(
+    stage: str, prompt_tokens: int, completion_tokens: int, model: str = ""
+) -> None:
+    """Count one LLM call and its token usage against a pipeline stage."""
+    LLM_CALLS.inc(stage=stage, model=model)
+    LLM_TOKENS.inc(prompt_tokens, stage=stage, model=model, kind="prompt")
+    LLM_TOKENS.inc(completion_tokens, stage=stage, model=model, kind="completion")
+
+    current = _current_span.get()
+    if current:
+        current.set(prompt_tokens=prompt_tokens, completion_tokens=completion_tokens)
+
+
+def register_collector(collector: Callable[[], Iterable[Sample]]) -> None:
+    """Add a callback whose samples are read on every /metrics scrape."""
+    _COLLECTORS.append(collector)
+
+
+def render_metrics() -> str:
+    """Render every metric and collector sample in Prometheus text format."""
+    lines = []
+    for metric in _METRICS:
+        lines += metric.render()
+
+    families = {}
+    for collector in _COLLECTORS:
+        try:
+            samples = list(collector())
+        except Exception as e:
+            print(f"Error collecting metrics: {str(e)}")
+            continue
+        for name, metric_type, description, labels, value in samples:
+            family = families.setdefault(name, (metric_type, description, []))
+            family[2].append((labels, value))
+
+    for name, (metric_type, description, samples) in families.items():
+        lines.append(f"# HELP {name} {description}")
+        lines.append(f"# TYPE {name} {metric_type}")
+        lines += [
+            f"{name}{_format_labels(_label_key(labels))} {_format_value(value)}"
+            for labels, value in samples
+        ]
+
+    return "\n".join(lines) + "\n"
+
+
+def _configure_logging() -> None:
+    global _logging_configured
+
+    with _LOGGING_LOCK:
+        if not _logging_configured:
+            logger.remove()
+            logger.add(sys.stderr, serialize=True, level=settings.LOG_LEVEL)
+            _logging_configured = True
+
+
+def _log_span(current: Span, duration: float, status: str) -> None:
+    if not settings.LOG_JSON:
+        return
+
+    _configure_logging()
+    logger.bind(
+        span=current.name,
+        trace_id=current.trace_id,
+        span_id=current.span_id,
+        parent_id=current.parent_id,
+        duration_ms=round(duration * 1000, 2),
+        status=status,
+        **current.labels,
+        **current.attributes,
+    ).info(f"{current.name} finished in {duration * 1000:.1f}ms")
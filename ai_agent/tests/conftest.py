@@ -0,0 +1,18 @@
+import pytest
+
+from benchmarks.fakes import LatencyModel, install_fakes
+from config.settings import settings
+
+
+@pytest.fixture
+def offline_pipeline(tmp_path, monkeypatch):
+    """Run the pipeline against the benchmark fakes with throwaway stores."""
+    from src.pipeline import article_store, run_store
+
+    restore = install_fakes(LatencyModel(0.001, 0.1), LatencyModel(0.001, 0.1))
+    monkeypatch.setattr(settings, "RUN_DB_PATH", str(tmp_path / "runs.sqlite3"))
+    monkeypatch.setattr(settings, "ARTICLE_DB_PATH", str(tmp_path / "articles.sqlite3"))
+    monkeypatch.setattr(run_store, "_RUN_STORE", None)
+    monkeypatch.setattr(article_store, "_ARTICLE_STORE", None)
+    yield
+    restore()
@@ -0,0 +1,40 @@
+import asyncio
+
+import httpx
+
+from app import app
+
+
+def _ready(warm_up):
+    async def check():
+        app.state.warm_up = warm_up()
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as c:
+            await asyncio.sleep(0)
+            return await c.get("/ready")
+
+    try:
+        return asyncio.run(check())
+    finally:
+        app.state.warm_up = None
+
+
+def test_ready_after_warm_up():
+    async def warm_up():
+        return None
+
+    response = _ready(lambda: asyncio.create_task(warm_up()))
+    assert response.status_code == 200
+    assert response.json()["status"] == "ready"
+
+
+def test_not_ready_when_warm_up_failed():
+    async def warm_up():
+        raise ImportError("No module named 'langchain_google_genai'")
+
+    response = _ready(lambda: asyncio.create_task(warm_up()))
+    assert response.status_code == 503
+    assert response.json() == {
+        "status": "warm_up_failed",
+        "error": "No module named 'langchain_google_genai'",
+    }
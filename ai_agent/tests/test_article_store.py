@@ -0,0 +1,26 @@
+from config.settings import settings
+from src.pipeline.article_store import article_hash
+
+METADATA = {"structure": "blog", "topic": "Hashing", "goal": "Check keys"}
+SECTIONS = ["Introduction", "Meta Description"]
+
+
+def test_article_hash_keeps_outline_case_and_formatting():
+    original = article_hash(METADATA, "I. Intro\n  A. Use iPhone", SECTIONS)
+
+    assert original == article_hash(METADATA, "I. Intro\n  A. Use iPhone", SECTIONS)
+    assert original != article_hash(METADATA, "i. intro A. use IPHONE", SECTIONS)
+
+
+def test_article_hash_covers_route_settings(monkeypatch):
+    original = article_hash(METADATA, "I. Intro", SECTIONS)
+    routes = {
+        **settings.LLM_ROUTES,
+        "Meta Description": {
+            **settings.LLM_ROUTES["Meta Description"],
+            "temperature": 0.9,
+        },
+    }
+    monkeypatch.setattr(settings, "LLM_ROUTES", routes)
+
+    assert original != article_hash(METADATA, "I. Intro", SECTIONS)
@@ -0,0 +1,99 @@
+import asyncio
+import warnings
+
+from benchmarks.fakes import FakeChatModel, FakeGoogleSearch, FakeResponse
+from config.settings import settings
+from src.integrations import tools
+from src.main import _gather_with_timeout
+from src.pipeline.ai_generator import get_gemini_llm
+from src.utils.deadline import deadline_scope
+
+
+class RecordingSession:
+    def __init__(self):
+        self.timeouts = []
+
+    def get(self, url, params=None, timeout=None):
+        self.timeouts.append(timeout)
+        return FakeResponse({})
+
+
+def test_serpapi_request_timeout_is_capped_by_deadline(monkeypatch):
+    session = RecordingSession()
+    monkeypatch.setattr(tools, "GoogleSearch", FakeGoogleSearch)
+    monkeypatch.setattr(tools, "get_http_session", lambda: session)
+    monkeypatch.setattr(settings, "SERPAPI_TIMEOUT", 15.0)
+
+    tools.FetchGoogleTrendsDataTool._search({"q": "topic"})
+    with deadline_scope(2):
+        tools.FetchGoogleTrendsDataTool._search({"q": "topic"})
+
+    assert session.timeouts[0] == 15.0
+    assert 0 < session.timeouts[1] <= 2
+
+
+def test_failed_trends_lookup_only_drops_its_query(monkeypatch):
+    class FailingSession(RecordingSession):
+        def get(self, url, params=None, timeout=None):
+            if params["q"] == "broken keyword":
+                return FakeResponse({"error": "unavailable"}, 503)
+            return FakeResponse({"interest_over_time": {"timeline_data": [1]}})
+
+    monkeypatch.setattr(tools, "GoogleSearch", FakeGoogleSearch)
+    monkeypatch.setattr(tools, "get_http_session", FailingSession)
+    monkeypatch.setattr(settings, "RETRY_MAX_ATTEMPTS", 1)
+    tool = tools.FetchGoogleTrendsDataTool({"topic": "upstream errors"})
+
+    async def lookups():
+        return await asyncio.gather(
+            tool._aget_trends_data(query="broken keyword"),
+            tool._aget_trends_data(query="working keyword"),
+        )
+
+    broken, working = asyncio.run(lookups())
+    assert broken == {"query": "broken keyword"}
+    assert working["timeline_data"] == [1]
+
+
+def test_expired_deadline_does_not_start_data_calls():
+    started = []
+
+    async def research():
+        started.append(True)
+        return "research"
+
+    async def gather():
+        with deadline_scope(0.001):
+            await asyncio.sleep(0.01)
+            return await _gather_with_timeout("research", research)
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        assert asyncio.run(gather()) is None
+    assert not started
+
+
+def test_sync_llm_calls_pass_the_deadline_to_the_client(offline_pipeline, monkeypatch):
+    timeouts = []
+    invoke, stream = FakeChatModel.invoke, FakeChatModel.stream
+
+    def recorded_invoke(self, prompt, *args, **kwargs):
+        timeouts.append(kwargs.pop("timeout", None))
+        return invoke(self, prompt, *args, **kwargs)
+
+    def recorded_stream(self, prompt, *args, **kwargs):
+        timeouts.append(kwargs.pop("timeout", None))
+        return stream(self, prompt, *args, **kwargs)
+
+    monkeypatch.setattr(FakeChatModel, "invoke", recorded_invoke)
+    monkeypatch.setattr(FakeChatModel, "stream", recorded_stream)
+    monkeypatch.setattr(settings, "LLM_CALL_TIMEOUT", 120.0)
+    llm = get_gemini_llm()
+
+    llm.invoke("Write an introduction")
+    with deadline_scope(2):
+        llm.invoke("Write an introduction")
+        list(llm.stream("Write an introduction"))
+
+    assert timeouts[0] == 120.0
+    assert all(0 < timeout <= 2 for timeout in timeouts[1:])
@@ -0,0 +1,21 @@
+from benchmarks.fakes import FakeChatModel, LatencyModel, install_fakes
+from config.settings import settings
+from src.pipeline import ai_generator
+from src.utils import rate_limiter
+
+
+def test_install_fakes_can_be_undone():
+    chat_model = ai_generator.ChatGoogleGenerativeAI
+    clients = ai_generator._LLM_CLIENTS
+    schedulers = rate_limiter._SCHEDULERS
+    budget = settings.GEMINI_REQUESTS_PER_MINUTE
+
+    restore = install_fakes(LatencyModel(0.001, 0.1), LatencyModel(0.001, 0.1))
+    assert ai_generator.ChatGoogleGenerativeAI is FakeChatModel
+    assert settings.GEMINI_REQUESTS_PER_MINUTE == 0
+    restore()
+
+    assert ai_generator.ChatGoogleGenerativeAI is chat_model
+    assert ai_generator._LLM_CLIENTS is clients
+    assert rate_limiter._SCHEDULERS is schedulers
+    assert settings.GEMINI_REQUESTS_PER_MINUTE == budget
@@ -0,0 +1,74 @@
+import asyncio
+import time
+
+from config.settings import settings
+from src.integrations.database import connect_sqlite
+from src.jobs import JobQueue, JobStore
+
+
+def test_item_is_claimed_by_one_worker(tmp_path):
+    path = str(tmp_path / "jobs.sqlite3")
+    first, second = JobStore(path), JobStore(path)
+    job_id = first.create_job([{"session_id": "a"}])
+
+    assert first.claim_item(job_id, 0, "worker-1")
+    assert not second.claim_item(job_id, 0, "worker-2")
+
+    # Only the owner of the claim records the outcome
+    second.finish_item(job_id, 0, "worker-2", "failed", error="not mine")
+    first.finish_item(job_id, 0, "worker-1", "completed", content="blog")
+    job = second.get_job(job_id)
+    assert job["status"] == "completed"
+    assert job["items"][0]["content"] == "blog"
+    assert not second.claim_item(job_id, 0, "worker-2")
+
+
+def test_stale_claim_can_be_taken_over(tmp_path):
+    store = JobStore(str(tmp_path / "jobs.sqlite3"))
+    job_id = store.create_job([{"session_id": "a"}])
+    assert store.claim_item(job_id, 0, "dead-worker")
+
+    with connect_sqlite(store.path) as connection:
+        connection.execute(
+            "UPDATE job_items SET updated_at = ?",
+            (time.time() - settings.JOB_CLAIM_TTL - 1,),
+        )
+    assert store.claim_item(job_id, 0, "worker-2")
+
+
+class BlockingQueue(JobQueue):
+    def __init__(self, store, started):
+        super().__init__(store, workers=1)
+        self.started = started
+
+    async def _generate(self, request, run_id):
+        self.started.set()
+        await asyncio.sleep(60)
+
+
+class InstantQueue(JobQueue):
+    async def _generate(self, request, run_id):
+        return f"blog for {run_id}", "markdown", True
+
+
+def test_stopped_queue_releases_running_items(tmp_path):
+    store = JobStore(str(tmp_path / "jobs.sqlite3"))
+
+    async def run():
+        started = asyncio.Event()
+        interrupted = BlockingQueue(store, started)
+        job_id = await interrupted.submit([{"session_id": "a"}])
+        await asyncio.wait_for(started.wait(), 5)
+        await interrupted.stop()
+        assert store.get_job(job_id)["items"][0]["status"] == "queued"
+
+        # A restart well within JOB_CLAIM_TTL picks the item up again
+        resumed = InstantQueue(store, workers=1)
+        await resumed.start()
+        await asyncio.wait_for(resumed._queue.join(), 5)
+        await resumed.stop()
+        return store.get_job(job_id)
+
+    job = asyncio.run(run())
+    assert job["status"] == "completed"
+    assert job["items"][0]["content"].startswith("blog for ")
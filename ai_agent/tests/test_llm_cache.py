@@ -0,0 +1,72 @@
+import asyncio
+import threading
+
+from benchmarks.fakes import FakeEmbeddings
+from config.settings import settings
+from src.pipeline import ai_generator
+
+
+class CountingEmbeddings(FakeEmbeddings):
+    built = 0
+    calls = 0
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        CountingEmbeddings.built += 1
+
+    def embed_query(self, text):
+        CountingEmbeddings.calls += 1
+        return super().embed_query(text)
+
+
+def test_semantic_cache_embeds_only_on_exact_miss(offline_pipeline, monkeypatch):
+    monkeypatch.setattr(settings, "LLM_CACHE_SEMANTIC", True)
+    monkeypatch.setattr(
+        ai_generator, "GoogleGenerativeAIEmbeddings", CountingEmbeddings
+    )
+
+    def llm():
+        return ai_generator.get_gemini_llm(
+            cache_namespace="semantic_test", semantic_text="Hosting plans"
+        )
+
+    first = llm().invoke("Research hosting plans")
+    assert CountingEmbeddings.calls == 1
+
+    # An exact repeat is served without embedding
+    assert llm().invoke("Research hosting plans").content == first.content
+    assert asyncio.run(llm().ainvoke("Research hosting plans")).content == (
+        first.content
+    )
+    assert CountingEmbeddings.calls == 1
+
+    # A new prompt on the same topic embeds once and reuses the response
+    assert llm().invoke("Research hosting plans again").content == first.content
+    assert CountingEmbeddings.calls == 2
+    assert CountingEmbeddings.built == 1
+
+
+def test_sqlite_cache_is_read_off_the_event_loop(
+    offline_pipeline, monkeypatch, tmp_path
+):
+    monkeypatch.setattr(settings, "LLM_CACHE_BACKEND", "sqlite")
+    monkeypatch.setattr(settings, "CACHE_DB_PATH", str(tmp_path / "cache.sqlite3"))
+    llm = ai_generator.get_gemini_llm(cache_namespace="sqlite_thread_test")
+    assert llm.cache.backend == "sqlite"
+
+    threads = []
+    for name in ("get", "set"):
+        method = getattr(llm.cache, name)
+
+        def recorded(*args, method=method, **kwargs):
+            threads.append(threading.current_thread())
+            return method(*args, **kwargs)
+
+        monkeypatch.setattr(llm.cache, name, recorded)
+
+    first = asyncio.run(llm.ainvoke("Outline a post on caching"))
+    second = asyncio.run(llm.ainvoke("Outline a post on caching"))
+
+    assert second.content == first.content
+    assert len(threads) == 3
+    assert threading.main_thread() not in threads
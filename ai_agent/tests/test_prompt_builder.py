@@ -0,0 +1,47 @@
+from src.pipeline.prompt_builder import PromptBuilder
+
+OUTLINE = """I. Introduction
+A. Why the choice matters
+II. Criteria for Comparison
+A. Price and support
+III. Detailed Comparison
+A. Plan by plan
+IV. Conclusion
+A. Which plan to pick"""
+
+
+def _prompts(structure):
+    metadata = {
+        "structure": structure,
+        "persona": "professional",
+        "topic": "Hosting plans",
+        "tone": "informative",
+        "keyword": "hosting",
+        "goal": "Compare hosting plans",
+    }
+    return PromptBuilder(
+        metadata,
+        trends_data="Interest rose 40% this quarter",
+        research_data="Support quality drives churn",
+        blog_outline_data=OUTLINE,
+    ).build_prompt()
+
+
+def test_only_context_sections_get_context():
+    prompts = _prompts("comparison")
+
+    introduction = prompts["Introduction"].context
+    assert "Plan by plan" in introduction["blog_outline"]
+    assert introduction["trends"] and introduction["research"]
+    for section in ("Criteria for Comparison", "Detailed Comparison", "Conclusion"):
+        assert not any(prompts[section].context.values()), section
+
+
+def test_outline_is_split_among_context_sections():
+    prompts = _prompts("blog")
+
+    assert "Why the choice matters" in prompts["Introduction"].context["blog_outline"]
+    main_content = prompts["Main Content"].context["blog_outline"]
+    assert "Plan by plan" in main_content
+    assert "Why the choice matters" not in main_content
+    assert not any(prompts["Conclusion"].context.values())
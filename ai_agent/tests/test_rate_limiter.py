@@ -0,0 +1,28 @@
+import asyncio
+
+from benchmarks.fakes import FakeChatModel
+from src.pipeline.ai_generator import get_gemini_llm
+
+
+def test_scheduler_owns_gemini_retries(offline_pipeline, monkeypatch):
+    requests = []
+    invoke, ainvoke = FakeChatModel.invoke, FakeChatModel.ainvoke
+
+    def recorded_invoke(self, prompt, *args, **kwargs):
+        requests.append(kwargs)
+        return invoke(self, prompt)
+
+    async def recorded_ainvoke(self, prompt, *args, **kwargs):
+        requests.append(kwargs)
+        return await ainvoke(self, prompt)
+
+    monkeypatch.setattr(FakeChatModel, "invoke", recorded_invoke)
+    monkeypatch.setattr(FakeChatModel, "ainvoke", recorded_ainvoke)
+
+    llm = get_gemini_llm()
+    assert llm.llm.kwargs["max_retries"] == 0
+
+    llm.invoke("Write an introduction")
+    asyncio.run(get_gemini_llm().ainvoke("Write an introduction"))
+    assert len(requests) == 2
+    assert all("retry" in kwargs and kwargs["retry"] is None for kwargs in requests)
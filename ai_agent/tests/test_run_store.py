@@ -0,0 +1,79 @@
+from benchmarks.fakes import FakeChatModel
+from src.main import run_blog_generation
+from src.pipeline.run_store import get_run_store
+
+
+def _metadata():
+    return {
+        "structure": "blog",
+        "persona": "professional",
+        "topic": "Run resume across steps",
+        "tone": "informative",
+        "keyword": "ai",
+        "goal": "Check that one run ID spans both steps",
+    }
+
+
+def test_run_resumes_across_steps(offline_pipeline):
+    metadata = _metadata()
+
+    outline, content_type, success = run_blog_generation(
+        metadata, "google_trends", session_id="resume", step="blog_outline", run_id="r1"
+    )
+    assert success, outline
+    assert content_type == "blog_outline"
+    # The pipeline adds derived fields to the caller's dict in place
+    assert "min_words" in metadata
+
+    blog, content_type, success = run_blog_generation(
+        metadata,
+        "google_trends",
+        session_id="resume",
+        step="generate_blog",
+        run_id="r1",
+    )
+    assert success, blog
+    assert content_type == "markdown"
+    assert get_run_store().get_run("r1")["status"] == "completed"
+
+
+def test_run_rejects_different_metadata(offline_pipeline):
+    run_blog_generation(
+        _metadata(),
+        "google_trends",
+        session_id="other",
+        step="blog_outline",
+        run_id="r2",
+    )
+
+    changed = {**_metadata(), "topic": "Another topic"}
+    content, _, success = run_blog_generation(
+        changed, "google_trends", session_id="other", step="blog_outline", run_id="r2"
+    )
+    assert not success
+    assert "different blog metadata" in content
+
+
+def test_run_regenerates_outline_for_new_user_input(offline_pipeline, monkeypatch):
+    prompts = []
+    respond = FakeChatModel._respond
+
+    def record(self, prompt):
+        prompts.append(str(prompt))
+        return respond(self, prompt)
+
+    monkeypatch.setattr(FakeChatModel, "_respond", record)
+
+    for user_input in ("Focus on beginners", "Focus on experts"):
+        _, content_type, success = run_blog_generation(
+            _metadata(),
+            "google_trends",
+            session_id="input",
+            step="blog_outline",
+            run_id="r3",
+            user_input=user_input,
+        )
+        assert success
+        assert content_type == "blog_outline"
+
+    assert any("Focus on experts" in prompt for prompt in prompts)
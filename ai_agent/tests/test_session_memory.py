@@ -0,0 +1,41 @@
+import time
+
+from src.integrations.database import SQLiteSessionBackend
+from src.pipeline.session_memory import SessionMemory
+from src.pipeline.session_store import SessionStore
+
+
+def _worker_memory(backend, session_id="shared"):
+    memory = SessionMemory(return_messages=True, memory_key="chat_history")
+    memory.attach_backend(session_id, backend)
+    return memory
+
+
+def test_session_data_reads_through_to_shared_backend(tmp_path):
+    backend = SQLiteSessionBackend(str(tmp_path / "sessions.sqlite3"))
+    first, second = _worker_memory(backend), _worker_memory(backend)
+
+    first.set_session_data("blog_outline", "I. Old outline")
+    assert second.get_session_data("blog_outline") == "I. Old outline"
+
+    first.set_session_data("blog_outline", "I. New outline")
+    assert second.get_session_data("blog_outline") == "I. New outline"
+
+    backend.clear_session("shared")
+    assert second.get_session_data("blog_outline") is None
+
+
+def test_expired_session_clears_idle_shared_data(tmp_path):
+    backend = SQLiteSessionBackend(str(tmp_path / "sessions.sqlite3"))
+    memory = _worker_memory(backend, "idle")
+    memory.set_session_data("blog_outline", "I. Outline")
+
+    # Written moments ago, so another worker may still be using it
+    memory.expire(60)
+    assert backend.get_session_data("idle", "blog_outline") == "I. Outline"
+
+    store = SessionStore(idle_ttl=0.01)
+    store.set("idle", memory)
+    time.sleep(0.02)
+    assert store.sweep() == 1
+    assert backend.get_session_data("idle", "blog_outline") is None
@@ -0,0 +1,32 @@
+from src.pipeline.session_memory import SessionMemory
+from src.pipeline.session_store import SessionStore
+
+
+class CountingMemory(SessionMemory):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._measurements = 0
+
+    def approximate_size(self):
+        self._measurements += 1
+        return super().approximate_size()
+
+
+def test_sizes_are_measured_on_writes_only():
+    store = SessionStore(idle_ttl=0)
+    memory = CountingMemory()
+    store.set("s1", memory)
+    assert memory._measurements == 1
+
+    for _ in range(3):
+        assert store.get("s1") is memory
+    assert memory._measurements == 1
+
+    memory.set_session_data("blog_outline", "I. Introduction")
+    assert memory._measurements == 2
+    assert store.stats()["bytes"] == len("blog_outline") + len("I. Introduction")
+
+    memory.save_context({"input": "Outline please"}, {"output": "Done"})
+    assert memory._measurements == 3
+    memory.clear()
+    assert memory._measurements == 4